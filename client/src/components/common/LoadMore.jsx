@@ -0,0 +1,28 @@
+import { useEffect, useRef } from "react";
+import Button from "./Button";
+
+// Footer of a paginated list: loads the next page when it scrolls into
+// view (infinite scroll) or when the button is clicked. Renders nothing
+// once the last page is loaded.
+export default function LoadMore({ hasMore, loading = false, onLoadMore }) {
+  const sentinel = useRef(null);
+
+  useEffect(() => {
+    if (!hasMore || loading || !sentinel.current) return;
+    const observer = new IntersectionObserver((entries) => {
+      if (entries[0].isIntersecting) onLoadMore();
+    });
+    observer.observe(sentinel.current);
+    return () => observer.disconnect();
+  }, [hasMore, loading, onLoadMore]);
+
+  if (!hasMore) return null;
+
+  return (
+    <div ref={sentinel} className="flex justify-center py-4">
+      <Button variant="secondary" size="sm" disabled={loading} onClick={onLoadMore}>
+        {loading ? "Loading..." : "Load more"}
+      </Button>
+    </div>
+  );
+}
@@ -1,8 +1,10 @@
 
 
 import Loader from "../common/Loader";
+import LoadMore from "../common/LoadMore";
 
-export default function DriverPastTrips({driver, trips, loading }) {
+// One page of trips at a time: hasMore / onLoadMore append the next page
+export default function DriverPastTrips({driver, trips, loading, hasMore = false, loadingMore = false, onLoadMore }) {
   if (loading) return <Loader />;
 
   if (!trips || trips.length === 0) {
@@ -63,6 +65,7 @@ export default function DriverPastTrips({driver, trips, loading }) {
           ))}
         </tbody>
       </table>
+      <LoadMore hasMore={hasMore} loading={loadingMore} onLoadMore={onLoadMore} />
     </div>
   );
 }
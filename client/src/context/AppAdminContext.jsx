@@ -8,9 +8,13 @@ export function AppAdminProvider({ children }) {
     const [error, setError] = useState(null);
     const [tenants, setTenants] = useState([]);
     const [payoutBatches, setPayoutBatches] = useState([]);
+    // Cursor of the next page of each paginated list (null: no more pages)
+    const [payoutBatchesCursor, setPayoutBatchesCursor] = useState(null);
     const [selectedBatch, setSelectedBatch] = useState(null);
     const [batchPayments, setBatchPayments] = useState([]);
     const [batchPayouts, setBatchPayouts] = useState([]);
+    const [batchPayoutsCursor, setBatchPayoutsCursor] = useState(null);
+    const [loadingMore, setLoadingMore] = useState(false);
     const [operationInProgress, setOperationInProgress] = useState(false);
     const [tenantsSummary, setTenantsSummary] = useState(null);
     const [tenantDetails, setTenantDetails] = useState(null);
@@ -32,13 +36,14 @@ export function AppAdminProvider({ children }) {
         }
     }, []);
 
-    // Load payout batches
+    // Load payout batches (first page)
     const loadPayoutBatches = useCallback(async () => {
         setLoading(true);
         setError(null);
         try {
             const res = await appAdminAPI.listPayoutBatches();
             setPayoutBatches(res.data);
+            setPayoutBatchesCursor(res.nextCursor);
         } catch (err) {
             setError(err.response?.data?.detail || "Failed to load payout batches");
             console.error(err);
@@ -47,15 +52,33 @@ export function AppAdminProvider({ children }) {
         }
     }, []);
 
+    // Append the next page of payout batches
+    const loadMorePayoutBatches = useCallback(async () => {
+        if (!payoutBatchesCursor) return;
+        setLoadingMore(true);
+        setError(null);
+        try {
+            const res = await appAdminAPI.listPayoutBatches(payoutBatchesCursor);
+            setPayoutBatches((prev) => [...prev, ...res.data]);
+            setPayoutBatchesCursor(res.nextCursor);
+        } catch (err) {
+            setError(err.response?.data?.detail || "Failed to load payout batches");
+            console.error(err);
+        } finally {
+            setLoadingMore(false);
+        }
+    }, [payoutBatchesCursor]);
+
     // Create payout batch
     const createPayoutBatch = useCallback(async (payload) => {
         setLoading(true);
         setError(null);
         try {
             const res = await appAdminAPI.createPayoutBatch(payload);
-            // Reload batches list
+            // Reload batches list (newest first, so the new batch is on page one)
             const batchesRes = await appAdminAPI.listPayoutBatches();
             setPayoutBatches(batchesRes.data);
+            setPayoutBatchesCursor(batchesRes.nextCursor);
             return { success: true, data: res.data };
         } catch (err) {
             const errorMsg = err.response?.data?.detail || "Failed to create payout batch";
@@ -75,6 +98,7 @@ export function AppAdminProvider({ children }) {
             const res = await appAdminAPI.getPayoutBatchDetail(batchId);
             setSelectedBatch(res.data.batch);
             setBatchPayouts(res.data.payouts || []);
+            setBatchPayoutsCursor(res.nextCursor);
         } catch (err) {
             setError(err.response?.data?.detail || "Failed to load batch detail");
             console.error(err);
@@ -98,13 +122,14 @@ export function AppAdminProvider({ children }) {
         }
     }, []);
 
-    // Load batch payouts
+    // Load batch payouts (first page)
     const loadBatchPayouts = useCallback(async (batchId) => {
         setLoading(true);
         setError(null);
         try {
             const res = await appAdminAPI.getBatchPayouts(batchId);
             setBatchPayouts(res.data);
+            setBatchPayoutsCursor(res.nextCursor);
         } catch (err) {
             setError(err.response?.data?.detail || "Failed to load batch payouts");
             console.error(err);
@@ -113,6 +138,23 @@ export function AppAdminProvider({ children }) {
         }
     }, []);
 
+    // Append the next page of batch payouts
+    const loadMoreBatchPayouts = useCallback(async (batchId) => {
+        if (!batchPayoutsCursor) return;
+        setLoadingMore(true);
+        setError(null);
+        try {
+            const res = await appAdminAPI.getBatchPayouts(batchId, batchPayoutsCursor);
+            setBatchPayouts((prev) => [...prev, ...res.data]);
+            setBatchPayoutsCursor(res.nextCursor);
+        } catch (err) {
+            setError(err.response?.data?.detail || "Failed to load batch payouts");
+            console.error(err);
+        } finally {
+            setLoadingMore(false);
+        }
+    }, [batchPayoutsCursor]);
+
     // Calculate batch payouts
     const calculatePayouts = useCallback(async (batchId) => {
         setOperationInProgress(true);
@@ -170,8 +212,15 @@ export function AppAdminProvider({ children }) {
         }
       );
 
+      // Update the paid row in place: reloading would drop the pages
+      // loaded after the first one
+      setBatchPayouts((prev) =>
+        prev.map((p) => (p.payout_id === payoutId ? { ...p, ...res.data } : p))
+      );
+      // Batch totals (status counts) come with the detail
       if (batchId) {
-        await loadBatchPayouts(batchId);
+        const detail = await appAdminAPI.getPayoutBatchDetail(batchId);
+        setSelectedBatch(detail.data.batch);
       }
 
       return { success: true, data: res.data };
@@ -193,7 +242,7 @@ export function AppAdminProvider({ children }) {
       setOperationInProgress(false);
     }
   },
-  [loadBatchPayouts]
+  []
 );
 
 
@@ -410,9 +459,12 @@ export function AppAdminProvider({ children }) {
         operationInProgress,
         tenants,
         payoutBatches,
+        hasMorePayoutBatches: !!payoutBatchesCursor,
         selectedBatch,
         batchPayments,
         batchPayouts,
+        hasMoreBatchPayouts: !!batchPayoutsCursor,
+        loadingMore,
         tenantsSummary,
         tenantDetails,
         tenantDocuments,
@@ -421,10 +473,12 @@ export function AppAdminProvider({ children }) {
         // Payout Actions
         loadTenants,
         loadPayoutBatches,
+        loadMorePayoutBatches,
         createPayoutBatch,
         loadBatchDetail,
         loadBatchPayments,
         loadBatchPayouts,
+        loadMoreBatchPayouts,
         calculatePayouts,
         executeBatch,
         paySinglePayout,
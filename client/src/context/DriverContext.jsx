@@ -30,6 +30,9 @@ export const DriverProvider = ({ children }) => {
 
   const [wallet, setWallet] = useState(null);
   const [pastTrips, setPastTrips] = useState([]);
+  // Cursor of the next past-trips page (null: all loaded)
+  const [pastTripsCursor, setPastTripsCursor] = useState(null);
+  const [pastTripsLoadingMore, setPastTripsLoadingMore] = useState(false);
   const [pendingPayments, setPendingPayments] = useState([]);
 
   const [loading, setLoading] = useState(true);
@@ -53,6 +56,7 @@ useEffect(() => { // 🔥 HARD RESET on auth change
   setLoading(true); 
   setWallet(null) 
   setPastTrips([]) 
+  setPastTripsCursor(null)
   setPendingPayments([])
  }, [isAuthenticated]);
 
@@ -341,10 +345,24 @@ useEffect(() => { // 🔥 HARD RESET on auth change
     return res;
   };
 
+  // First page; later pages are appended on demand by loadMorePastTrips
   const refreshPastTrips = async () => {
     const res = await driverApi.getPastTrips();
-    setPastTrips(res || []);
-    return res;
+    setPastTrips(res.trips);
+    setPastTripsCursor(res.nextCursor);
+    return res.trips;
+  };
+
+  const loadMorePastTrips = async () => {
+    if (!pastTripsCursor || pastTripsLoadingMore) return;
+    setPastTripsLoadingMore(true);
+    try {
+      const res = await driverApi.getPastTrips(pastTripsCursor);
+      setPastTrips((prev) => [...prev, ...res.trips]);
+      setPastTripsCursor(res.nextCursor);
+    } finally {
+      setPastTripsLoadingMore(false);
+    }
   };
 
   const loadPendingPayment = async () => {
@@ -403,6 +421,8 @@ useEffect(() => { // 🔥 HARD RESET on auth change
       assignedVehicle,
       wallet,
       pastTrips,
+      hasMorePastTrips: !!pastTripsCursor,
+      pastTripsLoadingMore,
       pendingPayments,
 
       // onboarding
@@ -434,6 +454,7 @@ useEffect(() => { // 🔥 HARD RESET on auth change
 
       // finance
       paymentconfirmation,
+      loadMorePastTrips,
     }),
     [
       driver,
@@ -450,6 +471,8 @@ useEffect(() => { // 🔥 HARD RESET on auth change
       assignedVehicle,
       wallet,
       pastTrips,
+      pastTripsCursor,
+      pastTripsLoadingMore,
       pendingPayments,
       can_start_shift,
     ]
@@ -3,6 +3,7 @@ import { useParams, useNavigate } from "react-router-dom";
 import { useAppAdmin } from "../../../context/AppAdminContext";
 import PaymentsTable from "./Payments";
 import PayoutsTable from "./Payouts";
+import LoadMore from "../../../components/common/LoadMore";
 
 export default function PayoutBatchDetail() {
   const { batchId } = useParams();
@@ -11,13 +12,16 @@ export default function PayoutBatchDetail() {
     selectedBatch,
     batchPayments,
     batchPayouts,
+    hasMoreBatchPayouts,
     loading,
+    loadingMore,
     operationInProgress,
     error,
     clearError,
     loadBatchDetail,
     loadBatchPayments,
     loadBatchPayouts,
+    loadMoreBatchPayouts,
     calculatePayouts,
     executeBatch,
   } = useAppAdmin();
@@ -197,7 +201,7 @@ export default function PayoutBatchDetail() {
                 : "border-transparent text-gray-600 hover:text-gray-800"
             }`}
           >
-            Payouts ({batchPayouts.length})
+            Payouts ({selectedBatch.total_payouts})
           </button>
         </div>
       </div>
@@ -210,32 +214,41 @@ export default function PayoutBatchDetail() {
             <div className="space-y-3 text-sm">
               <div className="flex justify-between">
                 <span className="text-gray-600">Total Payouts:</span>
-                <span className="font-mono">{batchPayouts.length}</span>
+                <span className="font-mono">{selectedBatch.total_payouts}</span>
               </div>
               <div className="flex justify-between">
                 <span className="text-gray-600">Total Amount:</span>
                 <span className="font-mono">
-                  {batchPayouts.reduce((sum, p) => sum + p.paid_amount, 0).toFixed(2)} {selectedBatch.currency_code}
+                  {selectedBatch.total_amount.toFixed(2)} {selectedBatch.currency_code}
                 </span>
               </div>
               <div className="flex justify-between">
                 <span className="text-gray-600">Paid Payouts:</span>
-                <span className="font-mono">{batchPayouts.filter(p => p.status === "paid").length}</span>
+                <span className="font-mono">{selectedBatch.payouts_by_status.paid ?? 0}</span>
               </div>
               <div className="flex justify-between">
                 <span className="text-gray-600">Pending Payouts:</span>
-                <span className="font-mono">{batchPayouts.filter(p => p.status === "pending").length}</span>
+                <span className="font-mono">{selectedBatch.payouts_by_status.pending ?? 0}</span>
               </div>
               <div className="flex justify-between">
                 <span className="text-gray-600">Failed Payouts:</span>
-                <span className="font-mono">{batchPayouts.filter(p => p.status === "failed").length}</span>
+                <span className="font-mono">{selectedBatch.payouts_by_status.failed ?? 0}</span>
               </div>
             </div>
           </div>
         )}
 
         {activeTab === "payments" && <PaymentsTable payments={batchPayments} loading={loading} />}
-        {activeTab === "payouts" && <PayoutsTable payouts={batchPayouts} batchId={batchId} loading={loading} />}
+        {activeTab === "payouts" && (
+          <>
+            <PayoutsTable payouts={batchPayouts} batchId={batchId} loading={loading} />
+            <LoadMore
+              hasMore={hasMoreBatchPayouts}
+              loading={loadingMore}
+              onLoadMore={() => loadMoreBatchPayouts(batchId)}
+            />
+          </>
+        )}
       </div>
     </div>
   );
@@ -1,9 +1,19 @@
 import { useEffect } from "react";
 import { useAppAdmin } from "../../../context/AppAdminContext";
 import { useNavigate } from "react-router-dom";
+import LoadMore from "../../../components/common/LoadMore";
 
 export default function PayoutBatchList() {
-  const { payoutBatches, loadPayoutBatches, loading, error, clearError } = useAppAdmin();
+  const {
+    payoutBatches,
+    hasMorePayoutBatches,
+    loadPayoutBatches,
+    loadMorePayoutBatches,
+    loading,
+    loadingMore,
+    error,
+    clearError,
+  } = useAppAdmin();
   const navigate = useNavigate();
 
   useEffect(() => {
@@ -87,6 +97,11 @@ export default function PayoutBatchList() {
               ))}
             </tbody>
           </table>
+          <LoadMore
+            hasMore={hasMorePayoutBatches}
+            loading={loadingMore}
+            onLoadMore={loadMorePayoutBatches}
+          />
         </div>
       )}
     </div>
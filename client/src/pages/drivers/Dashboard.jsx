@@ -30,6 +30,7 @@ export default function DriverDashboard() {
     invites,
     loading,
     pastTrips,
+    hasMorePastTrips,
     wallet,
     error,
   } = useDriver();
@@ -191,7 +192,7 @@ export default function DriverDashboard() {
         )}
         <StatCard
           title="Total Trips"
-          count={pastTrips?.length ?? 0}
+          count={`${pastTrips?.length ?? 0}${hasMorePastTrips ? "+" : ""}`}
           icon={Route}
           color="emerald"
         />
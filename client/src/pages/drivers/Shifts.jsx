@@ -25,6 +25,9 @@ export default function Shifts() {
     endShift,
     updateRuntimeStatus,
      pastTrips,
+    hasMorePastTrips,
+    pastTripsLoadingMore,
+    loadMorePastTrips,
   } = useDriver();
    
 
@@ -339,6 +342,9 @@ export default function Shifts() {
           trips={pastTrips}
           loading={loading}
           driver={driver}
+          hasMore={hasMorePastTrips}
+          loadingMore={pastTripsLoadingMore}
+          onLoadMore={loadMorePastTrips}
         />
       </div>
 
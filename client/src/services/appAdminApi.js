@@ -1,4 +1,4 @@
-import { apiClient } from "./axios";
+import { apiClient, getPage } from "./axios";
 
 
 
@@ -66,12 +66,14 @@ export const appAdminAPI = {
    return apiClient.post("/app-admin/payout-batches", payload)
   },
 
-  listPayoutBatches : () =>{
-   return apiClient.get("/app-admin/payout-batches");
+  // Paginated lists: one page per call, res.nextCursor fetches the next
+  listPayoutBatches : (cursor = null) =>{
+   return getPage("/app-admin/payout-batches", { cursor });
   },
 
+  // Batch header and totals come with the first page of its payouts
   getPayoutBatchDetail: (batchId) =>{
-    return apiClient.get(`/app-admin/payout-batches/${batchId}`);
+    return getPage(`/app-admin/payout-batches/${batchId}`);
   },
 
   executeBatch : (batchId, payload) =>{
@@ -82,8 +84,8 @@ export const appAdminAPI = {
   return apiClient.get(`/app-admin/payout-batches/${batchId}/payments`);
  },
 
-  getBatchPayouts : (batchId) =>{
-  return apiClient.get(`/app-admin/payout-batches/${batchId}/payouts`);
+  getBatchPayouts : (batchId, cursor = null) =>{
+  return getPage(`/app-admin/payout-batches/${batchId}/payouts`, { cursor });
  },
 
   calculateBatchPayouts : (batchId) =>{
@@ -26,4 +26,23 @@ apiClient.interceptors.response.use(
     console.error('API Error:', err.config?.method?.toUpperCase(), err.config?.url, err.response?.status, err.message);
     return Promise.reject(err);
   },
-);
\ No newline at end of file
+);
+
+// Keyset-paginated list endpoints return one page at a time; the next
+// page cursor comes in the X-Next-Cursor header or as body.next_cursor.
+// Fetches the page after `cursor` (the first page without one) and
+// resolves to an axios-like response whose data holds that page's items
+// (items() picks the list out of a page body) and nextCursor the cursor
+// to pass for the following page, null on the last one.
+export const PAGE_SIZE = 50;
+
+export const getPage = async (url, { cursor = null, params = {}, items = (data) => data } = {}) => {
+  const res = await apiClient.get(url, {
+    params: { ...params, limit: PAGE_SIZE, ...(cursor ? { cursor } : {}) },
+  });
+  return {
+    ...res,
+    data: items(res.data),
+    nextCursor: res.headers['x-next-cursor'] || res.data?.next_cursor || null,
+  };
+};
\ No newline at end of file
@@ -1,4 +1,4 @@
-import { apiClient } from "./axios";
+import { apiClient, getPage } from "./axios";
 
 export const driverApi = {
 
@@ -348,12 +348,14 @@ async submitDocuments() {
 
 
 
-  async getPastTrips() {
+  // One page, newest first; pass the returned nextCursor for the next one
+  async getPastTrips(cursor = null) {
     try {
-      const res = await apiClient.get('/driver/past-trips');
-      console
-.log("Fetched past trips:", res.data.trips);
-      return res.data.trips;
+      const res = await getPage('/driver/past-trips', {
+        cursor,
+        items: (data) => data.trips || [],
+      });
+      return { trips: res.data, nextCursor: res.nextCursor };
     } catch (err) {
       throw new Error(
         err.response?.data?.detail || "Failed to fetch past trips",
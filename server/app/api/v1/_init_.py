@@ -38,6 +38,7 @@ from app.api.v1.lookups import router as lookups_router
 from app.api.v1.auth.adminAuth import router as admin_auth_router
 from app.api.v1.auth.userAuth import router as user_auth_router
 from app.api.v1.platform.admin import router as app_admin_router
+from app.api.v1.platform.analytics import router as analytics_router
 from app.api.v1.tenants.router import router as tenant_router
 from app.api.v1.fleet_owner.router import router as fleet_owner_router
 from app.api.v1.vehicles.router import router as vehicle_router
@@ -58,6 +59,7 @@ api_router.include_router(user_auth_router)
 api_router.include_router(admin_auth_router)
 
 api_router.include_router(app_admin_router)
+api_router.include_router(analytics_router)
 api_router.include_router(tenant_router)
 api_router.include_router(fleet_owner_router)
 
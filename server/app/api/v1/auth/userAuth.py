@@ -13,18 +13,21 @@ from app.models.core.drivers.drivers import Driver
 from app.models.core.tenants.tenant_staff import TenantStaff
 from app.models.core.fleet_owners.fleet_owners import FleetOwner
 from app.core.security.jwt import verify_access_token
+from app.core.security.principal_cache import invalidate_principal
 
 from app.models.core.users.user_profiles import UserProfile
 from app.models.core.users.users import User
 from app.schemas.core.users.user_profiles import UserProfileCreate,UserProfileOut
 
+from app.core.security.rate_limit import rate_limit
+
 router = APIRouter(prefix="/auth/user", tags=["Auth"])
 
 # -------------------------------
 # OTP REQUEST
 # -------------------------------
 
-@router.post("/otp/request")
+@router.post("/otp/request", dependencies=[Depends(rate_limit("otp_request", "phone", "ip"))])
 def request_otp_user(payload: OTPRequest):
     phone = normalize_phone(payload.phone_e164)
     otp = generate_otp()
@@ -35,7 +38,7 @@ def request_otp_user(payload: OTPRequest):
 # -------------------------------
 # OTP VERIFY (NO JWT HERE)
 
-@router.post("/otp/verify")
+@router.post("/otp/verify", dependencies=[Depends(rate_limit("otp_verify", "phone", "ip"))])
 def otp_verify_user(
     payload: OTPVerifyRequest,
     db: Session = Depends(get_db),
@@ -122,6 +125,9 @@ def switch_role(
     if user["context"] != "user":
         raise HTTPException(403, "Role switching not allowed")
 
+    # Cached principals of the previous role must not outlive the switch
+    invalidate_principal(user_id)
+
     if role == "rider":
         return {
             "access_token": create_access_token(
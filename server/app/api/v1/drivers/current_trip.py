@@ -1,8 +1,9 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
-from app.core.dependencies import get_db
-from app.core.security.roles import require_driver
+from app.core.dependencies import get_primary_read_db
+from app.core.security.roles import driver_principal
+from app.core.security.principal_cache import Principal
 from app.models.core.trips.trips import Trip
 from app.models.core.drivers.drivers import Driver
 
@@ -13,8 +14,8 @@ router = APIRouter(
 
 @router.get("/active")
 def get_driver_active_trip(
-    db: Session = Depends(get_db),
-    driver: Driver = Depends(require_driver),
+    db: Session = Depends(get_primary_read_db),
+    driver: Principal = Depends(driver_principal),
 ):
     """
     Get the active trip for this driver.
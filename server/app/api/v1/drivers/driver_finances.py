@@ -10,12 +10,12 @@ Endpoints:
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, desc
+from sqlalchemy import and_, desc, func
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from typing import List, Optional
 
-from app.core.dependencies import get_db
+from app.core.dependencies import get_read_db, get_primary_read_db
 from app.core.security.roles import require_driver
 from app.models.core.wallets.owner_wallet import OwnerWallet
 from app.models.core.accounting.ledger import FinancialLedger
@@ -23,6 +23,8 @@ from app.models.core.payments.payments import Payment
 from app.models.core.trips.trips import Trip
 from app.models.core.drivers.drivers import Driver
 from app.models.core.trips.trip_request import TripRequest
+from app.core.ledger.ledger_service import LedgerService
+from app.core.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, keyset_page
 
 
 router = APIRouter(
@@ -56,7 +58,7 @@ class WalletResponse:
 @router.get("/wallet", response_model=None)
 def get_driver_wallet(
     driver: Driver = Depends(require_driver),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_primary_read_db),
 ):
     """
     Get driver's current wallet balance.
@@ -99,85 +101,153 @@ def get_driver_wallet(
         )
 
 
+# ================================================================
+# LEDGER ENDPOINT (keyset paginated)
+# ================================================================
+
+@router.get("/ledger")
+def get_driver_ledger(
+    driver: Driver = Depends(require_driver),
+    db: Session = Depends(get_read_db),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+):
+    """
+    Driver's ledger entries, newest first.
+    Pass the returned next_cursor as ?cursor= for the next page.
+    """
+    return LedgerService.get_entity_history(
+        db,
+        tenant_id=driver.tenant_id,
+        entity_type="owner",
+        entity_id=driver.driver_id,
+        cursor=cursor,
+        limit=limit,
+        owner_type="driver",
+    )
 
-def build_trip_payment_details(
-    trip: Trip,
+
+
+
+# Ledger transaction_type → payment breakdown field
+BREAKDOWN_FIELDS = {
+    "platform_fee": "platform_fee",
+    "tenant_share": "tenant_commission",
+    "tax": "tax",
+    "driver_earning": "driver_earning",
+}
+
+
+def build_trips_payment_details(
+    trips: list[Trip],
     driver: Driver,
     db: Session,
-) -> dict:
-    payment = db.query(Payment).filter(
-        Payment.trip_id == trip.trip_id,
-        Payment.tenant_id == driver.tenant_id,
-    ).first()
-
-    if not payment:
-        return {
-            "payment_status": "not_found"
-        }
+) -> dict[int, dict]:
+    """
+    Payment details for a page of trips, keyed by trip_id.
 
-    ledger_entries = db.query(FinancialLedger).filter(
-        FinancialLedger.trip_id == trip.trip_id
-    ).all()
+    Two queries for the whole page: payments by trip_id IN (...) and ledger
+    totals grouped by (trip_id, transaction_type) in SQL.
+    """
+    trip_ids = [trip.trip_id for trip in trips]
+    if not trip_ids:
+        return {}
+
+    payments = {}
+    for payment in (
+        db.query(Payment)
+        .filter(
+            Payment.trip_id.in_(trip_ids),
+            Payment.tenant_id == driver.tenant_id,
+        )
+        .order_by(Payment.payment_id)
+    ):
+        payments.setdefault(payment.trip_id, payment)
 
-    breakdown = {
-        "platform_fee": 0.0,
-        "tenant_commission": 0.0,
-        "tax": 0.0,
-        "driver_earning": 0.0,
+    breakdowns = {
+        trip_id: {field: 0.0 for field in BREAKDOWN_FIELDS.values()}
+        for trip_id in payments
     }
+    ledger_totals = (
+        db.query(
+            FinancialLedger.trip_id,
+            FinancialLedger.transaction_type,
+            func.sum(FinancialLedger.amount).label("total"),
+        )
+        .filter(
+            FinancialLedger.trip_id.in_(list(payments)),
+            FinancialLedger.transaction_type.in_(list(BREAKDOWN_FIELDS)),
+        )
+        .group_by(FinancialLedger.trip_id, FinancialLedger.transaction_type)
+        .all()
+    ) if payments else []
+
+    for row in ledger_totals:
+        breakdowns[row.trip_id][BREAKDOWN_FIELDS[row.transaction_type]] = float(row.total or 0)
+
+    details = {}
+    for trip_id in trip_ids:
+        payment = payments.get(trip_id)
+        if not payment:
+            details[trip_id] = {"payment_status": "not_found"}
+            continue
+
+        breakdown = breakdowns[trip_id]
+        details[trip_id] = {
+            "payment_id": payment.payment_id,
+            "total_fare": sum(breakdown.values()),
+            "platform_fee": breakdown["platform_fee"],
+            "tenant_commission": breakdown["tenant_commission"],
+            "tax": breakdown["tax"],
+            "driver_earning": breakdown["driver_earning"],
+            "currency_code": payment.currency_code,
+            "payment_method": payment.payment_method or "pending",
+            "payment_status": payment.payment_status,
+        }
 
-    for entry in ledger_entries:
-        amount = float(entry.amount)
-        if entry.transaction_type == "platform_fee":
-            breakdown["platform_fee"] += amount
-        elif entry.transaction_type == "tenant_share":
-            breakdown["tenant_commission"] += amount
-        elif entry.transaction_type == "tax":
-            breakdown["tax"] += amount
-        elif entry.transaction_type == "driver_earning":
-            breakdown["driver_earning"] += amount
-
-    total_fare = sum(breakdown.values())
-
-    return {
-        "payment_id": payment.payment_id,
-        "total_fare": total_fare,
-        "platform_fee": breakdown["platform_fee"],
-        "tenant_commission": breakdown["tenant_commission"],
-        "tax": breakdown["tax"],
-        "driver_earning": breakdown["driver_earning"],
-        "currency_code": payment.currency_code,
-        "payment_method": payment.payment_method or "pending",
-        "payment_status": payment.payment_status,
-    }
+    return details
 
 @router.get("/past-trips")
 def get_past_trips(
     driver: Driver = Depends(require_driver),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
 ):
     """
     Get past trips for the driver with payment details.
+    Keyset paginated on (completed_at_utc, trip_id), newest first;
+    pass next_cursor back as ?cursor= for the next page.
     """
     try:
         # Get past trips (completed or cancelled)
-        past_trips = db.query(Trip).filter(
+        query = db.query(Trip).filter(
             and_(
                 Trip.driver_id == driver.driver_id,
                 Trip.tenant_id == driver.tenant_id,
                 Trip.trip_status=='completed',
             )
-        ).order_by(desc(Trip.completed_at_utc)).all()
+        )
+        past_trips, next_cursor = keyset_page(
+            query, (Trip.completed_at_utc, Trip.trip_id), cursor, limit,
+        )
       
         trip_list = []
 
+        # Page-level batch loads: 3 queries total instead of 3 per trip
+        request_ids = [t.trip_request_id for t in past_trips if t.trip_request_id]
+        addresses = {
+            row.trip_request_id: row
+            for row in db.query(
+                TripRequest.trip_request_id,
+                TripRequest.pickup_address,
+                TripRequest.drop_address,
+            ).filter(TripRequest.trip_request_id.in_(request_ids))
+        } if request_ids else {}
+        payment_details_by_trip = build_trips_payment_details(past_trips, driver, db)
+
         for trip in past_trips:
-            # Fetch trip request (address source)
-            trip_request = None
-            if trip.trip_request_id:
-                trip_request = db.query(TripRequest).filter(
-                    TripRequest.trip_request_id == trip.trip_request_id
-                ).first()
+            trip_request = addresses.get(trip.trip_request_id)
 
             pickup_address = (
                 trip_request.pickup_address
@@ -191,8 +261,7 @@ def get_past_trips(
                 else None
             )
 
-            # Payment details (already safe)
-            payment_details = build_trip_payment_details(trip, driver, db)
+            payment_details = payment_details_by_trip[trip.trip_id]
 
             trip_list.append({
                 "trip_id": trip.trip_id,
@@ -212,8 +281,10 @@ def get_past_trips(
 
 
        
-        return {"trips": trip_list}
+        return {"trips": trip_list, "next_cursor": next_cursor}
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
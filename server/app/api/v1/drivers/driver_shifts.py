@@ -2,7 +2,8 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from datetime import datetime
 from app.core.dependencies import get_db
-from app.core.security.roles import require_driver
+from app.core.security.rate_limit import rate_limit
+from app.core.security.roles import require_driver, driver_principal
 from app.models.core.drivers.driver_shifts import DriverShift
 from app.models.core.fleet_owners.driver_vehicle_assignments import DriverVehicleAssignment
 from app.models.core.vehicles.vehicles import Vehicle
@@ -16,6 +17,8 @@ from app.core.redis import redis_client
 from app.schemas.core.drivers.location_heartbeat import LocationHeartbeatSchema
 from app.schemas.core.drivers.shift_end import ShiftEndRequest
 from app.core.redis import get_redis
+from app.core.location.ingestion_policy import ingest_driver_location
+from app.core.trips.offer_stream import mark_driver_reachable
 from redis import Redis
 from datetime import timezone
 
@@ -262,11 +265,14 @@ def update_runtime_status(
     return {"runtime_status": payload.runtime_status}
 
 
-@router.post("/location/heartbeat")
+@router.post(
+    "/location/heartbeat",
+    dependencies=[Depends(rate_limit("driver_location", "user"))],
+)
 def location_heartbeat(
     payload: LocationHeartbeatSchema,
     redis: Redis = Depends(get_redis),
-    driver=Depends(require_driver),
+    driver=Depends(driver_principal),
 ):
     # Build mapping with only non-None values (Redis doesn't accept None)
     mapping = {
@@ -274,8 +280,6 @@ def location_heartbeat(
         "lng": str(payload.longitude),
     }
 
-    print("payload:",payload)
-    
     # Add timestamp - use provided or current time in milliseconds
     if payload.timestamp is not None:
         mapping["timestamp"] = str(payload.timestamp)
@@ -290,37 +294,31 @@ def location_heartbeat(
     if payload.heading is not None:
         mapping["heading"] = str(payload.heading)
     
-    redis.hset(
-        f"driver:{driver.driver_id}:location",
-        mapping=mapping
-    )
-    redis.expire(f"driver:{driver.driver_id}:location", 60)
-
     # --- Add/update driver location in Redis GEO key for driver discovery ---
     # Get tenant_id from driver, city_id from payload if present, else from driver
     tenant_id = getattr(driver, "tenant_id", None)
     city_id = getattr(payload, "city_id", None)
     if city_id is None:
         city_id = getattr(driver, "city_id", None)
-    print(f"[HEARTBEAT DEBUG] driver_id={driver.driver_id}, tenant_id={tenant_id}, city_id={city_id}, lat={payload.latitude}, lng={payload.longitude}")
-    # Only update GEO if all required info is present
-    if tenant_id and city_id and payload.latitude is not None and payload.longitude is not None:
-        geo_key = f"drivers:geo:{tenant_id}:{city_id}"
-        print(f"[HEARTBEAT DEBUG] GEOADD {geo_key} {payload.longitude} {payload.latitude} {driver.driver_id}")
-        try:
-            redis.execute_command('GEOADD', geo_key, str(payload.longitude), str(payload.latitude), str(driver.driver_id))
-            redis.expire(geo_key, 120)
-            print(f"[HEARTBEAT DEBUG] GEOADD success for driver {driver.driver_id}")
-        except Exception as exc:
-            print(f"[HEARTBEAT DEBUG] Failed to update GEO for driver {driver.driver_id}: {exc}")
-    else:
-        print(f"[HEARTBEAT DEBUG] Missing tenant_id or city_id, GEOADD skipped for driver {driver.driver_id}")
-    return {"ok": True}
+
+    # GEO write only when the tenant policy says the driver really moved;
+    # parked drivers just refresh last-seen and the raw location hash.
+    geo_written = ingest_driver_location(
+        driver_id=driver.driver_id,
+        tenant_id=tenant_id,
+        city_id=city_id,
+        lat=payload.latitude,
+        lng=payload.longitude,
+        heading=payload.heading,
+        location_hash=mapping,
+        redis=redis,
+    )
+    return {"ok": True, "geo_written": geo_written}
 
 @router.get("/trip-requests")
 def get_trip_requests(
     db: Session = Depends(get_db),
-    driver=Depends(require_driver),
+    driver=Depends(driver_principal),
 ):
     """
     Get pending trip requests for this driver.
@@ -340,6 +338,8 @@ def get_trip_requests(
         TripRequest.status == "driver_searching"
     ).all()
 
+    # Polling clients see every pending offer here: not unreachable
+    mark_driver_reachable(driver.driver_id)
     
     # Return minimal info for UI
     return [
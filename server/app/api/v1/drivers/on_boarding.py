@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 
 from app.core.dependencies import get_db
 from app.core.security.roles import get_or_create_driver, require_driver
+from app.core.security.principal_cache import invalidate_principal
 from app.models.core.drivers.drivers import Driver
 from app.models.core.tenants.tenants import Tenant
 from app.models.core.tenants.tenant_countries import TenantCountry
@@ -147,6 +148,7 @@ def select_tenant(
 
     db.commit()
     db.refresh(driver)
+    invalidate_principal(driver.user_id, "driver")
 
     location_tree = build_location_tree(db, tenant.tenant_id)
 
@@ -260,6 +262,7 @@ def select_location(
 
     db.commit()
     db.refresh(driver)
+    invalidate_principal(driver.user_id, "driver")
 
     return {
         "ok": True,
@@ -291,6 +294,7 @@ def update_driver_type(
 
     db.commit()
     db.refresh(driver)
+    invalidate_principal(driver.user_id, "driver")
 
     return {
         "ok": True,
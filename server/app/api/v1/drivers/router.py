@@ -8,6 +8,7 @@ from .driver_profile import router as driver_profile_router
 from .vehicles import router as vehicle_check_router
 from .current_trip import router as current_trip_router
 from .driver_finances import router as driver_finances_router
+from .ws import router as driver_ws_router
 
 router = APIRouter()
 
@@ -19,3 +20,4 @@ router.include_router(driver_shifs_router)
 router.include_router(vehicle_check_router)
 router.include_router(driver_finances_router)
 router.include_router(current_trip_router)
+router.include_router(driver_ws_router)
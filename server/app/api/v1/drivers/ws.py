@@ -1,24 +1,79 @@
 # app/api/v1/driver/ws.py
 
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 import asyncio
-from app.core.redis import redis_client
+import json
+from app.core.redis import driver_channel
+from app.core.realtime.pubsub_hub import pubsub_hub
+from app.core.security.jwt import _decode_token
+from app.core.trips.offer_stream import read_offers, ack_offer
 
 router = APIRouter()
 
+
+async def _send_offers(websocket: WebSocket, offers: list[dict]):
+    for offer in offers:
+        await websocket.send_text(json.dumps({"type": "offer", **offer}))
+
+
+async def _receive_acks(websocket: WebSocket, driver_id: int):
+    # Client frames: {"type": "ack", "offer_id": "..."}; anything else is ignored
+    try:
+        while True:
+            data = await websocket.receive_text()
+            try:
+                frame = json.loads(data)
+            except ValueError:
+                continue
+            if isinstance(frame, dict) and frame.get("type") == "ack" and frame.get("offer_id"):
+                await run_in_threadpool(ack_offer, driver_id, str(frame["offer_id"]))
+    except WebSocketDisconnect:
+        pass
+
+
+async def _forward(websocket: WebSocket, queue: asyncio.Queue, driver_id: int):
+    while True:
+        # Pub/sub message is only a doorbell; the stream is the source of truth
+        await queue.get()
+        while not queue.empty():
+            queue.get_nowait()
+        offers = await run_in_threadpool(read_offers, driver_id)
+        await _send_offers(websocket, offers)
+
+
 @router.websocket("/ws/driver/{driver_id}")
-async def driver_ws(websocket: WebSocket, driver_id: int):
+async def driver_ws(websocket: WebSocket, driver_id: int, token: str):
+    # Only the driver themself may read (and ack) their offers
+    try:
+        user = _decode_token(token)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    if user.get("role") != "driver" or user.get("driver_id") != driver_id:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
     await websocket.accept()
 
-    pubsub = redis_client.pubsub()
-    channel = f"driver:trip_request:{driver_id}"
-    pubsub.subscribe(channel)
+    # Subscribe before replaying so offers published meanwhile ring the bell
+    channel = driver_channel(driver_id)
+    queue = pubsub_hub.subscribe(channel)
 
+    tasks = []
     try:
-        while True:
-            message = pubsub.get_message(ignore_subscribe_messages=True)
-            if message:
-                await websocket.send_text(message["data"].decode())
-            await asyncio.sleep(0.2)
+        offers = await run_in_threadpool(read_offers, driver_id, True)
+        await _send_offers(websocket, offers)
+
+        tasks = [
+            asyncio.create_task(_receive_acks(websocket, driver_id)),
+            asyncio.create_task(_forward(websocket, queue, driver_id)),
+        ]
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
     except WebSocketDisconnect:
-        pubsub.unsubscribe(channel)
+        pass
+    finally:
+        for task in tasks:
+            task.cancel()
+        pubsub_hub.unsubscribe(channel, queue)
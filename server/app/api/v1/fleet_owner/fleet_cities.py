@@ -4,7 +4,7 @@ from sqlalchemy.orm import Session
 from datetime import datetime, timezone
 
 from app.core.dependencies import get_db
-from app.core.security.roles import require_fleet_owner
+from app.core.security.roles import require_fleet_owner, fleet_owner_principal
 from app.schemas.core.fleet_owners.fleet_owner_cities import FleetOwnerCityCreate
 from app.models.core.tenants.tenant_cities import TenantCity
 from app.models.core.fleet_owners.fleet_owner_cities import FleetOwnerCity
@@ -16,7 +16,7 @@ router = APIRouter(
 @router.get("/tenant-cities")
 def list_available_tenant_cities(
     db: Session = Depends(get_db),
-    fleet_owner=Depends(require_fleet_owner),
+    fleet_owner=Depends(fleet_owner_principal),
 ):
     return (
         db.query(TenantCity)
@@ -14,11 +14,13 @@ from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from typing import List, Optional
 
-from app.core.dependencies import get_db
+from app.core.dependencies import get_read_db, get_primary_read_db
 from app.core.security.roles import require_fleet_owner
 from app.models.core.wallets.owner_wallet import OwnerWallet
 from app.models.core.accounting.ledger import FinancialLedger
 from app.models.core.fleet_owners.fleet_owners import FleetOwner
+from app.core.ledger.ledger_service import LedgerService
+from app.core.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 router = APIRouter(
     tags=["Fleet Owner – Finances"],
@@ -32,7 +34,7 @@ router = APIRouter(
 @router.get("/wallet", response_model=None)
 def get_fleet_wallet(
     fleet_owner: FleetOwner = Depends(require_fleet_owner),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_primary_read_db),
 ):
     """
     Get fleet owner's current wallet balance.
@@ -75,3 +77,27 @@ def get_fleet_wallet(
         )
 
 
+# ================================================================
+# LEDGER ENDPOINT (keyset paginated)
+# ================================================================
+
+@router.get("/ledger")
+def get_fleet_ledger(
+    fleet_owner: FleetOwner = Depends(require_fleet_owner),
+    db: Session = Depends(get_read_db),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+):
+    """
+    Fleet owner's ledger entries, newest first.
+    Pass the returned next_cursor as ?cursor= for the next page.
+    """
+    return LedgerService.get_entity_history(
+        db,
+        tenant_id=fleet_owner.tenant_id,
+        entity_type="owner",
+        entity_id=fleet_owner.fleet_owner_id,
+        cursor=cursor,
+        limit=limit,
+        owner_type="fleet_owner",
+    )
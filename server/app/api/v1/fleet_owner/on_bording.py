@@ -5,6 +5,7 @@ from pydantic import BaseModel
 from app.core.dependencies import get_db
 from app.core.security.roles import get_or_create_fleet_owner, ensure_user_can_be_fleet_owner
 from app.core.security.jwt import verify_access_token
+from app.core.security.principal_cache import invalidate_principal
 
 from app.models.core.tenants.tenants import Tenant
 from app.models.core.fleet_owners.fleet_owners import FleetOwner
@@ -127,6 +128,7 @@ def select_tenant_for_fleet_owner(
     db.add(fleet_owner)
     db.commit()
     db.refresh(fleet_owner)
+    invalidate_principal(fleet_owner.user_id, "fleet-owner")
 
     return {
         "status": "tenant_selected",
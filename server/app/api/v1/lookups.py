@@ -1,6 +1,8 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
-from app.core.dependencies import get_db
+from app.core.dependencies import get_read_db
+from app.core.lookup_registry import lookup_registry, city_boundary_body, BOUNDARY_FORMATS
+from app.core.trips.status_version import etag_matches
 
 # Lookups
 # # Lookups
@@ -45,74 +47,87 @@ router = APIRouter(
     tags=["Lookups"]
 )
 
+def _lookup_response(name: str, if_none_match: str | None, group=None) -> Response:
+    """Pre-serialized registry body; 304 when the client already has it."""
+    cached = lookup_registry().body(name, group)
+    headers = {"ETag": cached.etag, "Cache-Control": "public, max-age=60"}
+    if etag_matches(if_none_match, cached.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=cached.content, media_type="application/json", headers=headers)
+
+
 @router.get("/account-status",response_model=List[LookupBase])
-def get_account_status(db: Session = Depends(get_db)):
-    return db.query(AccountStatus).all()
+def get_account_status(if_none_match: str | None = Header(default=None)):
+    return _lookup_response("account_status", if_none_match)
 
 @router.get("/approval-status",response_model=List[LookupBase])
-def get_approval_status(db: Session = Depends(get_db)):
-    return db.query(ApprovalStatus).all()
+def get_approval_status(if_none_match: str | None = Header(default=None)):
+    return _lookup_response("approval_status", if_none_match)
 
 @router.get("/countries",response_model=List[CountryOut])
-def get_countries(db: Session = Depends(get_db)):
-    return db.query(Country).all()
+def get_countries(if_none_match: str | None = Header(default=None)):
+    return _lookup_response("countries", if_none_match)
 
 @router.get("/cities", response_model=List[CityOut])
-def get_cities(country_id: int | None = None, db: Session = Depends(get_db)):
-    query = db.query(City)
-    if country_id:
-        query = query.filter(City.country_id == country_id)
-    return query.all()
+def get_cities(country_id: int | None = None, if_none_match: str | None = Header(default=None)):
+    return _lookup_response("cities", if_none_match, group=country_id or None)
+
+@router.get("/cities/{city_id}/boundary")
+def get_city_boundary(
+    city_id: int,
+    tolerance: float = Query(default=0.001, ge=0, le=0.1),
+    format: str = Query(default="geojson", pattern=f"^({'|'.join(BOUNDARY_FORMATS)})$"),
+    precision: int = Query(default=5, ge=3, le=7),
+    if_none_match: str | None = Header(default=None),
+):
+    """
+    Simplified city polygon for map rendering.
+    tolerance is in degrees (0.001 ≈ 100 m); precision is decimal digits
+    kept per coordinate. format=polyline returns one encoded string per ring.
+    """
+    cached = city_boundary_body(city_id, tolerance, format, precision)
+    if cached is None:
+        raise HTTPException(status_code=404, detail="City boundary not found")
+
+    headers = {"ETag": cached.etag, "Cache-Control": "public, max-age=3600"}
+    if etag_matches(if_none_match, cached.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=cached.content, media_type="application/json", headers=headers)
 
 @router.get(
     "/tenant-document-types",
     response_model=List[TenantDocumentTypeOut],
 )
-def get_tenant_document_types(db: Session = Depends(get_db)):
-    return (
-        db.query(TenantFleetDocumentType)
-        .all()
-    )
+def get_tenant_document_types(if_none_match: str | None = Header(default=None)):
+    return _lookup_response("tenant_document_types", if_none_match)
 
 @router.get(
     "/vehicle-categories"
 )
-def get_vehicle_categories(db: Session = Depends(get_db)):
-    return (
-        db.query(VehicleCategory)
-        .all()
-    )
+def get_vehicle_categories(if_none_match: str | None = Header(default=None)):
+    return _lookup_response("vehicle_categories", if_none_match)
 @router.get(
     "/driver-document-types"
 )
-def get_vehicle_categories(db: Session = Depends(get_db)):
-    return (
-        db.query(DriverDocumentType)
-        .all()
-    )
+def get_driver_document_types(if_none_match: str | None = Header(default=None)):
+    return _lookup_response("driver_document_types", if_none_match)
 
 @router.get(
     "/vehicle-document-types"
 )
-def get_vehicle_documents_type(db: Session = Depends(get_db)):
-    return (
-        db.query(VehicleDocumentType)
-        .all()
-    )
+def get_vehicle_documents_type(if_none_match: str | None = Header(default=None)):
+    return _lookup_response("vehicle_document_types", if_none_match)
 
 @router.get(
     "/fleet-owner-document-types"
 )
-def get_fleet_owner_document_types(db: Session = Depends(get_db)):
-    return (
-        db.query(TenantFleetDocumentType)
-        .all()
-    )
+def get_fleet_owner_document_types(if_none_match: str | None = Header(default=None)):
+    return _lookup_response("tenant_document_types", if_none_match)
 
 @router.get(
     "/active-tenants"
 )
-def get_active_tenants(db: Session = Depends(get_db)):
+def get_active_tenants(db: Session = Depends(get_read_db)):
     from app.models.core.tenants.tenants import Tenant
     return (
         db.query(Tenant)
@@ -126,9 +141,5 @@ def get_active_tenants(db: Session = Depends(get_db)):
 @router.get(
     "/driver-invite-status"
 )
-def get_driver_invite_status(db: Session = Depends(get_db)):
-    return (
-        db.query(DriverInviteStatus)
-        .all()
-    )
-    
\ No newline at end of file
+def get_driver_invite_status(if_none_match: str | None = Header(default=None)):
+    return _lookup_response("driver_invite_status", if_none_match)
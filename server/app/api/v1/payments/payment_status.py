@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
-from app.core.dependencies import get_db
-from app.core.security.roles import require_driver
+from app.core.dependencies import get_primary_read_db
+from app.core.security.roles import driver_principal
 from app.models.core.payments.payments import Payment
 from app.models.core.trips.trips import Trip
 
@@ -15,8 +15,8 @@ router = APIRouter(
 @router.get("/driver/payments/pending")
 @router.get("/driver/payments/pending")
 def get_pending_payments(
-    db: Session = Depends(get_db),
-    driver=Depends(require_driver),
+    db: Session = Depends(get_primary_read_db),
+    driver=Depends(driver_principal),
 ):
     payments = (
         db.query(Payment)
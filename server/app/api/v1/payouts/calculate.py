@@ -1,12 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import and_, case, exists, func, insert, literal, select, tuple_, update
 
+from app.core.config import settings
 from app.core.dependencies import get_db
 from app.core.security.roles import require_app_admin
 from app.models.core.payouts.payout_batch import PayoutBatch
 from app.models.core.payouts.payouts import Payout
 from app.models.core.accounting.ledger import FinancialLedger
+from app.core.db_partitions import ledger_credit_window
 from app.schemas.core.payouts.payout_batch import CalculatePayoutsResponse
 router = APIRouter(
     prefix="/payout-batches",
@@ -14,138 +16,200 @@ router = APIRouter(
     dependencies=[Depends(require_app_admin)],
 )
 
-@router.post("/{batch_id}/calculate")
-def calculate_payouts(
-    batch_id: int,
-    db: Session = Depends(get_db),
-):
-    batch = (
+# Who a credit row pays: "" for tenants, the owner type for owner
+# earnings, NULL for rows that are not paid out (platform, other owner rows)
+PAYEE_TYPE = case(
+    (FinancialLedger.entity_type == "tenant", ""),
+    (
+        and_(
+            FinancialLedger.entity_type == "owner",
+            FinancialLedger.transaction_type == "driver_earning",
+        ),
+        "driver",
+    ),
+    (
+        and_(
+            FinancialLedger.entity_type == "owner",
+            FinancialLedger.transaction_type == "fleet_earnings",
+        ),
+        "fleet_owner",
+    ),
+)
+
+
+def _lock_batch(db: Session, batch_id: int) -> PayoutBatch | None:
+    return (
         db.query(PayoutBatch)
         .filter(PayoutBatch.payout_batch_id == batch_id)
         .with_for_update()
         .first()
     )
 
-    if not batch:
-        raise HTTPException(404, "Payout batch not found")
 
-    if batch.status not in ("initiated", "processing"):
-        raise HTTPException(
-            400,
-            f"Cannot calculate payouts in status {batch.status}",
-        )
+def _calculate_chunk(db: Session, batch: PayoutBatch, after: tuple | None, limit: int) -> list:
+    """
+    Create payouts for the next `limit` payees after `after` and stamp their
+    credit rows, in two statements:
 
-    batch.status = "processing"
-    db.flush()
+        INSERT INTO payouts SELECT ... GROUP BY payee ... RETURNING
+        UPDATE financial_ledger ... FROM payouts WHERE payout_id IN (...)
+
+    Payees are keyset-ordered on (entity_type, entity_id, payee_type), the
+    prefix of ix_ledger_unpaid_credits_entity. Returns the created payouts.
+    """
+    unpaid_credits = [
+        FinancialLedger.entry_type == "CREDIT",
+        FinancialLedger.payout_batch_id == None,
+        *ledger_credit_window(batch.period_start_utc, batch.period_end_utc),
+    ]
 
     # --------------------------------------------------
-    # 1️⃣ Select ONLY unsettled CREDIT ledger rows
+    # 1️⃣ Unsettled CREDIT rows grouped per payee
     # --------------------------------------------------
-    credit_rows = (
-        db.query(
-            FinancialLedger.entity_type,
-            FinancialLedger.entity_id,
-            FinancialLedger.transaction_type,
-            func.sum(FinancialLedger.amount).label("credit_total"),
+    credits = select(
+        FinancialLedger.entity_type,
+        FinancialLedger.entity_id,
+        PAYEE_TYPE.label("payee_type"),
+        FinancialLedger.amount,
+    ).where(*unpaid_credits, PAYEE_TYPE != None)
+    if after:
+        credits = credits.where(
+            tuple_(FinancialLedger.entity_type, FinancialLedger.entity_id, PAYEE_TYPE)
+            > tuple_(*after)
         )
-        .filter(
-            FinancialLedger.entry_type == "CREDIT",
-            FinancialLedger.payout_batch_id == None,
-            FinancialLedger.credited_at_utc >= batch.period_start_utc,
-            FinancialLedger.credited_at_utc <= batch.period_end_utc,
+    credits = credits.subquery()
+
+    grouped = (
+        select(
+            credits.c.entity_type,
+            credits.c.entity_id,
+            credits.c.payee_type,
+            func.sum(credits.c.amount).label("credit_total"),
         )
-        .group_by(
-            FinancialLedger.entity_type,
-            FinancialLedger.entity_id,
-            FinancialLedger.transaction_type,
-        )
-        .all()
+        .group_by(credits.c.entity_type, credits.c.entity_id, credits.c.payee_type)
+        .subquery()
     )
 
-    payouts_created = 0
-    total_payable = 0.0
+    # Idempotency safety: payees already paid by this batch
+    already_created = exists().where(
+        Payout.payout_batch_id == batch.payout_batch_id,
+        Payout.entity_type == grouped.c.entity_type,
+        Payout.entity_id == grouped.c.entity_id,
+        func.coalesce(Payout.owner_type, "") == grouped.c.payee_type,
+    )
 
     # --------------------------------------------------
-    # 2️⃣ Create payouts per entity
+    # 2️⃣ Create payouts per payee
     # --------------------------------------------------
-    for row in credit_rows:
-
-        entity_type = row.entity_type
-        entity_id = row.entity_id
-        transaction_type = row.transaction_type
-        credit_total = float(row.credit_total or 0)
-
-        # Skip platform rows
-        if entity_type == "platform":
-            continue
-
-        # Determine owner type
-        if entity_type == "tenant":
-            owner_type = None
-        elif entity_type == "owner":
-            if transaction_type == "driver_earning":
-                owner_type = "driver"
-            elif transaction_type == "fleet_earnings":
-                owner_type = "fleet_owner"
-            else:
-                continue
-        else:
-            continue
-
-        # Idempotency safety
-        exists = (
-            db.query(Payout)
-            .filter(
-                Payout.payout_batch_id == batch_id,
-                Payout.entity_type == entity_type,
-                Payout.entity_id == entity_id,
-            )
-            .first()
+    payees = (
+        select(
+            literal(batch.payout_batch_id),
+            grouped.c.entity_type,
+            func.nullif(grouped.c.payee_type, ""),
+            grouped.c.entity_id,
+            literal(batch.currency_code),
+            grouped.c.credit_total,
+            literal(0),
+            grouped.c.credit_total,
+            grouped.c.credit_total,
+            literal("pending"),
+        )
+        .where(~already_created)
+        .order_by(grouped.c.entity_type, grouped.c.entity_id, grouped.c.payee_type)
+        .limit(limit)
+    )
+    created = db.execute(
+        insert(Payout)
+        .from_select(
+            [
+                "payout_batch_id",
+                "entity_type",
+                "owner_type",
+                "entity_id",
+                "currency_code",
+                "gross_amount",
+                "fee_amount",
+                "net_amount",
+                "paid_amount",
+                "status",
+            ],
+            payees,
+        )
+        .returning(
+            Payout.payout_id,
+            Payout.entity_type,
+            Payout.entity_id,
+            Payout.owner_type,
+            Payout.gross_amount,
         )
+    ).all()
 
-        if exists:
-            continue
-
-        payout = Payout(
-            payout_batch_id=batch_id,
-            entity_type=entity_type,
-            owner_type=owner_type,
-            entity_id=entity_id,
-            currency_code=batch.currency_code,
-            gross_amount=credit_total,
-            fee_amount=0,
-            net_amount=credit_total,
-            paid_amount=credit_total,
-            status="pending",
+    if not created:
+        return created
+
+    # --------------------------------------------------
+    # 3️⃣ Mark CREDIT rows as settled (assign batch)
+    # --------------------------------------------------
+    db.execute(
+        update(FinancialLedger)
+        .where(
+            Payout.payout_id.in_([row.payout_id for row in created]),
+            FinancialLedger.entity_type == Payout.entity_type,
+            FinancialLedger.entity_id == Payout.entity_id,
+            PAYEE_TYPE == func.coalesce(Payout.owner_type, ""),
+            *unpaid_credits,
         )
+        .values(payout_batch_id=batch.payout_batch_id)
+        .execution_options(synchronize_session=False)
+    )
+
+    return created
+
+
+@router.post("/{batch_id}/calculate")
+def calculate_payouts(
+    batch_id: int,
+    db: Session = Depends(get_db),
+):
+    batch = _lock_batch(db, batch_id)
 
-        db.add(payout)
-        db.flush()
-
-        # --------------------------------------------------
-        # 3️⃣ Mark CREDIT rows as settled (assign batch)
-        # --------------------------------------------------
-        db.query(FinancialLedger).filter(
-            FinancialLedger.entity_type == entity_type,
-            FinancialLedger.entity_id == entity_id,
-            FinancialLedger.entry_type == "CREDIT",
-            FinancialLedger.payout_batch_id == None,
-            FinancialLedger.credited_at_utc >= batch.period_start_utc,
-            FinancialLedger.credited_at_utc <= batch.period_end_utc,
-        ).update(
-            {"payout_batch_id": batch_id},
-            synchronize_session=False,
+    if not batch:
+        raise HTTPException(404, "Payout batch not found")
+
+    if batch.status not in ("initiated", "processing"):
+        raise HTTPException(
+            400,
+            f"Cannot calculate payouts in status {batch.status}",
         )
 
-        payouts_created += 1
-        total_payable += credit_total
+    batch.status = "processing"
+    db.flush()
+
+    payouts_created = 0
+    total_payable = 0.0
+    chunk_size = settings.PAYOUT_CALCULATION_CHUNK_SIZE
+    after = None
 
-    db.commit()
+    # Each chunk commits on its own; a failed run is resumed by calling
+    # again (settled credits and existing payouts are skipped)
+    while True:
+        created = _calculate_chunk(db, batch, after, chunk_size)
+
+        payouts_created += len(created)
+        total_payable += sum(float(row.gross_amount) for row in created)
+        db.commit()
+
+        if len(created) < chunk_size:
+            break
+
+        after = max(
+            (row.entity_type, row.entity_id, row.owner_type or "")
+            for row in created
+        )
+        batch = _lock_batch(db, batch_id)
 
     return {
         "batch_id": batch_id,
         "payouts_created": payouts_created,
         "total_payable": round(total_payable, 2),
     }
-
-
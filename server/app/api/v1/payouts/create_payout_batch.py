@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, func
 
@@ -14,6 +14,7 @@ from app.schemas.core.payouts.payout_batch import (
 from app.core.security.roles import require_app_admin
 from app.models.core.payments.payments import Payment   
 from app.models.core.accounting.ledger import FinancialLedger
+from app.core.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, keyset_page
 
 router = APIRouter(prefix="/payout-batches", tags=["Payouts"])
 
@@ -113,25 +114,37 @@ def create_payout_batch(
     )
 
 @router.get("")
-def list_payout_batches(db: Session = Depends(get_db)):
-    rows = (
-        db.query(
-            PayoutBatch.payout_batch_id,
-            PayoutBatch.tenant_id,
-            PayoutBatch.country_id,
-            PayoutBatch.currency_code,
-            PayoutBatch.period_start_utc,
-            PayoutBatch.period_end_utc,
-            PayoutBatch.status,
-            PayoutBatch.created_at_utc,
-            func.count(Payout.payout_id).label("total_payouts"),
-            func.coalesce(func.sum(Payout.paid_amount), 0).label("total_amount"),
-        )
-        .outerjoin(Payout, Payout.payout_batch_id == PayoutBatch.payout_batch_id)
-        .group_by(PayoutBatch.payout_batch_id)
-        .order_by(PayoutBatch.created_at_utc.desc())
-        .all()
+def list_payout_batches(
+    response: Response,
+    db: Session = Depends(get_db),
+    cursor: str | None = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+):
+    """
+    Newest batches first, keyset paginated on (created_at_utc, batch id).
+    The next page cursor is returned in the X-Next-Cursor header.
+
+    The page is cut on payout_batches alone (ix_payout_batches_created);
+    payout totals are then aggregated for that page's batches only.
+    """
+    rows, next_cursor = keyset_page(
+        db.query(PayoutBatch), (PayoutBatch.created_at_utc, PayoutBatch.payout_batch_id), cursor, limit,
     )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+
+    totals = {}
+    if rows:
+        totals = {
+            batch_id: (count, amount)
+            for batch_id, count, amount in db.query(
+                Payout.payout_batch_id,
+                func.count(Payout.payout_id),
+                func.coalesce(func.sum(Payout.paid_amount), 0),
+            )
+            .filter(Payout.payout_batch_id.in_([r.payout_batch_id for r in rows]))
+            .group_by(Payout.payout_batch_id)
+        }
 
     return [
         {
@@ -142,8 +155,8 @@ def list_payout_batches(db: Session = Depends(get_db)):
             "period_start_utc": r.period_start_utc,
             "period_end_utc": r.period_end_utc,
             "status": r.status,
-            "total_payouts": r.total_payouts,
-            "total_amount": float(r.total_amount),
+            "total_payouts": totals.get(r.payout_batch_id, (0, 0))[0],
+            "total_amount": float(totals.get(r.payout_batch_id, (0, 0))[1]),
             "created_at_utc": r.created_at_utc,
         }
         for r in rows
@@ -153,6 +166,8 @@ def list_payout_batches(db: Session = Depends(get_db)):
 def get_payout_batch_detail(
     batch_id: int,
     db: Session = Depends(get_db),
+    cursor: str | None = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
 ):
     batch = (
         db.query(PayoutBatch)
@@ -163,14 +178,28 @@ def get_payout_batch_detail(
     if not batch:
         return {"detail": "Batch not found"}
 
-    payouts = (
-        db.query(Payout)
+    payouts, next_cursor = keyset_page(
+        db.query(Payout).filter(Payout.payout_batch_id == batch_id),
+        (Payout.payout_id,),
+        cursor,
+        limit,
+        descending=False,
+    )
+
+    # Batch totals for the summary; the client only holds loaded pages
+    by_status = (
+        db.query(
+            Payout.status,
+            func.count(Payout.payout_id),
+            func.coalesce(func.sum(Payout.paid_amount), 0),
+        )
         .filter(Payout.payout_batch_id == batch_id)
-        .order_by(Payout.payout_id)
+        .group_by(Payout.status)
         .all()
     )
 
     return {
+        "next_cursor": next_cursor,
         "batch": {
             "batch_id": batch.payout_batch_id,
             "tenant_id": batch.tenant_id,
@@ -181,6 +210,9 @@ def get_payout_batch_detail(
             "status": batch.status,
             "created_at_utc": batch.created_at_utc,
             "processed_at_utc": batch.processed_at_utc,
+            "total_payouts": sum(count for _, count, _ in by_status),
+            "total_amount": float(sum(amount for _, _, amount in by_status)),
+            "payouts_by_status": {status: count for status, count, _ in by_status},
         },
         "payouts": [
             {
@@ -266,15 +298,22 @@ def list_batch_payments(
 @router.get("/{batch_id}/payouts")
 def list_batch_payout(
     batch_id: int,
+    response: Response,
     db: Session = Depends(get_db),
     _: dict = Depends(require_app_admin),
+    cursor: str | None = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
 ):
-    payouts = (
-        db.query(Payout)
-        .filter(Payout.payout_batch_id == batch_id)
-        .order_by(Payout.payout_id)
-        .all()
+    # Keyset paginated on payout_id; next page cursor in X-Next-Cursor
+    payouts, next_cursor = keyset_page(
+        db.query(Payout).filter(Payout.payout_batch_id == batch_id),
+        (Payout.payout_id,),
+        cursor,
+        limit,
+        descending=False,
     )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     
     return [
         {
@@ -2,9 +2,17 @@ from fastapi import APIRouter, Depends, HTTPException, Body
 from sqlalchemy.orm import Session
 from datetime import datetime, timezone
 
-from app.core.dependencies import get_db
+from app.core.dependencies import get_db, get_read_db
 from app.core.security.roles import require_app_admin
 from app.core.security.password import hash_password
+from app.core.security.principal_cache import principal_cache_stats
+from app.core.db_pool import pool_metrics
+from app.core.request_stats import request_stats_report
+from app.core.db_partitions import run_partition_maintenance, UnpartitionedTablesError
+from app.core.database import replica_status
+from app.core.lookup_registry import bump_lookup_version
+from app.core.dashboard_counters import dashboard_counters, reconcile_counters
+from app.core.ledger.balance_checkpoints import build_checkpoints, verify_wallet_balances
 
 from app.models.core.tenants.tenants import Tenant
 from app.models.core.tenants.tenant_documents import TenantDocument
@@ -16,7 +24,6 @@ from app.schemas.core.admins.create_tenant_admin import TenantAdminCreate
 
 from app.models.lookups.country import Country
 from app.models.lookups.tenant_Fleet_document_types import TenantFleetDocumentType
-from sqlalchemy import func
 
 router = APIRouter(
     prefix="/app-admin",
@@ -273,38 +280,18 @@ def reject_tenant_document(
 
 @router.get("/tenants/summary")
 def tenant_summary(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _: dict = Depends(require_app_admin),
 ):
-    total = db.query(func.count(Tenant.tenant_id)).scalar()
-
-    approved = db.query(func.count(Tenant.tenant_id)).filter(
-        Tenant.approval_status == "approved"
-    ).scalar()
-
-    pending = db.query(func.count(Tenant.tenant_id)).filter(
-        Tenant.approval_status == "pending"
-    ).scalar()
-
-    rejected = db.query(func.count(Tenant.tenant_id)).filter(
-        Tenant.approval_status == "rejected"
-    ).scalar()
-
-    active = db.query(func.count(Tenant.tenant_id)).filter(
-        Tenant.status == "active"
-    ).scalar()
-
-    inactive = db.query(func.count(Tenant.tenant_id)).filter(
-        Tenant.status == "inactive"
-    ).scalar()
+    counters = dashboard_counters(db, "platform")
 
     return {
-        "total_tenants": total,
-        "approved": approved,
-        "pending": pending,
-        "rejected": rejected,
-        "active": active,
-        "inactive": inactive,
+        "total_tenants": counters["total_tenants"],
+        "approved": counters["approved"],
+        "pending": counters["pending"],
+        "rejected": counters["rejected"],
+        "active": counters["active"],
+        "inactive": counters["inactive"],
     }
 
 
@@ -446,4 +433,71 @@ def get_tenant_admin(
             "email": user.email,
             "is_active": user.is_active,
         },
-    }
\ No newline at end of file
+    }
+
+
+@router.get("/metrics/principal-cache")
+def get_principal_cache_metrics(
+    _: dict = Depends(require_app_admin),
+):
+    """Guard principal cache hit/miss counters (this worker process)."""
+    return principal_cache_stats()
+
+
+@router.get("/metrics/db-pools")
+def get_db_pool_metrics(
+    _: dict = Depends(require_app_admin),
+):
+    """Connection pool usage and checkout wait per engine (this worker process)."""
+    return {
+        "pools": pool_metrics(),
+        "replicas": replica_status(),
+    }
+
+
+@router.get("/metrics/requests")
+def get_request_metrics(
+    _: dict = Depends(require_app_admin),
+):
+    """Per-route SQL / Redis histograms and N+1 counts (this worker process)."""
+    return request_stats_report()
+
+
+@router.post("/maintenance/partitions")
+def run_partitions_maintenance(
+    db: Session = Depends(get_db),
+    _: dict = Depends(require_app_admin),
+):
+    """Create upcoming monthly partitions and archive those past retention."""
+    try:
+        return run_partition_maintenance(db)
+    except UnpartitionedTablesError as exc:
+        raise HTTPException(409, str(exc))
+
+
+@router.post("/maintenance/lookups/reload")
+def reload_lookups(
+    _: dict = Depends(require_app_admin),
+):
+    """Call after editing lookup tables: every process reloads its registry."""
+    return {"version": bump_lookup_version()}
+
+
+@router.post("/maintenance/dashboard-counters")
+def reconcile_dashboard_counters(
+    db: Session = Depends(get_read_db),
+    _: dict = Depends(require_app_admin),
+):
+    """Recompute all dashboard counters from Postgres (drift repair)."""
+    return reconcile_counters(db)
+
+
+@router.post("/maintenance/ledger-checkpoints")
+def run_ledger_checkpoints(
+    db: Session = Depends(get_db),
+    _: dict = Depends(require_app_admin),
+):
+    """Fold new ledger entries into the balance checkpoints and verify wallets."""
+    result = build_checkpoints(db)
+    result["verify"] = verify_wallet_balances(db)
+    return result
@@ -0,0 +1,75 @@
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, Depends, Query, Body
+from sqlalchemy.orm import Session
+
+from app.core.dependencies import get_db, get_read_db
+from app.core.security.roles import require_app_admin
+from app.core.analytics.rollups import query_rollup, run_rollups, backfill, get_source
+
+router = APIRouter(
+    prefix="/app-admin/analytics",
+    tags=["Platform / Analytics"],
+)
+
+
+def _utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+@router.get("/{source}")
+def get_rollup(
+    source: str,
+    start: datetime,
+    end: datetime,
+    grain: str = Query(default="hour"),
+    tenant_id: int | None = None,
+    city_id: int | None = None,
+    group_by: str | None = Query(default=None, description="Comma separated dimensions"),
+    db: Session = Depends(get_read_db),
+    _: dict = Depends(require_app_admin),
+):
+    """
+    Range query over hourly / daily rollups, e.g.
+    /app-admin/analytics/trips?grain=day&start=...&end=...&group_by=city_id
+    """
+    filters = {"tenant_id": tenant_id}
+    if city_id is not None:
+        filters["city_id"] = city_id
+
+    rows = query_rollup(
+        db,
+        source,
+        grain,
+        _utc(start),
+        _utc(end),
+        filters=filters,
+        group_by=[d.strip() for d in group_by.split(",") if d.strip()] if group_by else None,
+    )
+    return {
+        "source": source,
+        "grain": grain,
+        "dimensions": get_source(source).dimensions,
+        "rows": rows,
+    }
+
+
+@router.post("/run")
+def run_rollups_now(
+    db: Session = Depends(get_db),
+    _: dict = Depends(require_app_admin),
+):
+    """Fold changes since the watermarks into the rollups right away."""
+    return run_rollups(db)
+
+
+@router.post("/backfill")
+def backfill_rollups(
+    start: datetime = Body(...),
+    end: datetime = Body(...),
+    sources: list[str] | None = Body(default=None),
+    db: Session = Depends(get_db),
+    _: dict = Depends(require_app_admin),
+):
+    """Rebuild every bucket in [start, end). Large ranges: use the CLI instead."""
+    return backfill(db, _utc(start), _utc(end), sources)
@@ -3,7 +3,7 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
-from app.core.dependencies import get_db
+from app.core.dependencies import get_read_db
 from app.models.core.tenants.tenants import Tenant
 
 router = APIRouter(
@@ -12,7 +12,7 @@ router = APIRouter(
 )
 
 @router.get("/active")
-def list_active_tenants(db: Session = Depends(get_db)):
+def list_active_tenants(db: Session = Depends(get_read_db)):
     tenants = (
         db.query(Tenant)
         .filter(
@@ -6,6 +6,7 @@ from datetime import datetime, timezone
 
 from app.core.dependencies import get_db
 from app.core.security.roles import require_tenant_admin
+from app.core.security.principal_cache import invalidate_principal
 from app.models.core.drivers.drivers import Driver
 from app.models.core.drivers.driver_documents import DriverDocument
 from app.models.lookups.driver_document_type import DriverDocumentType
@@ -91,6 +92,7 @@ def approve_driver(
     driver.approved_at_utc = datetime.now(timezone.utc)
 
     db.commit()
+    invalidate_principal(driver.user_id, "driver")
 
     return {
         "status": "driver approved",
@@ -6,6 +6,7 @@ from app.models.core.fleet_owners.fleet_owners import FleetOwner
 
 from app.core.dependencies import get_db
 from app.core.security.roles import require_tenant_admin
+from app.core.security.principal_cache import invalidate_principal
 from app.models.core.fleet_owners.fleet_owners import FleetOwner
 from app.models.core.fleet_owners.fleet_owner_documents import FleetOwnerDocument
 from app.models.lookups.fleet_document_type import FleetDocumentType
@@ -94,6 +95,7 @@ def approve_fleet_owner(
     fleet.approved_at_utc = datetime.now(timezone.utc)
 
     db.commit()
+    invalidate_principal(fleet.user_id, "fleet-owner")
 
     return {
         "status": "fleet owner approved",
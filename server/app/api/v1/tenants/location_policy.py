@@ -0,0 +1,66 @@
+from dataclasses import asdict
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.core.security.roles import require_tenant_admin
+from app.core.location.ingestion_policy import (
+    LocationPolicy,
+    get_location_policy,
+    set_location_policy,
+    location_ingestion_report,
+    reset_location_ingestion_stats,
+)
+from app.schemas.core.tenants.location_policy import LocationPolicyUpdate, LocationPolicyOut
+
+
+router = APIRouter(
+    prefix="/{tenant_id}/location-policy",
+    tags=["Tenant Admin – Location Policy"],
+)
+
+
+def _ensure_tenant(user: dict, tenant_id: int):
+    if user.get("tenant_id") != tenant_id:
+        raise HTTPException(status_code=403, detail="Access denied for this tenant")
+
+
+@router.get("", response_model=LocationPolicyOut)
+def get_policy(
+    tenant_id: int,
+    user: dict = Depends(require_tenant_admin),
+):
+    _ensure_tenant(user, tenant_id)
+    return LocationPolicyOut(tenant_id=tenant_id, **asdict(get_location_policy(tenant_id)))
+
+
+@router.put("", response_model=LocationPolicyOut)
+def update_policy(
+    tenant_id: int,
+    payload: LocationPolicyUpdate,
+    user: dict = Depends(require_tenant_admin),
+):
+    _ensure_tenant(user, tenant_id)
+    policy = set_location_policy(tenant_id, LocationPolicy(**payload.model_dump()))
+    return LocationPolicyOut(tenant_id=tenant_id, **asdict(policy))
+
+
+@router.get("/report")
+def get_policy_report(
+    tenant_id: int,
+    user: dict = Depends(require_tenant_admin),
+):
+    """
+    GEO write reduction vs. dispatch distance error since the last reset.
+    """
+    _ensure_tenant(user, tenant_id)
+    return location_ingestion_report(tenant_id)
+
+
+@router.delete("/report")
+def reset_policy_report(
+    tenant_id: int,
+    user: dict = Depends(require_tenant_admin),
+):
+    _ensure_tenant(user, tenant_id)
+    reset_location_ingestion_stats(tenant_id)
+    return {"tenant_id": tenant_id, "message": "Location ingestion stats reset"}
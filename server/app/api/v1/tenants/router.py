@@ -9,6 +9,7 @@ from .tenant_finances import router as tenant_finances_router
 from .dashboard import router as tenant_dashboard_router
 from ..pricing.tenant_fare_config import router as tenant_fare_config_router;
 from ..pricing.surge_pricing import router as tenant_surge_router
+from .location_policy import router as tenant_location_policy_router
 
 
 router = APIRouter(prefix="/tenant-admin",)
@@ -23,5 +24,6 @@ router.include_router(tenant_finances_router)
 router.include_router(get_tenant_router)
 router.include_router(tenant_fare_config_router)
 router.include_router(tenant_surge_router)
+router.include_router(tenant_location_policy_router)
 
 
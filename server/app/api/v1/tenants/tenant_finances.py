@@ -14,11 +14,13 @@ from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from typing import Optional
 
-from app.core.dependencies import get_db
+from app.core.dependencies import get_read_db, get_primary_read_db
 from app.core.security.roles import require_tenant_admin
 from app.models.core.wallets.tenant_wallet import TenantWallet
 from app.models.core.accounting.ledger import FinancialLedger
 from app.models.core.tenants.tenants import Tenant
+from app.core.ledger.ledger_service import LedgerService
+from app.core.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 router = APIRouter(
     tags=["Tenant Admin – Finances"],
@@ -33,7 +35,7 @@ router = APIRouter(
 @router.get("/wallet")
 def get_tenant_wallet(
     tenant: dict = Depends(require_tenant_admin),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_primary_read_db),
 ):
     try:
         tenant_id = tenant.get("tenant_id")
@@ -69,3 +71,32 @@ def get_tenant_wallet(
             status_code=500,
             detail=f"Failed to fetch wallet: {str(e)}",
         )
+
+
+# ================================================================
+# LEDGER ENDPOINT (keyset paginated)
+# ================================================================
+
+@router.get("/ledger")
+def get_tenant_ledger(
+    tenant: dict = Depends(require_tenant_admin),
+    db: Session = Depends(get_read_db),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+):
+    """
+    Tenant's ledger entries, newest first.
+    Pass the returned next_cursor as ?cursor= for the next page.
+    """
+    tenant_id = tenant.get("tenant_id")
+    if not tenant_id:
+        raise HTTPException(status_code=400, detail="Tenant ID not in token")
+
+    return LedgerService.get_entity_history(
+        db,
+        tenant_id=tenant_id,
+        entity_type="tenant",
+        entity_id=tenant_id,
+        cursor=cursor,
+        limit=limit,
+    )
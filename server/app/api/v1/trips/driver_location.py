@@ -1,16 +1,20 @@
 # app/api/v1/driver/location.py
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timezone
 
-from app.core.dependencies import get_db
-from app.core.security.roles import require_driver
+from app.core.dependencies import get_async_db
+from app.core.security.roles import driver_principal
+from app.core.security.rate_limit import rate_limit
 from app.schemas.core.drivers.driver_location import DriverLocationUpdate
 from app.models.core.drivers.driver_shifts import DriverShift
 from app.models.core.fleet_owners.driver_vehicle_assignments import DriverVehicleAssignment
 from app.models.core.vehicles.vehicles import Vehicle
-from app.core.redis import redis_client
+from app.core.redis import async_redis_client, driver_runtime_key
+from app.core.location.ingestion_policy import ingest_driver_location
 from app.models.core.drivers.driver_current_status import DriverCurrentStatus
 
 
@@ -19,87 +23,85 @@ router = APIRouter(
     tags=["Driver – Location"],
 )
 
-@router.post("/location")
-
-def update_driver_location(
+@router.post(
+    "/location",
+    dependencies=[Depends(rate_limit("driver_location", "user"))],
+)
+async def update_driver_location(
     payload: DriverLocationUpdate,
-    db: Session = Depends(get_db),
-    driver=Depends(require_driver),
+    db: AsyncSession = Depends(get_async_db),
+    driver=Depends(driver_principal),
 ):
     now = datetime.now(timezone.utc)
 
     # 1️⃣ Online shift required
-    shift = (
-        db.query(DriverShift)
-        .filter(
+    shift = await db.scalar(
+        select(DriverShift)
+        .where(
             DriverShift.driver_id == driver.driver_id,
             DriverShift.shift_status == "online",
         )
-        .first()
+        .limit(1)
     )
     if not shift:
         raise HTTPException(400, "Driver is not online")
     
     if driver.driver_type=='individual':
-        vehicles = (
-            db.query(Vehicle)
-            .filter(
+        vehicle_id = await db.scalar(
+            select(Vehicle.vehicle_id)
+            .where(
                 Vehicle.driver_owner_id == driver.driver_id,
                 Vehicle.status == 'approved'
             )
-            .all()
+            .limit(1)
         )
 
-        if not vehicles:
+        if not vehicle_id:
             raise HTTPException(400, "No vehicles found")
     else:
         # 2️⃣ Active vehicle required
-        assignment = (
-            db.query(DriverVehicleAssignment)
-            .filter(
+        assignment_id = await db.scalar(
+            select(DriverVehicleAssignment.assignment_id)
+            .where(
                 DriverVehicleAssignment.driver_id == driver.driver_id,
                 DriverVehicleAssignment.is_active.is_(True),
             )
-            .first()
+            .limit(1)
         )
-        if not assignment:
+        if not assignment_id:
             raise HTTPException(400, "No vehicle assigned")
 
     tenant_id = driver.tenant_id
     city_id = shift.city_id
 
-    # 3️⃣ Update GEO location
-    geo_key = f"drivers:geo:{tenant_id}:{city_id}"
-    redis_client.geoadd(
-        geo_key,
-        payload.longitude,
-        payload.latitude,
-        str(driver.driver_id),
-    )
-
-    # 4️⃣ Heartbeat
-    redis_client.setex(
-        f"driver:last_seen:{driver.driver_id}",
-        60,
-        now.isoformat(),
+    # 3️⃣ GEO location + heartbeat (GEO write skipped for parked drivers)
+    # Blocking Redis client: run in the threadpool, not on the event loop
+    await run_in_threadpool(
+        ingest_driver_location,
+        driver_id=driver.driver_id,
+        tenant_id=tenant_id,
+        city_id=city_id,
+        lat=payload.latitude,
+        lng=payload.longitude,
+        heading=payload.heading,
     )
 
     # 5️⃣ Runtime status (DB → Redis)
-    runtime = (
-        db.query(DriverCurrentStatus)
-        .filter(
+    runtime_status = await db.scalar(
+        select(DriverCurrentStatus.runtime_status)
+        .where(
             DriverCurrentStatus.driver_id == driver.driver_id,
             DriverCurrentStatus.tenant_id == tenant_id,
         )
-        .first()
+        .limit(1)
     )
 
-    status = runtime.runtime_status if runtime else "available"
+    status = runtime_status or "available"
 
-    redis_client.setex(
-        f"driver:runtime:{driver.driver_id}",
-        60,
+    await async_redis_client.set(
+        driver_runtime_key(tenant_id, city_id, driver.driver_id),
         status,
+        ex=60,
     )
 
     return {
@@ -12,16 +12,23 @@ from sqlalchemy.orm import Session
 from datetime import datetime, timezone
 
 from app.core.dependencies import get_db
-from app.core.security.roles import require_driver
+from app.core.security.roles import driver_principal
+from app.core.security.principal_cache import Principal
 from app.models.core.trips.trip_request import TripRequest
 from app.models.core.trips.trip_batch import TripBatch
 from app.models.core.trips.trip_dispatch_candidates import TripDispatchCandidate
 from app.models.core.trips.trips import Trip
-from app.models.core.drivers.drivers import Driver
 from app.schemas.core.trips.driver_response import DriverTripResponse
 from app.core.trips.trip_otp_service import generate_trip_otp, store_trip_otp
 from app.core.trips.trip_lifecycle import TripLifecycle
 from app.models.core.trips.trip_status_history import TripStatusHistory
+from app.core.trips.trip_events import (
+    publish_trip_status,
+    set_active_trip,
+    clear_active_trip,
+)
+from app.core.trips.offer_stream import mark_driver_reachable
+from app.core.trips.trip_snapshot import delete_trip_snapshot
 
 router = APIRouter(
     prefix="/driver/trips",
@@ -29,13 +36,25 @@ router = APIRouter(
 )
 
 
+# Sync on purpose: the body mixes Postgres locks with blocking Redis calls
+# (offers, OTP, snapshot), which must not run on the event loop.
 @router.post("/respond/{trip_request_id}/{batch_id}")
 def driver_respond_to_batch(
     trip_request_id: int,
     batch_id: int,
     payload: DriverTripResponse,
     db: Session = Depends(get_db),
-    driver: Driver = Depends(require_driver),
+    driver: Principal = Depends(driver_principal),
+):
+    return _respond_to_batch(db, trip_request_id, batch_id, payload, driver)
+
+
+def _respond_to_batch(
+    db: Session,
+    trip_request_id: int,
+    batch_id: int,
+    payload: DriverTripResponse,
+    driver: Principal,
 ):
     now = datetime.now(timezone.utc)
 
@@ -50,6 +69,8 @@ def driver_respond_to_batch(
     if not trip_req:
         raise HTTPException(status_code=404, detail="Trip request not found")
 
+    mark_driver_reachable(driver.driver_id)
+
     # ===================== ACCEPT =====================
     if payload.response == "accepted":
 
@@ -113,6 +134,26 @@ def driver_respond_to_batch(
         # Lock driver after commit
         TripLifecycle.lock_driver(db, driver.driver_id, trip.trip_id)
 
+        # Status read model: driver/vehicle joined once, served from Redis
+        TripLifecycle.store_status_snapshot(db, trip_req, trip)
+
+        # Push to rider + start live position/ETA stream
+        set_active_trip(
+            tenant_id=trip.tenant_id,
+            city_id=trip.city_id,
+            driver_id=driver.driver_id,
+            trip_request_id=trip_request_id,
+            trip_id=trip.trip_id,
+            pickup_lat=trip_req.pickup_lat,
+            pickup_lng=trip_req.pickup_lng,
+        )
+        publish_trip_status(
+            trip_request_id,
+            "driver_assigned",
+            trip_id=trip.trip_id,
+            driver_id=driver.driver_id,
+        )
+
         return {
             "response": "accepted",
             "trip_id": trip.trip_id,
@@ -169,6 +210,9 @@ def driver_respond_to_batch(
 
         db.commit()
 
+        if not next_batch:
+            publish_trip_status(trip_request_id, "no_drivers_available")
+
         return {
             "response": "rejected",
             "trip_request_id": trip_request_id,
@@ -217,6 +261,15 @@ def driver_respond_to_batch(
 
         db.commit()
 
+        clear_active_trip(trip.tenant_id, trip.city_id, driver.driver_id)
+        delete_trip_snapshot(trip_request_id)
+        publish_trip_status(
+            trip_request_id,
+            "driver_searching",
+            trip_id=trip.trip_id,
+            reason="driver_cancelled",
+        )
+
         return {
             "response": "cancelled",
             "trip_id": trip.trip_id,
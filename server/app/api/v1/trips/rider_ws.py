@@ -0,0 +1,97 @@
+# app/api/v1/trips/rider_ws.py
+
+import asyncio
+import json
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.database import SessionLocal
+from app.core.redis import rider_channel
+from app.core.realtime.pubsub_hub import pubsub_hub
+from app.core.security.jwt import _decode_token
+from app.models.core.trips.trip_request import TripRequest
+
+router = APIRouter()
+
+
+def _load_trip_request_status(trip_request_id: int, user_id: int) -> str | None:
+    # Short-lived session: the socket must not hold a DB connection
+    db = SessionLocal()
+    try:
+        trip_req = (
+            db.query(TripRequest.status)
+            .filter(
+                TripRequest.trip_request_id == trip_request_id,
+                TripRequest.user_id == user_id,
+            )
+            .first()
+        )
+        return trip_req.status if trip_req else None
+    finally:
+        db.close()
+
+
+async def _wait_for_disconnect(websocket: WebSocket):
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+
+
+async def _forward(websocket: WebSocket, queue: asyncio.Queue):
+    while True:
+        message = await queue.get()
+        await websocket.send_text(message)
+
+
+@router.websocket("/ws/rider/trips/{trip_request_id}")
+async def rider_trip_ws(websocket: WebSocket, trip_request_id: int, token: str):
+    """
+    Push channel for a rider's trip: status transitions plus live driver
+    position / ETA while the driver is on the way. Replaces polling
+    GET /rider/trips/request/{id}/status.
+    """
+    try:
+        user = _decode_token(token)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    if user.get("role") != "rider":
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    current_status = await run_in_threadpool(
+        _load_trip_request_status, trip_request_id, int(user.get("sub"))
+    )
+    if current_status is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+
+    # Subscribe before sending the snapshot so no transition is missed
+    channel = rider_channel(trip_request_id)
+    queue = pubsub_hub.subscribe(channel)
+
+    tasks = []
+    try:
+        await websocket.send_text(json.dumps({
+            "type": "snapshot",
+            "trip_request_id": trip_request_id,
+            "status": current_status,
+        }))
+
+        tasks = [
+            asyncio.create_task(_wait_for_disconnect(websocket)),
+            asyncio.create_task(_forward(websocket, queue)),
+        ]
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        for task in tasks:
+            task.cancel()
+        pubsub_hub.unsubscribe(channel, queue)
@@ -5,6 +5,7 @@ from .driver_response import router as drive_response_router
 from .trip_complete import router as trip_complete_router
 from .trip_rating import router as trip_rating_router
 from .trip_cancellation import router as trip_cancellation_router
+from .rider_ws import router as rider_ws_router
 
 from fastapi import APIRouter
 
@@ -16,4 +17,5 @@ router.include_router(trip_start_router)
 router.include_router(drive_response_router)
 router.include_router(trip_complete_router)
 router.include_router(trip_rating_router)
-router.include_router(trip_cancellation_router)
\ No newline at end of file
+router.include_router(trip_cancellation_router)
+router.include_router(rider_ws_router)
\ No newline at end of file
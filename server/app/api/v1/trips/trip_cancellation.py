@@ -26,6 +26,8 @@ from app.models.core.drivers.driver_current_status import DriverCurrentStatus
 from app.core.ledger.ledger_service import LedgerService
 from app.schemas.core.trips.trip_cancel import CancellationRequest, CancellationResponse
 from app.models.core.trips.trip_request import TripRequest
+from app.core.trips.trip_events import publish_trip_status, clear_active_trip
+from app.core.trips.trip_snapshot import delete_trip_snapshot
 
 router = APIRouter(
     prefix="/trips",
@@ -127,6 +129,11 @@ def cancel_trip_rider(
     ))
     
     db.commit()
+
+    if trip.driver_id:
+        clear_active_trip(trip.tenant_id, trip.city_id, trip.driver_id)
+    delete_trip_snapshot(trip.trip_request_id)
+    publish_trip_status(trip.trip_request_id, "cancelled", trip_id=trip.trip_id, cancelled_by="rider")
     
     return CancellationResponse(
         status="trip_cancelled",
@@ -234,6 +241,10 @@ def cancel_trip_driver(
     # ------------------------------------------------
     db.commit()
 
+    clear_active_trip(trip.tenant_id, trip.city_id, driver.driver_id)
+    delete_trip_snapshot(trip.trip_request_id)
+    publish_trip_status(trip.trip_request_id, "driver_cancelled", trip_id=trip.trip_id)
+
     return CancellationResponse(
         status="trip_cancelled",
         trip_id=trip.trip_id,
@@ -25,6 +25,8 @@ from app.core.trips.trip_lifecycle import TripLifecycle
 from app.models.core.payments.payments import Payment
 from app.models.lookups.city import City
 from app.models.lookups.country import Country
+from app.core.trips.trip_events import publish_trip_status
+from app.core.trips.trip_snapshot import update_trip_snapshot
 
 from app.schemas.core.trips.trip_complete import TripCompleteRequest, TripCompleteResponse,FareBreakdown
 
@@ -234,6 +236,15 @@ def complete_trip(
     trip.fare_total = fare_breakdown['total_fare']
     db.add(trip)
     db.flush()
+
+    update_trip_snapshot(trip.trip_request_id, trip_status="completed")
+    publish_trip_status(
+        trip.trip_request_id,
+        "completed",
+        trip_id=trip.trip_id,
+        total_fare=fare_breakdown["total_fare"],
+        currency=fare_breakdown["currency"],
+    )
     
     return TripCompleteResponse(
         status="trip_completed",
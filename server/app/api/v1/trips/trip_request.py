@@ -8,18 +8,25 @@ Trip Request Endpoints - Multi-tenant ride-sharing trip flow
 4️⃣ Start Driver Search (batch-wise)
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response, Header, Query
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timezone
 import math
 import json
+import asyncio
 from sqlalchemy import or_, and_
-from sqlalchemy import text
+from sqlalchemy import text, select
 from sqlalchemy.exc import ProgrammingError
 
 
-from app.core.dependencies import get_db
-from app.core.security.roles import require_rider
+from app.core.dependencies import get_db, get_async_read_db
+from app.core.database import ReadSessionLocal, read_only_bind, engine
+from app.core.security.jwt import verify_access_token
+from app.core.security.roles import require_rider, rider_principal
+from app.core.security.principal_cache import Principal
+from app.core.security.rate_limit import rate_limit
 from app.models.core.users.users import User
 from app.models.core.tenants.tenants import Tenant
 from app.models.core.tenants.tenant_cities import TenantCity
@@ -40,11 +47,32 @@ from app.schemas.core.trips.trip_request import (
     TenantSelectionResponse,
 )
 from app.core.fare.tenant_vehicle_categoy_price import get_vehicle_pricing
-from app.models.lookups.vehicle_category import VehicleCategory
+from app.core.lookup_registry import lookup_registry
 from app.schemas.core.trips.trip_request import TripStatusOut
 from app.core.trips.trip_otp_service import generate_trip_otp, store_trip_otp
 import os
 from app.core.trips.trip_otp_service import _otp_plain_key
+from app.core.trips.trip_events import publish_trip_status
+from app.core.trips.offer_stream import publish_offers, unreachable_drivers
+from app.core.trips.trip_lifecycle import TripLifecycle
+from app.core.trips.trip_snapshot import (
+    SNAPSHOT_STATUSES,
+    get_trip_snapshot,
+    get_trip_snapshot_async,
+    store_trip_snapshot,
+    delete_trip_snapshot,
+)
+from app.core.trips.status_version import (
+    get_status_version,
+    get_status_version_async,
+    set_status_owner,
+    set_status_owner_async,
+    bump_status_version,
+    make_etag,
+    etag_matches,
+)
+from app.core.redis import rider_channel, trip_request_status_key, trip_status_key
+from app.core.realtime.pubsub_hub import pubsub_hub
 from sqlalchemy import and_, func
 
 router = APIRouter(
@@ -241,6 +269,7 @@ def list_available_tenants(
     
     # ====== Build tenant availability info ======
     tenants_info = []
+    vehicle_categories = lookup_registry().rows("vehicle_categories")
     
     for tid in tenant_ids:
         tenant = db.query(Tenant).filter(
@@ -254,8 +283,6 @@ def list_available_tenants(
         estimated_duration = trip_req.estimated_duration_minutes
         
 
-        vehicle_categories = db.query(VehicleCategory).all()
-
         vehicles = []
 
         for category in vehicle_categories:
@@ -263,7 +290,7 @@ def list_available_tenants(
                 db=db,
                 tenant_id=tenant.tenant_id,
                 city_id=city_id,
-                vehicle_category=category.category_code,
+                vehicle_category=category["category_code"],
                 estimated_distance_km=estimated_distance,
                 estimated_duration_minutes=estimated_duration,
                 pickup_lat=trip_req.pickup_lat,
@@ -350,6 +377,8 @@ def select_tenant(
     db.commit()
     db.refresh(trip_req)
 
+    publish_trip_status(trip_req.trip_request_id, "tenant_selected")
+
     return TenantSelectionResponse(
         trip_request_id=trip_req.trip_request_id,
         status="tenant_selected",
@@ -394,22 +423,28 @@ class DriverSearchStartResponse:
         self.status = "driver_search_started"
 
 
+# Sync on purpose: dispatch does GEO searches and offer publishing on the
+# blocking Redis client between Postgres statements.
 @router.post("/start-driver-search/{trip_request_id}")
 def start_driver_search(
     trip_request_id: int,
     db: Session = Depends(get_db),
-    rider: User = Depends(require_rider),
+    rider: Principal = Depends(rider_principal),
 ):
+    return _start_driver_search(db, trip_request_id, rider.user_id)
+
+
+def _start_driver_search(db: Session, trip_request_id: int, user_id: int):
     from app.models.core.trips.trip_batch import TripBatch
     from app.models.core.trips.trip_dispatch_candidates import TripDispatchCandidate
-    from app.core.redis import redis_client
+    from app.core.redis import redis_client, geo_key
 
     # ------------------------------------------------
     # 1️⃣ Fetch trip request
     # ------------------------------------------------
     trip_req = db.query(TripRequest).filter(
         TripRequest.trip_request_id == trip_request_id,
-        TripRequest.user_id == rider.user_id,
+        TripRequest.user_id == user_id,
     ).first()
 
     if not trip_req:
@@ -438,8 +473,8 @@ def start_driver_search(
     batch_cfg = BATCH_CONFIG[0]
 
    
-    geo_key = f"drivers:geo:{tenant_id}:{city_id}"
-    print("geo key :",geo_key)
+    city_geo_key = geo_key(tenant_id, city_id)
+    print("geo key :",city_geo_key)
 
     pickup_lat = float(trip_req.pickup_lat)
     pickup_lng = float(trip_req.pickup_lng)
@@ -450,7 +485,7 @@ def start_driver_search(
 
     for batch_cfg in BATCH_CONFIG:
         nearby_drivers = redis_client.georadius(
-            geo_key,
+            city_geo_key,
             pickup_lng,
             pickup_lat,
             float(batch_cfg["radius_km"]),
@@ -481,6 +516,7 @@ def start_driver_search(
       
         trip_req.status = "no_drivers_available"
         db.commit()
+        publish_trip_status(trip_req.trip_request_id, "no_drivers_available")
         return {
             "trip_request_id": trip_req.trip_request_id,
             "batch_id": None,
@@ -500,6 +536,7 @@ def start_driver_search(
        
         trip_req.status = "no_drivers_available"
         db.commit()
+        publish_trip_status(trip_req.trip_request_id, "no_drivers_available")
         return {
             "trip_request_id": trip_req.trip_request_id,
             "batch_id": None,
@@ -531,6 +568,7 @@ def start_driver_search(
     if not available_driver_ids:
         trip_req.status = "no_drivers_available"
         db.commit()
+        publish_trip_status(trip_req.trip_request_id, "no_drivers_available")
         return {
             "trip_request_id": trip_req.trip_request_id,
             "batch_id": None,
@@ -540,6 +578,15 @@ def start_driver_search(
             "message": "All nearby drivers have already rejected this trip.",
         }
 
+    # Skip drivers that stopped receiving offers, unless nobody else is left
+    unreachable = unreachable_drivers(available_driver_ids)
+    if unreachable and len(unreachable) < len(available_driver_ids):
+        available_driver_ids = [
+            driver_id
+            for driver_id in available_driver_ids
+            if driver_id not in unreachable
+        ]
+
 
 
 
@@ -580,11 +627,19 @@ def start_driver_search(
     db.commit()
     db.refresh(trip_batch)
 
-    for driver_id in available_driver_ids:
-        redis_client.publish(
-            f"driver:trip_request:{driver_id}",
-            json.dumps({"trip_request_id": trip_req.trip_request_id, "batch_id": trip_batch.trip_batch_id}),
-        )
+    publish_offers(
+        available_driver_ids,
+        trip_req.trip_request_id,
+        trip_batch.trip_batch_id,
+        batch_cfg["timeout_sec"],
+    )
+
+    publish_trip_status(
+        trip_req.trip_request_id,
+        "driver_searching",
+        batch_id=trip_batch.trip_batch_id,
+        drivers_notified=len(available_driver_ids),
+    )
 
     return {
         "trip_request_id": trip_req.trip_request_id,
@@ -596,176 +651,330 @@ def start_driver_search(
     }
 
 
-@router.get("/request/{trip_request_id}/status", response_model=TripStatusOut)
-def get_trip_request_status(
+LONG_POLL_DEFAULT_SECONDS = 25
+LONG_POLL_MAX_SECONDS = 55
+
+
+def _load_status_snapshot(db: Session, trip_request_id: int, user_id: int) -> dict:
+    """Postgres fallback: rebuild the status snapshot (and cache it while assigned)."""
+    trip_req = db.query(TripRequest).filter(
+        TripRequest.trip_request_id == trip_request_id,
+        TripRequest.user_id == user_id,
+    ).first()
+
+    if not trip_req:
+        raise HTTPException(status_code=404, detail="Trip request not found")
+
+    trip = None
+    if trip_req.status in SNAPSHOT_STATUSES:
+        trip = (
+            db.query(Trip)
+            .filter(Trip.trip_request_id == trip_request_id)
+            .order_by(Trip.trip_id.desc())
+            .first()
+        )
+
+    snapshot = TripLifecycle.build_status_snapshot(db, trip_req, trip)
+
+    if trip:
+        store_trip_snapshot(snapshot)
+    elif trip_req.status == "tenant_selected":
+        cancelled_trip = db.query(Trip.trip_id).filter(
+            Trip.trip_request_id == trip_request_id,
+            Trip.trip_status == "cancelled",
+        ).first()
+        if cancelled_trip:
+            snapshot["status"] = "driver_cancelled"
+
+    return snapshot
+
+
+def _otp_etag_part(otp) -> str | None:
+    # The OTP expires without a version bump: its presence is part of the ETag
+    return "otp" if otp else None
+
+
+def _queue_live_fields(pipe, snapshot: dict):
+    from app.core.redis import geo_key, driver_geo_state_key
+
+    assigned = snapshot["assigned_info"]
+    tenant_id, city_id = snapshot["tenant_id"], snapshot["city_id"]
+    pipe.get(_otp_plain_key(assigned["trip_id"]))
+    pipe.geopos(geo_key(tenant_id, city_id), str(assigned["driver_id"]))
+    pipe.hget(driver_geo_state_key(tenant_id, city_id, assigned["driver_id"]), "ts")
+    return pipe
+
+
+def _live_fields(otp, pos, geo_ts) -> dict:
+    return {"otp": otp or None, "pos": pos[0] if pos else None, "geo_ts": geo_ts}
+
+
+def _read_live_fields(snapshot: dict) -> dict:
+    """OTP, driver GEO position and its last GEO write (part of the ETag)."""
+    from app.core.redis import redis_client
+
+    try:
+        return _live_fields(*_queue_live_fields(redis_client.pipeline(transaction=False), snapshot).execute())
+    except Exception as e:
+        # best-effort -- do not fail status endpoint
+        print(f"[TRIP_STATUS] live fields error: {e}")
+        return {"otp": None, "pos": None, "geo_ts": None}
+
+
+async def _read_live_fields_async(snapshot: dict) -> dict:
+    from app.core.redis import async_redis_client
+
+    try:
+        pipe = _queue_live_fields(async_redis_client.pipeline(transaction=False), snapshot)
+        return _live_fields(*await pipe.execute())
+    except Exception as e:
+        print(f"[TRIP_STATUS] live fields error: {e}")
+        return {"otp": None, "pos": None, "geo_ts": None}
+
+
+def _status_payload(snapshot: dict, live: dict | None) -> TripStatusOut:
+    snapshot["otp"] = None
+    if live:
+        snapshot["otp"] = live["otp"]
+        if live["pos"]:
+            lng, lat = live["pos"]
+            assigned = snapshot["assigned_info"]
+            assigned["driver_lat"] = float(lat)
+            assigned["driver_lng"] = float(lng)
+
+            # Estimate ETA: distance / avg_speed (30 km/h)
+            dist_km = haversine_distance(
+                float(lat),
+                float(lng),
+                snapshot["pickup_lat"],
+                snapshot["pickup_lng"],
+            )
+            assigned["eta_minutes"] = int((dist_km / 30.0) * 60)
+
+    return TripStatusOut(**snapshot)
+
+
+async def _cached_trip_request_status(
     trip_request_id: int,
-    db: Session = Depends(get_db),
-    rider: User = Depends(require_rider),
+    user_id: int,
+    if_none_match: str | None = None,
+) -> tuple[str, TripStatusOut | None] | None:
+    """
+    Redis half of _trip_request_status on the async client: no threadpool
+    slot, no session. None when the snapshot is missing (Postgres needed).
+    """
+    version, owner = await get_status_version_async(trip_request_status_key(trip_request_id))
+
+    snapshot = await get_trip_snapshot_async(trip_request_id)
+    if snapshot and snapshot["user_id"] != user_id:
+        snapshot = None
+
+    live = await _read_live_fields_async(snapshot) if snapshot and snapshot.get("assigned_info") else None
+    etag = make_etag(version, live and live["geo_ts"], live and _otp_etag_part(live["otp"]))
+
+    if (snapshot or owner == user_id) and etag_matches(if_none_match, etag):
+        return etag, None
+    if not snapshot:
+        return None
+    return etag, _status_payload(snapshot, live)
+
+
+def _trip_request_status(
+    db: Session,
+    trip_request_id: int,
+    user_id: int,
+    if_none_match: str | None = None,
+) -> tuple[str, TripStatusOut | None]:
+    """
+    Returns (etag, payload). payload is None when If-None-Match still
+    matches; that case is answered from Redis only.
+    """
+    status_key = trip_request_status_key(trip_request_id)
+    version, owner = get_status_version(status_key)
+
+    snapshot = get_trip_snapshot(trip_request_id)
+    if snapshot and snapshot["user_id"] != user_id:
+        snapshot = None
+
+    live = _read_live_fields(snapshot) if snapshot and snapshot.get("assigned_info") else None
+    etag = make_etag(version, live and live["geo_ts"], live and _otp_etag_part(live["otp"]))
+
+    if (snapshot or owner == user_id) and etag_matches(if_none_match, etag):
+        return etag, None
+
+    if not snapshot:
+        snapshot = _load_status_snapshot(db, trip_request_id, user_id)
+        if owner != user_id:
+            set_status_owner(status_key, user_id)
+        if snapshot.get("assigned_info"):
+            live = _read_live_fields(snapshot)
+            etag = make_etag(version, live["geo_ts"], _otp_etag_part(live["otp"]))
+        if etag_matches(if_none_match, etag):
+            return etag, None
+
+    return etag, _status_payload(snapshot, live)
+
+
+def _trip_request_status_in_session(
+    trip_request_id: int,
+    user_id: int,
+    if_none_match: str | None,
+) -> tuple[str, TripStatusOut | None]:
+    # Session only checks out a connection if the Postgres fallback runs
+    db = ReadSessionLocal(bind=read_only_bind(engine))
+    try:
+        return _trip_request_status(db, trip_request_id, user_id, if_none_match)
+    finally:
+        db.close()
+
+
+@router.get(
+    "/request/{trip_request_id}/status",
+    response_model=TripStatusOut,
+    dependencies=[Depends(rate_limit("trip_status", "user", "ip"))],
+)
+async def get_trip_request_status(
+    trip_request_id: int,
+    response: Response,
+    if_none_match: str | None = Header(default=None),
+    rider: Principal = Depends(rider_principal),
 ):
     """
     Get trip request status (before driver accepts).
     Once driver accepts and Trip is created, client should switch to /trips/{trip_id}/status
+
+    Served from the Redis trip snapshot while a driver is assigned.
+    Supports If-None-Match: 304 while the status version (and driver GEO
+    position, OTP presence) are unchanged.
     """
-    from app.core.redis import redis_client
-    from app.models.core.drivers.drivers import Driver
-    from app.models.core.users.user_profiles import UserProfile
-    
-    trip_req = db.query(TripRequest).filter(
-        TripRequest.trip_request_id == trip_request_id,
-        TripRequest.user_id == rider.user_id,
-    ).first()
+    # Redis on the event loop; the Postgres fallback (blocking ORM) in the threadpool
+    etag, payload = await _cached_trip_request_status(
+        trip_request_id, rider.user_id, if_none_match
+    ) or await run_in_threadpool(
+        _trip_request_status_in_session, trip_request_id, rider.user_id, if_none_match
+    )
+    if payload is None:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
 
-    if not trip_req:
-        raise HTTPException(status_code=404, detail="Trip request not found")
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    return payload
 
-    # Build response dict from trip_req
-    out_dict = {
-        "trip_request_id": trip_req.trip_request_id,
-        "user_id": trip_req.user_id,
-        "city_id": trip_req.city_id,
-        "status": trip_req.status,
-        "pickup_lat": trip_req.pickup_lat,
-        "pickup_lng": trip_req.pickup_lng,
-        "drop_lat": trip_req.drop_lat,
-        "drop_lng": trip_req.drop_lng,
-        "estimated_distance_km": trip_req.estimated_distance_km,
-        "estimated_duration_minutes": trip_req.estimated_duration_minutes,
-        "created_at_utc": trip_req.created_at_utc,
-        "assigned_info": None,
-        "otp": None,
-    }
 
-    
-   
-    cancelled_trip = db.query(Trip).filter(
-        Trip.trip_request_id == trip_request_id,
-        Trip.trip_status == "cancelled",
-    ).order_by(Trip.trip_id.desc()).first()
-
-    if cancelled_trip and trip_req.status == "tenant_selected":
-        out_dict["status"] = "driver_cancelled"
-        return TripStatusOut(**out_dict)
-
-
-    # If driver assigned or trip in progress, enrich with trip/driver info
-    if trip_req.status in ("driver_assigned", "in_progress"):
-        print(f"[TRIP_STATUS_START] Querying for trip_request_id={trip_request_id}, status={trip_req.status}")
-        trip = db.query(Trip).filter(Trip.trip_request_id == trip_request_id).first()
-        print(f"[TRIP_STATUS_RESULT] trip_found={trip is not None}, trip_id={trip.trip_id if trip else 'N/A'}, driver_id={trip.driver_id if trip else 'N/A'}")
-        if trip:
-            assigned = {
-                "trip_id": trip.trip_id,
-                "driver_id": trip.driver_id,
-                "driver_phone": None,
-                "driver_name": None,
-                "driver_rating_avg": None,
-                "driver_rating_count": None,
-                "vehicle_number": None,
-                "vehicle_type": None,
-                "driver_lat": None,
-                "driver_lng": None,
-                "eta_minutes": None,
-            }
-
-            # Lookup driver phone via User
-            if trip.driver_id:
-                driver = db.query(Driver).filter(Driver.driver_id == trip.driver_id).first()
-                if driver:
-                    user = db.query(User).filter(User.user_id == driver.user_id).first()
-                    if user:
-                        assigned["driver_phone"] = user.phone_e164
-                    
-                    # Get driver name from UserProfile
-                    profile = db.query(UserProfile).filter(UserProfile.user_id == driver.user_id).first()
-                    if profile:
-                        assigned["driver_name"] = profile.full_name
-                    
-                    # Get driver rating
-                    assigned["driver_rating_avg"] = driver.average_rating
-                    assigned["driver_rating_count"] = driver.total_ratings
-
-                    # Try to get driver GEO from Redis
-                    try:
-                        geo_key = f"drivers:geo:{trip.tenant_id}:{trip.city_id}"
-                        pos = redis_client.geopos(geo_key, str(driver.driver_id))
-                        if pos and pos[0]:
-                            lng, lat = pos[0]
-                            assigned["driver_lat"] = float(lat)
-                            assigned["driver_lng"] = float(lng)
-
-                            # Estimate ETA: distance / avg_speed (30 km/h)
-                            dist_km = haversine_distance(
-                                float(lat),
-                                float(lng),
-                                float(trip.pickup_latitude),
-                                float(trip.pickup_longitude),
-                            )
-                            eta = int((dist_km / 30.0) * 60)
-                            assigned["eta_minutes"] = eta
-                    except Exception:
-                        # best-effort -- do not fail status endpoint
-                        pass
-            
-            # Lookup vehicle info
-            if trip.vehicle_id:
-                from app.models.core.vehicles.vehicles import Vehicle
-                vehicle = db.query(Vehicle).filter(Vehicle.vehicle_id == trip.vehicle_id).first()
-                if vehicle:
-                    assigned["vehicle_number"] = vehicle.license_plate
-                    assigned["vehicle_type"] = vehicle.category_code
-
-            # attach assigned_info to the response dict
-            out_dict["assigned_info"] = assigned
-            
-            # Try to fetch OTP from Redis using trip_id
+@router.get(
+    "/request/{trip_request_id}/status/wait",
+    response_model=TripStatusOut,
+    dependencies=[Depends(rate_limit("trip_status", "user", "ip"))],
+)
+async def wait_trip_request_status(
+    trip_request_id: int,
+    response: Response,
+    if_none_match: str | None = Header(default=None),
+    timeout: int = Query(LONG_POLL_DEFAULT_SECONDS, ge=1, le=LONG_POLL_MAX_SECONDS),
+    user: dict = Depends(verify_access_token),
+):
+    """
+    Long-poll variant for clients that cannot use the rider WebSocket.
+
+    Returns as soon as the ETag differs from If-None-Match (status change or
+    driver movement), or 304 after `timeout` seconds. No DB connection is
+    held while waiting.
+    """
+    if user.get("role") != "rider":
+        raise HTTPException(403, "Rider access required")
+    user_id = int(user.get("sub"))
+
+    # Subscribe first so a transition between the check and the wait is not lost
+    channel = rider_channel(trip_request_id)
+    queue = pubsub_hub.subscribe(channel)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+
+    try:
+        while True:
+            etag, payload = await _cached_trip_request_status(
+                trip_request_id, user_id, if_none_match
+            ) or await run_in_threadpool(
+                _trip_request_status_in_session, trip_request_id, user_id, if_none_match
+            )
+            if payload is not None:
+                response.headers["ETag"] = etag
+                response.headers["Cache-Control"] = "no-cache"
+                return payload
+
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
             try:
-                key = _otp_plain_key(trip.trip_id)
-                otp = redis_client.get(key)
-                # Handle both bytes and string returns from Redis
-                if otp:
-                    otp_val = otp.decode() if isinstance(otp, bytes) else otp
-                    if otp_val:
-                        out_dict['otp'] = otp_val
-            except Exception as e:
-                print(f"OTP fetch error: {e}")
+                await asyncio.wait_for(queue.get(), timeout=remaining)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        pubsub_hub.unsubscribe(channel, queue)
+
+
+async def _trip_status_state(trip_id: int) -> tuple[int, int | None, str | None]:
+    """(version, owner user_id, plaintext OTP) in one round trip (same slot)."""
+    from app.core.redis import async_redis_client
 
-    print(f"[TRIP_STATUS_RESPONSE] trip_request_id={trip_request_id}, assigned_info={out_dict.get('assigned_info')}, trip_id={out_dict.get('assigned_info', {}).get('trip_id') if isinstance(out_dict.get('assigned_info'), dict) else 'N/A'}")
-    return TripStatusOut(**out_dict)
+    pipe = async_redis_client.pipeline(transaction=False)
+    pipe.hgetall(trip_status_key(trip_id))
+    pipe.get(_otp_plain_key(trip_id))
+    raw, otp = await pipe.execute()
+
+    raw = raw or {}
+    owner = raw.get("owner")
+    if isinstance(otp, bytes):
+        otp = otp.decode()
+    return int(raw.get("version", 0)), int(owner) if owner else None, otp or None
 
 
 # ============================================
 # STATUS CHECK - FOR TRIP (after driver accepts, use trip_id instead)
 # ============================================
-@router.get("/{trip_id}/status")
-def get_trip_status_by_trip_id(
+@router.get("/{trip_id}/status", dependencies=[Depends(rate_limit("trip_status", "user", "ip"))])
+async def get_trip_status_by_trip_id(
     trip_id: int,
-    db: Session = Depends(get_db),
-    rider: User = Depends(require_rider),
+    response: Response,
+    if_none_match: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_async_read_db),
+    rider: Principal = Depends(rider_principal),
 ):
     """
     Get trip status by trip_id (after driver accepts).
     
     🔒 STRICT OWNERSHIP: Only return if trip belongs to authenticated rider
     Include OTP if trip is in "assigned" status
+    Supports If-None-Match: 304 from Redis while the trip version (and OTP
+    presence) are unchanged
     """
     from app.models.core.trips.trips import Trip
-    from app.core.redis import redis_client
-    from app.core.trips.trip_otp_service import _otp_plain_key
 
-    trip = (
-            db.query(Trip)
-            .join(TripRequest, Trip.trip_request_id == TripRequest.trip_request_id)
-            .filter(
-                Trip.trip_id == trip_id,
-                TripRequest.user_id == rider.user_id,  # STRICT OWNERSHIP
-            )
-            .first()
+    status_key = trip_status_key(trip_id)
+    version, owner, otp = await _trip_status_state(trip_id)
+    etag = make_etag(version, _otp_etag_part(otp))
+
+    if owner == rider.user_id and etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    trip = await db.scalar(
+        select(Trip)
+        .join(TripRequest, Trip.trip_request_id == TripRequest.trip_request_id)
+        .where(
+            Trip.trip_id == trip_id,
+            TripRequest.user_id == rider.user_id,  # STRICT OWNERSHIP
         )
+        .limit(1)
+    )
 
     if not trip:
         raise HTTPException(status_code=404, detail="Trip not found")
 
-    response = {
+    if owner != rider.user_id:
+        await set_status_owner_async(status_key, rider.user_id)
+
+    payload = {
         "trip_id": trip.trip_id,
         "status": trip.trip_status,
         "otp": None,
@@ -773,14 +982,11 @@ def get_trip_status_by_trip_id(
 
     # OTP only valid before trip starts
     if trip.trip_status in ("assigned",):
-        try:
-            otp = redis_client.get(_otp_plain_key(trip_id))
-            if otp:
-                response["otp"] = otp.decode() if isinstance(otp, bytes) else otp
-        except Exception:
-            pass
+        payload["otp"] = otp
 
-    return response
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    return payload
 
 # ================================================================
 # DEV: Rider OTP retrieval & resend (only available when DEV_MODE=true)
@@ -854,6 +1060,9 @@ def resend_trip_otp(
     otp = generate_trip_otp()
     store_trip_otp(trip.trip_id, otp)
 
+    # OTP is part of both status payloads
+    bump_status_version(trip.trip_request_id, trip.trip_id)
+
     # In real system: send SMS to rider.phone_e164
     return {"trip_id": trip.trip_id, "message": "OTP regenerated and (dev) stored"}
 
@@ -894,6 +1103,8 @@ def cancel_trip_request(
     trip_req.cancelled_at_utc = datetime.now(timezone.utc)
     db.add(trip_req)
     db.commit()
+    delete_trip_snapshot(trip_request_id)
+    publish_trip_status(trip_request_id, "cancelled")
     
     print(f"[TRIP REQUEST CANCEL] trip_request_id={trip_request_id} cancelled by rider {rider.user_id}")
     
@@ -955,6 +1166,8 @@ def change_provider(
     db.add(trip_req)
     db.commit()
 
+    publish_trip_status(trip_req.trip_request_id, "searching")
+
     return {
         "trip_request_id": trip_req.trip_request_id,
         "status": "searching",
@@ -12,12 +12,15 @@ from pydantic import BaseModel
 
 from app.core.dependencies import get_db
 from app.core.security.roles import require_driver
+from app.core.security.rate_limit import rate_limit
 from app.core.trips.trip_otp_service import verify_trip_otp
 from app.models.core.trips.trips import Trip
 from app.models.core.trips.trip_status_history import TripStatusHistory
 from app.models.core.drivers.driver_current_status import DriverCurrentStatus
 from app.models.core.drivers.drivers import Driver
 from app.schemas.core.trips.trip_start import TripStartRequest,TripStartResponse
+from app.core.trips.trip_events import publish_trip_status, clear_active_trip
+from app.core.trips.trip_snapshot import update_trip_snapshot
 
 router = APIRouter(
     prefix="/driver/trips",
@@ -30,7 +33,12 @@ router = APIRouter(
 # STEP 11: TRIP START - OTP VERIFICATION
 # ================================================================
 
-@router.post("/{trip_id}/start", response_model=TripStartResponse, status_code=status.HTTP_200_OK)
+@router.post(
+    "/{trip_id}/start",
+    response_model=TripStartResponse,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(rate_limit("trip_otp_verify", "user"))],
+)
 def start_trip(
     trip_id: int,
     payload: TripStartRequest,
@@ -128,6 +136,10 @@ def start_trip(
     ))
     
     db.commit()
+
+    clear_active_trip(trip.tenant_id, trip.city_id, driver.driver_id)
+    update_trip_snapshot(trip.trip_request_id, status="in_progress", trip_status="picked_up")
+    publish_trip_status(trip.trip_request_id, "in_progress", trip_id=trip.trip_id)
     
     return TripStartResponse(
         status="trip_started",
@@ -0,0 +1,450 @@
+"""
+Rollups - hourly / daily aggregates for trips, dispatch funnel and revenue
+
+Raw tables (trips, trip_dispatch_candidates, financial_ledger) are never
+scanned for analytics. Instead each source keeps hour rows in its rollup
+table, and day rows derived from the hour rows:
+
+    trip_rollups       tenant / city / vehicle category   (by requested_at)
+    dispatch_rollups   tenant / city / batch number       (by offer created_at)
+    revenue_rollups    tenant / entity / transaction type (by ledger created_at)
+
+Incremental runs (run_rollups, every ROLLUP_INTERVAL_SECONDS) look at rows
+changed since the source watermark, find the hours they belong to and
+rebuild exactly those hours (delete + INSERT ... SELECT), then the days
+containing them. Rebuilding whole buckets keeps late updates (a trip
+completed hours after it was requested) correct and makes every run
+idempotent. The watermark trails now() by ROLLUP_SAFETY_LAG_SECONDS so
+transactions still in flight are picked up by the next run.
+
+The tables come from migrations/004_analytics_rollups.sql (checked on
+startup, core/db_migrations.py). History is loaded with backfill():
+
+    python -m app.core.analytics.rollups --start 2024-01-01 --end 2024-07-01
+"""
+
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import BigInteger, and_, delete, func, insert, literal, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.redis import redis_client
+
+from app.models.core.analytics.rollups import TripRollup, DispatchRollup, RevenueRollup, RollupWatermark
+from app.models.core.trips.trips import Trip
+from app.models.core.trips.trip_batch import TripBatch
+from app.models.core.trips.trip_request import TripRequest
+from app.models.core.trips.trip_dispatch_candidates import TripDispatchCandidate
+from app.models.core.accounting.ledger import FinancialLedger
+
+HOUR = timedelta(hours=1)
+DAY = timedelta(days=1)
+GRAINS = ("hour", "day")
+MAX_RANGE = {"hour": timedelta(days=31), "day": timedelta(days=366)}
+
+# Offers are answered within seconds; responses are looked for in offers
+# created this long before the watermark (keeps partition pruning)
+DISPATCH_RESPONSE_WINDOW = timedelta(days=1)
+
+ROLLUP_LOCK_KEY = "rollups:lock"
+
+
+def _hour(column):
+    return func.date_trunc("hour", column, "UTC")
+
+
+@dataclass(frozen=True)
+class RollupSource:
+    name: str
+    model: type
+    dimensions: tuple[str, ...]
+    measures: tuple[str, ...]
+    # (start, end) -> SELECT grain, bucket, *dimensions, *measures for those hours
+    hourly: Callable
+    # (after, upto) -> SELECT DISTINCT hour buckets of rows changed in (after, upto]
+    changed_hours: Callable
+
+    @property
+    def columns(self) -> list[str]:
+        return ["grain", "bucket_start_utc", *self.dimensions, *self.measures]
+
+
+# -------------------------------
+# TRIPS
+# -------------------------------
+def _trip_hourly(start: datetime, end: datetime):
+    bucket = _hour(Trip.requested_at_utc)
+    completed = Trip.trip_status == "completed"
+    return (
+        select(
+            literal("hour"),
+            bucket,
+            Trip.tenant_id,
+            func.coalesce(Trip.city_id, 0),
+            func.coalesce(Trip.selected_vehicle_category, ""),
+            func.count(),
+            func.count().filter(completed),
+            func.count().filter(Trip.trip_status == "cancelled"),
+            func.coalesce(func.sum(Trip.fare_total).filter(completed), 0),
+            func.coalesce(func.sum(Trip.distance_km).filter(completed), 0),
+            func.coalesce(func.sum(Trip.duration_minutes).filter(completed), 0),
+        )
+        .where(Trip.requested_at_utc >= start, Trip.requested_at_utc < end)
+        .group_by(bucket, Trip.tenant_id, Trip.city_id, Trip.selected_vehicle_category)
+    )
+
+
+def _trip_changed_hours(after: datetime, upto: datetime):
+    # Same expression as ix_trips_changed_at
+    changed_at = func.coalesce(Trip.updated_at_utc, Trip.created_at_utc)
+    return (
+        select(_hour(Trip.requested_at_utc))
+        .where(changed_at > after, changed_at <= upto)
+        .distinct()
+    )
+
+
+# -------------------------------
+# DISPATCH FUNNEL
+# -------------------------------
+def _dispatch_hourly(start: datetime, end: datetime):
+    candidate = TripDispatchCandidate
+    bucket = _hour(candidate.created_at_utc)
+    answered = and_(
+        candidate.response_code.in_(("accepted", "rejected")),
+        candidate.response_at_utc.isnot(None),
+    )
+    city_id = func.coalesce(TripRequest.city_id, 0)
+    batch_number = func.coalesce(TripBatch.batch_number, 0)
+    return (
+        select(
+            literal("hour"),
+            bucket,
+            func.coalesce(candidate.tenant_id, 0),
+            city_id,
+            batch_number,
+            func.count(),
+            func.count().filter(candidate.response_code == "accepted"),
+            func.count().filter(candidate.response_code == "rejected"),
+            func.count().filter(candidate.response_code == "expired"),
+            func.count().filter(answered),
+            func.coalesce(func.sum(
+                func.extract("epoch", candidate.response_at_utc - candidate.request_sent_at_utc)
+            ).filter(answered), 0),
+        )
+        .select_from(candidate)
+        .outerjoin(TripBatch, TripBatch.trip_batch_id == candidate.trip_batch_id)
+        .outerjoin(TripRequest, TripRequest.trip_request_id == candidate.trip_request_id)
+        .where(candidate.created_at_utc >= start, candidate.created_at_utc < end)
+        .group_by(bucket, candidate.tenant_id, city_id, batch_number)
+    )
+
+
+def _dispatch_changed_hours(after: datetime, upto: datetime):
+    candidate = TripDispatchCandidate
+    return (
+        select(_hour(candidate.created_at_utc))
+        .where(
+            candidate.created_at_utc > after - DISPATCH_RESPONSE_WINDOW,
+            candidate.created_at_utc <= upto,
+            or_(
+                candidate.created_at_utc > after,
+                and_(candidate.response_at_utc > after, candidate.response_at_utc <= upto),
+            ),
+        )
+        .distinct()
+    )
+
+
+# -------------------------------
+# REVENUE (ledger is append-only)
+# -------------------------------
+def _revenue_hourly(start: datetime, end: datetime):
+    ledger = FinancialLedger
+    bucket = _hour(ledger.created_at_utc)
+    return (
+        select(
+            literal("hour"),
+            bucket,
+            ledger.tenant_id,
+            ledger.entity_type,
+            ledger.transaction_type,
+            ledger.entry_type,
+            ledger.currency_code,
+            func.count(),
+            func.coalesce(func.sum(ledger.amount), 0),
+        )
+        .where(ledger.created_at_utc >= start, ledger.created_at_utc < end)
+        .group_by(
+            bucket, ledger.tenant_id, ledger.entity_type,
+            ledger.transaction_type, ledger.entry_type, ledger.currency_code,
+        )
+    )
+
+
+def _revenue_changed_hours(after: datetime, upto: datetime):
+    ledger = FinancialLedger
+    return (
+        select(_hour(ledger.created_at_utc))
+        .where(ledger.created_at_utc > after, ledger.created_at_utc <= upto)
+        .distinct()
+    )
+
+
+ROLLUP_SOURCES = {
+    source.name: source
+    for source in (
+        RollupSource(
+            "trips", TripRollup,
+            ("tenant_id", "city_id", "vehicle_category"),
+            ("trips", "completed", "cancelled", "fare_total", "distance_km", "duration_minutes"),
+            _trip_hourly, _trip_changed_hours,
+        ),
+        RollupSource(
+            "dispatch", DispatchRollup,
+            ("tenant_id", "city_id", "batch_number"),
+            ("offers", "accepted", "rejected", "expired", "responded", "response_seconds"),
+            _dispatch_hourly, _dispatch_changed_hours,
+        ),
+        RollupSource(
+            "revenue", RevenueRollup,
+            ("tenant_id", "entity_type", "transaction_type", "entry_type", "currency_code"),
+            ("entries", "amount"),
+            _revenue_hourly, _revenue_changed_hours,
+        ),
+    )
+}
+
+
+def get_source(name: str) -> RollupSource:
+    source = ROLLUP_SOURCES.get(name)
+    if source is None:
+        raise HTTPException(status_code=404, detail=f"Unknown rollup: {name}")
+    return source
+
+
+# -------------------------------
+# REBUILD
+# -------------------------------
+def _floor(value: datetime, step: timedelta) -> datetime:
+    value = value.astimezone(timezone.utc)
+    if step == DAY:
+        return value.replace(hour=0, minute=0, second=0, microsecond=0)
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def _ranges(buckets, step: timedelta) -> list[tuple[datetime, datetime]]:
+    """Merge bucket starts into contiguous [start, end) ranges."""
+    ranges = []
+    for bucket in sorted(set(buckets)):
+        if ranges and ranges[-1][1] == bucket:
+            ranges[-1] = (ranges[-1][0], bucket + step)
+        else:
+            ranges.append((bucket, bucket + step))
+    return ranges
+
+
+def _rebuild_hours(db: Session, source: RollupSource, start: datetime, end: datetime) -> None:
+    model = source.model
+    db.execute(delete(model).where(
+        model.grain == "hour",
+        model.bucket_start_utc >= start,
+        model.bucket_start_utc < end,
+    ))
+    db.execute(insert(model).from_select(source.columns, source.hourly(start, end)))
+
+
+def _rebuild_days(db: Session, source: RollupSource, start: datetime, end: datetime) -> None:
+    model = source.model
+    bucket = func.date_trunc("day", model.bucket_start_utc, "UTC")
+    dimensions = [getattr(model, name) for name in source.dimensions]
+
+    db.execute(delete(model).where(
+        model.grain == "day",
+        model.bucket_start_utc >= start,
+        model.bucket_start_utc < end,
+    ))
+    db.execute(insert(model).from_select(
+        source.columns,
+        select(
+            literal("day"),
+            bucket,
+            *dimensions,
+            *[func.sum(getattr(model, name)) for name in source.measures],
+        )
+        .where(model.grain == "hour", model.bucket_start_utc >= start, model.bucket_start_utc < end)
+        .group_by(bucket, *dimensions),
+    ))
+
+
+def rebuild_buckets(db: Session, source: RollupSource, hours) -> int:
+    """Rebuild the given hour buckets and the days that contain them."""
+    for start, end in _ranges(hours, HOUR):
+        _rebuild_hours(db, source, start, end)
+    for start, end in _ranges({_floor(hour, DAY) for hour in hours}, DAY):
+        _rebuild_days(db, source, start, end)
+    return len(hours)
+
+
+# -------------------------------
+# INCREMENTAL RUN
+# -------------------------------
+def run_rollups(db: Session, sources: list[str] | None = None) -> dict[str, int]:
+    """Fold rows changed since each watermark into the rollups. Returns hours rebuilt."""
+    upto = datetime.now(timezone.utc) - timedelta(seconds=settings.ROLLUP_SAFETY_LAG_SECONDS)
+    rebuilt = {}
+
+    for name in sources or ROLLUP_SOURCES:
+        source = get_source(name)
+        watermark = db.get(RollupWatermark, name)
+        after = (
+            watermark.watermark_utc if watermark
+            else upto - timedelta(hours=settings.ROLLUP_INITIAL_LOOKBACK_HOURS)
+        )
+        if after >= upto:
+            rebuilt[name] = 0
+            continue
+
+        hours = [h for h in db.execute(source.changed_hours(after, upto)).scalars() if h is not None]
+        rebuilt[name] = rebuild_buckets(db, source, hours)
+
+        if watermark:
+            watermark.watermark_utc = upto
+        else:
+            db.add(RollupWatermark(source=name, watermark_utc=upto))
+        db.commit()
+
+    return rebuilt
+
+
+def backfill(db: Session, start: datetime, end: datetime, sources: list[str] | None = None) -> dict[str, int]:
+    """Rebuild all buckets in [start, end), one day per transaction."""
+    start, end = _floor(start, DAY), _floor(end, DAY)
+    rebuilt = {}
+
+    for name in sources or ROLLUP_SOURCES:
+        source = get_source(name)
+        day = start
+        while day < end:
+            _rebuild_hours(db, source, day, day + DAY)
+            _rebuild_days(db, source, day, day + DAY)
+            db.commit()
+            day += DAY
+        rebuilt[name] = int((end - start) / HOUR)
+
+    return rebuilt
+
+
+def _run_once() -> dict[str, int] | None:
+    interval = settings.ROLLUP_INTERVAL_SECONDS
+    if not redis_client.set(ROLLUP_LOCK_KEY, 1, nx=True, ex=max(interval - 1, 1)):
+        return None
+
+    db = SessionLocal()
+    try:
+        return run_rollups(db)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def rollup_loop():
+    while True:
+        try:
+            result = await run_in_threadpool(_run_once)
+            if result and any(result.values()):
+                print(f"[ROLLUPS] rebuilt hours {result}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            print(f"[ROLLUPS] run failed: {exc}")
+        await asyncio.sleep(settings.ROLLUP_INTERVAL_SECONDS)
+
+
+# -------------------------------
+# RANGE QUERIES
+# -------------------------------
+def query_rollup(
+    db: Session,
+    name: str,
+    grain: str,
+    start: datetime,
+    end: datetime,
+    filters: dict | None = None,
+    group_by: list[str] | None = None,
+) -> list[dict]:
+    """
+    Measures summed per bucket (and the requested dimensions) over
+    [start, end). Filters are equality filters on dimensions.
+    """
+    source = get_source(name)
+    if grain not in GRAINS:
+        raise HTTPException(status_code=400, detail=f"grain must be one of {', '.join(GRAINS)}")
+    if end <= start or end - start > MAX_RANGE[grain]:
+        raise HTTPException(status_code=400, detail=f"Range must be positive and at most {MAX_RANGE[grain].days} days")
+
+    group_by = group_by or []
+    unknown = [d for d in [*group_by, *(filters or {})] if d not in source.dimensions]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown dimension(s): {', '.join(unknown)}")
+
+    model = source.model
+    dimensions = [getattr(model, d) for d in group_by]
+    query = (
+        select(
+            model.bucket_start_utc,
+            *dimensions,
+            *[func.sum(getattr(model, m)).label(m) for m in source.measures],
+        )
+        .where(model.grain == grain, model.bucket_start_utc >= start, model.bucket_start_utc < end)
+        .group_by(model.bucket_start_utc, *dimensions)
+        .order_by(model.bucket_start_utc, *dimensions)
+    )
+    for dimension, value in (filters or {}).items():
+        if value is not None:
+            query = query.where(getattr(model, dimension) == value)
+
+    # SUM() comes back as Decimal: counters as int, amounts as float
+    casts = {
+        m: int if isinstance(getattr(model, m).type, BigInteger) else float
+        for m in source.measures
+    }
+    return [
+        {
+            key: casts[key](value) if key in casts and value is not None else value
+            for key, value in row._mapping.items()
+        }
+        for row in db.execute(query)
+    ]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Backfill analytics rollups")
+    parser.add_argument("--start", required=True, type=datetime.fromisoformat)
+    parser.add_argument("--end", required=True, type=datetime.fromisoformat)
+    parser.add_argument("--source", action="append", choices=list(ROLLUP_SOURCES))
+    args = parser.parse_args()
+
+    from app.core.db_migrations import check_migrated_tables
+
+    session = SessionLocal()
+    try:
+        check_migrated_tables(session)
+
+        def _utc(value: datetime) -> datetime:
+            return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+        print(backfill(session, _utc(args.start), _utc(args.end), args.source))
+    finally:
+        session.close()
@@ -8,16 +8,92 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str
+    # asyncpg URL for the async session; derived from DATABASE_URL if empty
+    ASYNC_DATABASE_URL: str = ""
+    # Pool sizing (per engine, per worker process)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: int = 10
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    # Separate pool of each engine's AUTOCOMMIT twin (get_read_db / get_primary_read_db)
+    DB_READ_ONLY_POOL_SIZE: int = 10
+    DB_READ_ONLY_MAX_OVERFLOW: int = 20
+    # Comma-separated read replica URLs; empty → reads go to the primary
+    DATABASE_REPLICA_URLS: str = ""
+    # Replicas lagging more than this are skipped (primary fallback)
+    REPLICA_MAX_LAG_SECONDS: float = 5.0
+    REPLICA_LAG_CHECK_SECONDS: int = 5
+
+    # Per-request SQL / Redis instrumentation
+    REQUEST_STATS_ENABLED: bool = True
+    # Same SQL shape this many times in one request is reported as N+1
+    N_PLUS_ONE_THRESHOLD: int = 5
+
+    # Monthly partitions of history tables (core/db_partitions.py)
+    PARTITION_MONTHS_AHEAD: int = 3
+    PARTITION_MAINTENANCE_ON_STARTUP: bool = True
+    # Create / archive / move DEFAULT rows (one process per interval)
+    PARTITION_MAINTENANCE_SECONDS: int = 6 * 60 * 60
+
+    # Payees per INSERT ... SELECT / UPDATE ... FROM round in payout calculation
+    PAYOUT_CALCULATION_CHUNK_SIZE: int = 5000
 
     # Redis
     REDIS_HOST: str = "localhost"
     REDIS_PORT: int = 6379
     REDIS_DB: int = 0
+    # single | cluster | sharded
+    REDIS_MODE: str = "single"
+    # Comma-separated redis:// URLs (cluster startup nodes or shards)
+    REDIS_NODES: str = ""
 
     # JWT
-    JWT_SECRET_KEY: str
+    # HS256 signs with JWT_SECRET_KEY; ES256 / RS256 use the PEM key pair.
+    # Verify-only nodes set just JWT_PUBLIC_KEY_PATH.
+    JWT_SECRET_KEY: str = ""
     JWT_ALGORITHM: str = "HS256"
     JWT_EXPIRE_MINUTES: int = 60
+    JWT_PRIVATE_KEY_PATH: str = ""
+    JWT_PUBLIC_KEY_PATH: str = ""
+    # Verified-token LRU size (0 disables)
+    JWT_VERIFY_CACHE_SIZE: int = 10000
+
+    # Driver location ingestion (defaults, overridable per tenant)
+    LOCATION_MIN_MOVE_METERS: float = 25.0
+    LOCATION_HEADING_TOLERANCE_DEG: float = 20.0
+    LOCATION_MAX_GEO_INTERVAL_SECONDS: int = 30
+
+    # Principal cache for hot-path guards (Redis shared, in-process front)
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_LOCAL_TTL_SECONDS: int = 5
+
+    # Rate limiting (token buckets in Redis)
+    RATE_LIMIT_ENABLED: bool = True
+    # {"<route>": {"<scope>": [capacity, window_seconds]}} overrides defaults
+    RATE_LIMIT_OVERRIDES: dict[str, dict[str, list[int]]] = {}
+    # Reverse proxies / load balancers (IPs or CIDRs) whose X-Forwarded-For
+    # is believed for the "ip" scope; empty = the peer address is the client
+    RATE_LIMIT_TRUSTED_PROXIES: list[str] = []
+
+    # In-memory lookup registry (core/lookup_registry.py)
+    # How often a process checks the Redis version key for reloads
+    LOOKUP_VERSION_CHECK_SECONDS: int = 10
+
+    # Dashboard counters in Redis (core/dashboard_counters.py)
+    DASHBOARD_COUNTERS_TTL_SECONDS: int = 24 * 60 * 60
+    DASHBOARD_RECONCILE_SECONDS: int = 15 * 60
+
+    # Analytics rollups (core/analytics/rollups.py)
+    ROLLUP_INTERVAL_SECONDS: int = 5 * 60
+    # Watermark trails now() so in-flight transactions land in the next run
+    ROLLUP_SAFETY_LAG_SECONDS: int = 120
+    # First incremental run without a watermark; older data via backfill
+    ROLLUP_INITIAL_LOOKBACK_HOURS: int = 24
+
+    # Ledger balance checkpoints (core/ledger/balance_checkpoints.py)
+    LEDGER_CHECKPOINT_SECONDS: int = 10 * 60
+    # Checkpoints trail now() so in-flight ledger transactions are not skipped
+    LEDGER_CHECKPOINT_SAFETY_LAG_SECONDS: int = 5 * 60
 
     @property
     def REDIS_URL(self) -> str:
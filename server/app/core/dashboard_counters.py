@@ -0,0 +1,404 @@
+"""
+Dashboard Counters - event-maintained tenant / fleet / platform counters
+
+Dashboards used to run 4-6 COUNT queries per refresh. The counters now live
+in one Redis hash per scope (tenant, fleet, platform) and are read in O(1).
+
+Maintenance:
+- an ORM after_flush hook compares old / new state of the counted rows
+  (approvals, KYC, vehicle status, invites, driver runtime status, trip
+  completion...) and collects +1 / -1 deltas; they are applied after the
+  outermost commit, so every code path that goes through the ORM is covered;
+  they are kept per (nested) transaction so a rolled back SAVEPOINT only
+  drops its own
+- fleet membership changes drop the fleet hash (recomputed on next read)
+- deltas only touch hashes that exist; a missing hash is computed from
+  Postgres on read
+- reconcile_counters() recomputes everything with one GROUP BY per counter
+  and overwrites the hashes; it runs periodically (DASHBOARD_RECONCILE_SECONDS)
+  and fixes drift from bulk / raw SQL updates
+"""
+
+import asyncio
+from collections import Counter
+from dataclasses import dataclass
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import get_history
+
+from app.core.config import settings
+from app.core.database import engine, ReadSessionLocal, read_only_bind
+from app.core.redis import redis_client, dashboard_counters_key
+
+from app.models.core.tenants.tenants import Tenant
+from app.models.core.tenants.tenant_documents import TenantDocument
+from app.models.core.vehicles.vehicles import Vehicle
+from app.models.core.fleet_owners.fleet_owners import FleetOwner
+from app.models.core.fleet_owners.fleet_owner_drivers import FleetOwnerDriver
+from app.models.core.fleet_owners.driver_invites import DriverInvite
+from app.models.core.drivers.drivers import Driver
+from app.models.core.drivers.driver_current_status import DriverCurrentStatus
+from app.models.core.trips.trips import Trip
+
+PLATFORM_SCOPE_ID = 0
+RECONCILE_LOCK_KEY = "dashboard:reconcile_lock"
+
+
+@dataclass(frozen=True)
+class CounterRule:
+    scope: str                      # tenant | fleet | platform
+    field: str
+    model: type
+    # Column holding the scope id (None for platform; driver_id when via_fleet)
+    scope_attr: str | None
+    status_attr: str | None = None  # None = every row counts
+    values: tuple = ()
+    negate: bool = False            # count rows whose status is NOT in values
+    # Scope resolved through fleet_owner_drivers (driver_id, tenant_id)
+    via_fleet: bool = False
+    # Changes drop the scope's hash instead of applying deltas
+    invalidate: bool = False
+
+    def matches(self, state: dict) -> bool:
+        if self.status_attr is None:
+            return True
+        value = state[self.status_attr]
+        # NULL is neither IN nor NOT IN for SQL: never counted
+        if value is None:
+            return False
+        return (value in self.values) != self.negate
+
+    def condition(self):
+        if self.status_attr is None:
+            return None
+        column = getattr(self.model, self.status_attr).in_(self.values)
+        return ~column if self.negate else column
+
+    @property
+    def attrs(self) -> tuple:
+        names = [self.scope_attr, self.status_attr]
+        if self.via_fleet:
+            names.append("tenant_id")
+        return tuple(n for n in names if n)
+
+
+ACTIVE_RUNTIME_STATUSES = ("available", "on_trip", "trip_accepted")
+
+COUNTER_RULES = [
+    # Tenant admin dashboard
+    CounterRule("tenant", "pending_documents", TenantDocument, "tenant_id", "verification_status", ("pending",)),
+    CounterRule("tenant", "pending_vehicles", Vehicle, "tenant_id", "status", ("active",), negate=True),
+    CounterRule("tenant", "pending_fleet_owners", FleetOwner, "tenant_id", "approval_status", ("pending",)),
+    CounterRule("tenant", "pending_drivers", Driver, "tenant_id", "kyc_status", ("pending",)),
+
+    # Fleet owner dashboard
+    CounterRule("fleet", "total_vehicles", Vehicle, "fleet_owner_id"),
+    CounterRule("fleet", "total_drivers", FleetOwnerDriver, "fleet_owner_id", invalidate=True),
+    CounterRule("fleet", "pending_invites", DriverInvite, "fleet_owner_id", "invite_status", ("sent",)),
+    CounterRule(
+        "fleet", "active_drivers", DriverCurrentStatus, "driver_id",
+        "runtime_status", ACTIVE_RUNTIME_STATUSES, via_fleet=True,
+    ),
+    CounterRule("fleet", "trips_completed", Trip, "driver_id", "trip_status", ("completed",), via_fleet=True),
+
+    # Platform admin tenant summary
+    CounterRule("platform", "total_tenants", Tenant, None),
+    CounterRule("platform", "approved", Tenant, None, "approval_status", ("approved",)),
+    CounterRule("platform", "pending", Tenant, None, "approval_status", ("pending",)),
+    CounterRule("platform", "rejected", Tenant, None, "approval_status", ("rejected",)),
+    CounterRule("platform", "active", Tenant, None, "status", ("active",)),
+    CounterRule("platform", "inactive", Tenant, None, "status", ("inactive",)),
+]
+
+_RULES_BY_MODEL: dict[type, list[CounterRule]] = {}
+for _rule in COUNTER_RULES:
+    _RULES_BY_MODEL.setdefault(_rule.model, []).append(_rule)
+
+
+# -------------------------------
+# COMPUTE FROM POSTGRES
+# -------------------------------
+def _rule_query(rule: CounterRule):
+    if rule.scope == "platform":
+        query = select(func.count()).select_from(rule.model)
+    elif rule.via_fleet:
+        query = (
+            select(FleetOwnerDriver.fleet_owner_id, func.count())
+            .join(rule.model, (rule.model.driver_id == FleetOwnerDriver.driver_id)
+                  & (rule.model.tenant_id == FleetOwnerDriver.tenant_id))
+            .group_by(FleetOwnerDriver.fleet_owner_id)
+        )
+    else:
+        column = getattr(rule.model, rule.scope_attr)
+        query = select(column, func.count()).where(column.isnot(None)).group_by(column)
+
+    condition = rule.condition()
+    return query if condition is None else query.where(condition)
+
+
+def _scope_filter(rule: CounterRule, query, scope_id: int):
+    if rule.scope == "platform":
+        return query
+    if rule.via_fleet:
+        return query.where(FleetOwnerDriver.fleet_owner_id == scope_id)
+    return query.where(getattr(rule.model, rule.scope_attr) == scope_id)
+
+
+def compute_counters(db: Session, scope: str, scope_id: int) -> dict[str, int]:
+    counters = {}
+    for rule in COUNTER_RULES:
+        if rule.scope != scope:
+            continue
+        rows = db.execute(_scope_filter(rule, _rule_query(rule), scope_id)).all()
+        counters[rule.field] = int(rows[0][-1]) if rows else 0
+    return counters
+
+
+def _store(pipe, scope: str, scope_id: int, counters: dict[str, int]) -> None:
+    key = dashboard_counters_key(scope, scope_id)
+    pipe.delete(key)
+    pipe.hset(key, mapping=counters)
+    pipe.expire(key, settings.DASHBOARD_COUNTERS_TTL_SECONDS)
+
+
+# -------------------------------
+# READ (dashboards)
+# -------------------------------
+def dashboard_counters(db: Session, scope: str, scope_id: int = PLATFORM_SCOPE_ID) -> dict[str, int]:
+    """Counters of one scope from Redis; computed and stored on a miss."""
+    key = dashboard_counters_key(scope, scope_id)
+    try:
+        cached = redis_client.hgetall(key)
+    except Exception as exc:
+        print(f"[DASHBOARD COUNTERS] read failed {key}: {exc}")
+        return compute_counters(db, scope, scope_id)
+
+    if cached:
+        return {field: int(value) for field, value in cached.items()}
+
+    counters = compute_counters(db, scope, scope_id)
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        _store(pipe, scope, scope_id, counters)
+        pipe.execute()
+    except Exception as exc:
+        print(f"[DASHBOARD COUNTERS] store failed {key}: {exc}")
+    return counters
+
+
+# -------------------------------
+# WRITE PATH (ORM events)
+# -------------------------------
+# Only existing hashes are incremented: a missing one is recomputed on read
+_APPLY_DELTAS = redis_client.register_script("""
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+for i = 1, #ARGV, 2 do
+    redis.call('HINCRBY', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+return 1
+""")
+
+
+def _old_state(obj, attrs: tuple) -> dict:
+    state = {}
+    for name in attrs:
+        history = get_history(obj, name)
+        if history.deleted:
+            state[name] = history.deleted[0]
+        elif history.unchanged:
+            state[name] = history.unchanged[0]
+        else:
+            state[name] = getattr(obj, name)
+    return state
+
+
+def _new_state(obj, attrs: tuple) -> dict:
+    return {name: getattr(obj, name) for name in attrs}
+
+
+def _scope_ids(session: Session, rule: CounterRule, state: dict) -> list[int]:
+    if rule.scope == "platform":
+        return [PLATFORM_SCOPE_ID]
+    value = state[rule.scope_attr]
+    if value is None:
+        return []
+    if not rule.via_fleet:
+        return [value]
+    # Still inside the flush transaction: plain connection, no autoflush
+    return list(session.connection().execute(
+        select(FleetOwnerDriver.fleet_owner_id).where(
+            FleetOwnerDriver.driver_id == value,
+            FleetOwnerDriver.tenant_id == state["tenant_id"],
+        )
+    ).scalars())
+
+
+def _pending(session: Session) -> dict:
+    # Keyed by the innermost transaction: a SAVEPOINT rollback drops its own
+    # deltas, the outer transaction's stay until commit
+    transaction = session.get_nested_transaction() or session.get_transaction()
+    by_transaction = session.info.setdefault("dashboard_counters", {})
+    return by_transaction.setdefault(transaction, {"deltas": Counter(), "invalidate": set()})
+
+
+def _collect(session: Session, obj, old: dict | None, new: dict | None, rule: CounterRule):
+    pending = _pending(session)
+
+    if rule.invalidate:
+        for state in (old, new):
+            if state is not None:
+                for scope_id in _scope_ids(session, rule, state):
+                    pending["invalidate"].add(dashboard_counters_key(rule.scope, scope_id))
+        return
+
+    before = old is not None and rule.matches(old)
+    after = new is not None and rule.matches(new)
+    if before and after and (rule.scope_attr is None or old[rule.scope_attr] == new[rule.scope_attr]):
+        return
+    if before:
+        for scope_id in _scope_ids(session, rule, old):
+            pending["deltas"][(dashboard_counters_key(rule.scope, scope_id), rule.field)] -= 1
+    if after:
+        for scope_id in _scope_ids(session, rule, new):
+            pending["deltas"][(dashboard_counters_key(rule.scope, scope_id), rule.field)] += 1
+
+
+def _after_flush(session: Session, flush_context):
+    for obj in session.new:
+        for rule in _RULES_BY_MODEL.get(type(obj), ()):
+            _collect(session, obj, None, _new_state(obj, rule.attrs), rule)
+
+    for obj in session.dirty:
+        for rule in _RULES_BY_MODEL.get(type(obj), ()):
+            if not any(get_history(obj, name).has_changes() for name in rule.attrs):
+                continue
+            _collect(session, obj, _old_state(obj, rule.attrs), _new_state(obj, rule.attrs), rule)
+
+    for obj in session.deleted:
+        for rule in _RULES_BY_MODEL.get(type(obj), ()):
+            _collect(session, obj, _new_state(obj, rule.attrs), None, rule)
+
+
+def _after_commit(session: Session):
+    # Also fired on SAVEPOINT release: wait for the outermost commit
+    if session.in_nested_transaction():
+        return
+    by_transaction = session.info.pop("dashboard_counters", None)
+    if not by_transaction:
+        return
+
+    # Released savepoints are still here; rolled back ones were dropped
+    deltas: Counter = Counter()
+    invalidate: set = set()
+    for pending in by_transaction.values():
+        deltas.update(pending["deltas"])
+        invalidate |= pending["invalidate"]
+
+    by_key: dict[str, list] = {}
+    for (key, field), delta in deltas.items():
+        if delta and key not in invalidate:
+            by_key.setdefault(key, []).extend([field, delta])
+
+    try:
+        for key in invalidate:
+            redis_client.delete(key)
+        for key, args in by_key.items():
+            _APPLY_DELTAS(keys=[key], args=args)
+    except Exception as exc:
+        # Reconciliation repairs what was missed here
+        print(f"[DASHBOARD COUNTERS] apply failed: {exc}")
+
+
+def _rolled_back(transaction, rolled_back) -> bool:
+    while transaction is not None:
+        if transaction is rolled_back:
+            return True
+        transaction = transaction.parent
+    return False
+
+
+def _after_rollback(session: Session, previous_transaction):
+    """Drop the deltas of the rolled back transaction and the savepoints inside it."""
+    by_transaction = session.info.get("dashboard_counters")
+    if not by_transaction:
+        return
+    for transaction in list(by_transaction):
+        if _rolled_back(transaction, previous_transaction):
+            del by_transaction[transaction]
+    if not by_transaction:
+        session.info.pop("dashboard_counters", None)
+
+
+def install_hooks():
+    if not event.contains(Session, "after_flush", _after_flush):
+        event.listen(Session, "after_flush", _after_flush)
+        event.listen(Session, "after_commit", _after_commit)
+        event.listen(Session, "after_soft_rollback", _after_rollback)
+
+
+install_hooks()
+
+
+# -------------------------------
+# RECONCILIATION
+# -------------------------------
+def reconcile_counters(db: Session) -> dict[str, int]:
+    """Recompute every scope (one GROUP BY per counter) and overwrite Redis."""
+    scopes: dict[tuple[str, int], dict[str, int]] = {}
+
+    tenant_ids = db.execute(select(Tenant.tenant_id)).scalars().all()
+    fleet_ids = db.execute(select(FleetOwner.fleet_owner_id)).scalars().all()
+    fields = {}
+    for rule in COUNTER_RULES:
+        fields.setdefault(rule.scope, []).append(rule.field)
+
+    for scope, ids in (("tenant", tenant_ids), ("fleet", fleet_ids), ("platform", [PLATFORM_SCOPE_ID])):
+        for scope_id in ids:
+            scopes[(scope, scope_id)] = dict.fromkeys(fields[scope], 0)
+
+    for rule in COUNTER_RULES:
+        for row in db.execute(_rule_query(rule)).all():
+            scope_id = PLATFORM_SCOPE_ID if rule.scope == "platform" else row[0]
+            counters = scopes.get((rule.scope, scope_id))
+            if counters is not None:
+                counters[rule.field] = int(row[-1])
+
+    pipe = redis_client.pipeline(transaction=False)
+    for (scope, scope_id), counters in scopes.items():
+        _store(pipe, scope, scope_id, counters)
+    pipe.execute()
+
+    return {
+        scope: sum(1 for s, _ in scopes if s == scope)
+        for scope in ("tenant", "fleet", "platform")
+    }
+
+
+def _reconcile_once() -> dict[str, int] | None:
+    # One process per interval does the work
+    interval = settings.DASHBOARD_RECONCILE_SECONDS
+    if not redis_client.set(RECONCILE_LOCK_KEY, 1, nx=True, ex=max(interval - 1, 1)):
+        return None
+
+    db = ReadSessionLocal(bind=read_only_bind(engine))
+    try:
+        return reconcile_counters(db)
+    finally:
+        db.close()
+
+
+async def reconcile_loop():
+    while True:
+        try:
+            result = await run_in_threadpool(_reconcile_once)
+            if result:
+                print(f"[DASHBOARD COUNTERS] reconciled {result}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            print(f"[DASHBOARD COUNTERS] reconcile failed: {exc}")
+        await asyncio.sleep(settings.DASHBOARD_RECONCILE_SECONDS)
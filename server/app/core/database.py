@@ -1,11 +1,27 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+import itertools
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import sessionmaker, DeclarativeBase, Session
 from app.core.config import settings
+from app.core.db_pool import TimedQueuePool, TimedAsyncQueuePool, register_engine
+
+POOL_OPTIONS = {
+    "pool_pre_ping": True,
+    "pool_size": settings.DB_POOL_SIZE,
+    "max_overflow": settings.DB_MAX_OVERFLOW,
+    "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+    "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+}
 
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True
+    poolclass=TimedQueuePool,
+    **POOL_OPTIONS
 )
+register_engine("primary", engine)
 
 SessionLocal = sessionmaker(
     bind=engine,
@@ -13,6 +29,152 @@ SessionLocal = sessionmaker(
     autocommit=False
 )
 
+
+# -------------------------------
+# READ REPLICAS
+# -------------------------------
+# Dashboards / history reads go through get_read_db, which binds the
+# session to a replica whose replication lag is under
+# REPLICA_MAX_LAG_SECONDS, or to the primary if none qualifies.
+REPLICA_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+replica_engines = []
+for idx, url in enumerate(u.strip() for u in settings.DATABASE_REPLICA_URLS.split(",") if u.strip()):
+    replica = create_engine(url, poolclass=TimedQueuePool, **POOL_OPTIONS)
+    register_engine(f"replica_{idx}", replica)
+    replica_engines.append(replica)
+
+_replica_cycle = itertools.cycle(replica_engines) if replica_engines else None
+# engine → (checked_at, lag_seconds)
+_replica_lag: dict = {}
+
+
+def replica_lag_seconds(replica) -> float:
+    now = time.monotonic()
+    cached = _replica_lag.get(replica)
+    if cached and now - cached[0] < settings.REPLICA_LAG_CHECK_SECONDS:
+        return cached[1]
+
+    try:
+        with replica.connect() as conn:
+            lag = float(conn.execute(REPLICA_LAG_SQL).scalar() or 0)
+    except Exception as exc:
+        print(f"[DB] replica lag check failed {replica.url.host}: {exc}")
+        lag = float("inf")
+
+    _replica_lag[replica] = (now, lag)
+    return lag
+
+
+def read_engine():
+    """Next replica within the lag budget (round robin), else the primary."""
+    for _ in range(len(replica_engines)):
+        replica = next(_replica_cycle)
+        if replica_lag_seconds(replica) <= settings.REPLICA_MAX_LAG_SECONDS:
+            return replica
+    return engine
+
+
+# -------------------------------
+# READ-ONLY SESSIONS
+# -------------------------------
+# Pure GET paths run in AUTOCOMMIT: no BEGIN / COMMIT / ROLLBACK round trips,
+# nothing to flush, and objects stay loaded after the request (no expiry).
+class ReadOnlySession(Session):
+    """Refuses to flush pending changes instead of silently writing them."""
+
+    def flush(self, objects=None):
+        if self.new or self.dirty or self.deleted:
+            raise RuntimeError("Read-only session: writes need get_db")
+
+
+# Each engine gets an AUTOCOMMIT twin with its own pool. Switching the
+# isolation level per checkout on the shared pool (execution_options) makes
+# psycopg2 send SET default_transaction_isolation on checkout and return,
+# and the read-write sessions on those connections then send BEGIN
+# ISOLATION LEVEL ... instead of BEGIN.
+_read_only_engines: dict = {}
+
+
+def read_only_bind(target):
+    bound = _read_only_engines.get(target)
+    if bound is None:
+        bound = _read_only_engines[target] = create_engine(
+            target.url,
+            isolation_level="AUTOCOMMIT",
+            poolclass=TimedQueuePool,
+            **{
+                **POOL_OPTIONS,
+                "pool_size": settings.DB_READ_ONLY_POOL_SIZE,
+                "max_overflow": settings.DB_READ_ONLY_MAX_OVERFLOW,
+            },
+        )
+        if target is engine:
+            register_engine("primary_read_only", bound)
+        elif target in replica_engines:
+            register_engine(f"replica_{replica_engines.index(target)}_read_only", bound)
+    return bound
+
+
+ReadSessionLocal = sessionmaker(
+    class_=ReadOnlySession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+
+def replica_status() -> list[dict]:
+    return [
+        {
+            "host": replica.url.host,
+            "lag_seconds": _replica_lag.get(replica, (None, None))[1],
+        }
+        for replica in replica_engines
+    ]
+
+
+# -------------------------------
+# ASYNC (asyncpg) - hot paths
+# -------------------------------
+# Used by async def endpoints through get_async_db, so Postgres waits do not
+# pin AnyIO threadpool slots. Redis on those paths stays on the sync client
+# (pipelined sub-millisecond round trips). Existing sync helpers can be
+# reused via `await db.run_sync(fn, ...)`.
+def _async_database_url() -> str:
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    return make_url(settings.DATABASE_URL).set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+
+
+async_engine = create_async_engine(
+    _async_database_url(),
+    poolclass=TimedAsyncQueuePool,
+    **POOL_OPTIONS
+)
+register_engine("primary_async", async_engine.sync_engine)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+AsyncReadSessionLocal = async_sessionmaker(
+    bind=async_engine.execution_options(isolation_level="AUTOCOMMIT"),
+    class_=AsyncSession,
+    sync_session_class=ReadOnlySession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+
 class Base(DeclarativeBase):
     pass
 
@@ -0,0 +1,50 @@
+"""
+DB Migrations - tables that come from migrations/*.sql
+
+Tables the app reads and writes but never creates at runtime. Startup
+checks that they exist with every column of their model, as
+check_partitioned() does for the partition conversion, so a missing
+migration fails the deploy instead of the first background run.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.models.core.accounting.ledger_checkpoints import LedgerBalanceCheckpoint
+from app.models.core.analytics.rollups import DispatchRollup, RevenueRollup, RollupWatermark, TripRollup
+
+ROLLUPS_MIGRATION = "migrations/004_analytics_rollups.sql"
+
+# Table -> migration creating it
+MIGRATED_TABLES = {
+    LedgerBalanceCheckpoint.__table__: "migrations/003_ledger_balance_checkpoints.sql",
+    RollupWatermark.__table__: ROLLUPS_MIGRATION,
+    TripRollup.__table__: ROLLUPS_MIGRATION,
+    DispatchRollup.__table__: ROLLUPS_MIGRATION,
+    RevenueRollup.__table__: ROLLUPS_MIGRATION,
+}
+
+
+class MissingTablesError(RuntimeError):
+    """A table (or column) created by a migration is missing: the migration has not run."""
+
+
+def check_migrated_tables(db: Session) -> None:
+    present = {}
+    for table_name, column_name in db.execute(text("""
+        SELECT table_name, column_name
+        FROM information_schema.columns
+        WHERE table_schema = current_schema()
+          AND table_name = ANY(:tables)
+    """), {"tables": [table.name for table in MIGRATED_TABLES]}):
+        present.setdefault(table_name, set()).add(column_name)
+
+    problems = []
+    for table, migration in MIGRATED_TABLES.items():
+        missing = [column.name for column in table.columns if column.name not in present.get(table.name, ())]
+        if missing:
+            what = table.name if table.name not in present else f"{table.name} ({', '.join(missing)})"
+            problems.append(f"{what}: run {migration}")
+
+    if problems:
+        raise MissingTablesError(f"Missing tables: {'; '.join(problems)}")
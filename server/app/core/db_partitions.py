@@ -0,0 +1,270 @@
+"""
+DB Partitions - monthly range partitions + archival
+
+Append-only history tables are RANGE partitioned by month on their write
+timestamp (see the models' __table_args__):
+
+    financial_ledger          created_at_utc
+    trip_status_history       changed_at_utc
+    trip_dispatch_candidates  created_at_utc
+
+Databases created before the tables were partitioned are converted by
+migrations/001_partition_history_tables.sql. Until then check_partitioned()
+raises UnpartitionedTablesError, and startup fails.
+
+ensure_partitions() creates the current month plus PARTITION_MONTHS_AHEAD
+future months (and a DEFAULT catch-all) and runs on startup. Rows that
+reached DEFAULT because their month had no partition are moved into newly
+created ones. archive_partitions() detaches months older than the table's
+retention and moves them to the `archive` schema, where they stay queryable.
+partition_loop() runs both every PARTITION_MAINTENANCE_SECONDS (one
+process per interval).
+
+Queries should bound the partition column so the planner prunes months;
+ledger period filters go through ledger_credit_window().
+"""
+
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.redis import redis_client
+
+ARCHIVE_SCHEMA = "archive"
+PARTITION_LOCK_KEY = "partitions:lock"
+CONVERSION_MIGRATION = "migrations/001_partition_history_tables.sql"
+
+# credited_at_utc is set in the same insert as created_at_utc (now());
+# this slack keeps month-edge rows inside the pruned window.
+LEDGER_CREDIT_SKEW = timedelta(days=1)
+
+
+@dataclass(frozen=True)
+class PartitionedTable:
+    name: str
+    column: str
+    retention_months: int
+    # Archive only partitions where this returns no row
+    archive_guard: str | None = None
+
+
+PARTITIONED_TABLES = [
+    PartitionedTable(
+        "financial_ledger",
+        "created_at_utc",
+        retention_months=24,
+        # Never archive credits that are still waiting for a payout
+        archive_guard="entry_type = 'CREDIT' AND payout_batch_id IS NULL",
+    ),
+    PartitionedTable("trip_status_history", "changed_at_utc", retention_months=12),
+    PartitionedTable("trip_dispatch_candidates", "created_at_utc", retention_months=3),
+]
+
+
+def month_start(value: datetime, offset: int = 0) -> datetime:
+    month_index = value.year * 12 + value.month - 1 + offset
+    return datetime(month_index // 12, month_index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def partition_name(table: str, month: datetime) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+
+# -------------------------------
+# CONVERSION CHECK
+# -------------------------------
+class UnpartitionedTablesError(RuntimeError):
+    """History tables are still plain tables: the conversion migration has not run."""
+
+
+def check_partitioned(db: Session) -> None:
+    partitioned = set(db.execute(text("""
+        SELECT c.relname
+        FROM pg_partitioned_table p
+        JOIN pg_class c ON c.oid = p.partrelid
+        WHERE c.relname = ANY(:tables)
+    """), {"tables": [table.name for table in PARTITIONED_TABLES]}).scalars())
+
+    missing = [table.name for table in PARTITIONED_TABLES if table.name not in partitioned]
+    if missing:
+        raise UnpartitionedTablesError(
+            f"Not partitioned: {', '.join(missing)}. Run {CONVERSION_MIGRATION}"
+        )
+
+
+# -------------------------------
+# CREATION
+# -------------------------------
+def _create_partition(db: Session, table: PartitionedTable, start: datetime) -> str:
+    name = partition_name(table.name, start)
+    db.execute(text(
+        f"CREATE TABLE {name} PARTITION OF {table.name} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{month_start(start, 1).isoformat()}')"
+    ))
+    return name
+
+
+def _move_default_rows(db: Session, table: PartitionedTable) -> list[str]:
+    """
+    Give the months found in DEFAULT their own partitions. Postgres refuses
+    to create a partition whose range has rows in DEFAULT, so DEFAULT is
+    detached, the months are created, its rows go back in through the
+    parent and it is reattached. The parent is locked until commit.
+    Returns created names.
+    """
+    default = f"{table.name}_default"
+    months = db.execute(text(
+        f"SELECT DISTINCT date_trunc('month', {table.column} AT TIME ZONE 'UTC') FROM {default}"
+    )).scalars().all()
+    if not months:
+        return []
+
+    columns = ", ".join(db.execute(text("""
+        SELECT quote_ident(column_name)
+        FROM information_schema.columns
+        WHERE table_schema = current_schema() AND table_name = :table
+        ORDER BY ordinal_position
+    """), {"table": table.name}).scalars())
+
+    db.execute(text(f"ALTER TABLE {table.name} DETACH PARTITION {default}"))
+    created = [_create_partition(db, table, month.replace(tzinfo=timezone.utc)) for month in sorted(months)]
+    db.execute(text(f"INSERT INTO {table.name} ({columns}) SELECT {columns} FROM {default}"))
+    db.execute(text(f"TRUNCATE {default}"))
+    db.execute(text(f"ALTER TABLE {table.name} ATTACH PARTITION {default} DEFAULT"))
+    print(f"[PARTITIONS] moved rows of {default} into {', '.join(created)}")
+    return created
+
+
+def ensure_partitions(db: Session, months_ahead: int | None = None) -> list[str]:
+    """Create missing monthly partitions up to `months_ahead`. Returns created names."""
+    check_partitioned(db)
+    months_ahead = settings.PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    current = month_start(datetime.now(timezone.utc))
+    created = []
+
+    for table in PARTITIONED_TABLES:
+        db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {table.name}_default "
+            f"PARTITION OF {table.name} DEFAULT"
+        ))
+        created.extend(_move_default_rows(db, table))
+
+        for offset in range(months_ahead + 1):
+            start = month_start(current, offset)
+            exists = db.execute(
+                text("SELECT to_regclass(:name)"), {"name": partition_name(table.name, start)}
+            ).scalar()
+            if exists:
+                continue
+
+            created.append(_create_partition(db, table, start))
+
+    db.commit()
+    return created
+
+
+# -------------------------------
+# ARCHIVAL
+# -------------------------------
+def _attached_partitions(db: Session, table: str) -> list[str]:
+    rows = db.execute(text("""
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_class child  ON child.oid  = pg_inherits.inhrelid
+        WHERE parent.relname = :table
+    """), {"table": table}).scalars().all()
+    return sorted(rows)
+
+
+def archive_partitions(db: Session) -> list[str]:
+    """Detach partitions past retention into the archive schema. Returns moved names."""
+    current = month_start(datetime.now(timezone.utc))
+    archived = []
+
+    db.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+
+    for table in PARTITIONED_TABLES:
+        cutoff = partition_name(table.name, month_start(current, -table.retention_months))
+
+        for name in _attached_partitions(db, table.name):
+            # Monthly partitions only (skip DEFAULT); names sort chronologically
+            if not name.startswith(f"{table.name}_p") or name >= cutoff:
+                continue
+
+            if table.archive_guard:
+                pending = db.execute(text(
+                    f"SELECT 1 FROM {name} WHERE {table.archive_guard} LIMIT 1"
+                )).first()
+                if pending:
+                    print(f"[PARTITIONS] keeping {name}: rows still pending")
+                    continue
+
+            db.execute(text(f"ALTER TABLE {table.name} DETACH PARTITION {name}"))
+            db.execute(text(f"ALTER TABLE {name} SET SCHEMA {ARCHIVE_SCHEMA}"))
+            archived.append(name)
+
+    db.commit()
+    return archived
+
+
+def run_partition_maintenance(db: Session) -> dict:
+    return {
+        "created": ensure_partitions(db),
+        "archived": archive_partitions(db),
+    }
+
+
+# -------------------------------
+# LOOP
+# -------------------------------
+def _run_once() -> dict | None:
+    interval = settings.PARTITION_MAINTENANCE_SECONDS
+    if not redis_client.set(PARTITION_LOCK_KEY, 1, nx=True, ex=max(interval - 1, 1)):
+        return None
+
+    db = SessionLocal()
+    try:
+        return run_partition_maintenance(db)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def partition_loop():
+    while True:
+        try:
+            result = await run_in_threadpool(_run_once)
+            if result and any(result.values()):
+                print(f"[PARTITIONS] {result}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            print(f"[PARTITIONS] maintenance failed: {exc}")
+        await asyncio.sleep(settings.PARTITION_MAINTENANCE_SECONDS)
+
+
+# -------------------------------
+# QUERY HELPERS (partition pruning)
+# -------------------------------
+def ledger_credit_window(start: datetime, end: datetime) -> list:
+    """
+    Filters for ledger credits in [start, end], including a created_at_utc
+    bound so only the matching monthly partitions are scanned.
+    """
+    from app.models.core.accounting.ledger import FinancialLedger
+
+    return [
+        FinancialLedger.credited_at_utc >= start,
+        FinancialLedger.credited_at_utc <= end,
+        FinancialLedger.created_at_utc >= start - LEDGER_CREDIT_SKEW,
+        FinancialLedger.created_at_utc <= end + LEDGER_CREDIT_SKEW,
+    ]
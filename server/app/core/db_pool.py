@@ -0,0 +1,72 @@
+"""
+DB Pool - pool classes with checkout wait timing + per-engine metrics
+
+QueuePool already knows size / checked-out / overflow; what it does not
+track is how long requests wait for a connection. The Timed* pools wrap the
+acquire step and keep process-local counters on the pool instance.
+
+    register_engine("primary", engine)
+    pool_metrics()  →  {"primary": {...}, "replica_0": {...}}
+"""
+
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+_engines: dict = {}
+
+
+class _TimedGetMixin:
+    """Counts checkouts, wait time and pool timeouts around QueuePool._do_get."""
+
+    checkouts = 0
+    timeouts = 0
+    wait_ms_total = 0.0
+    wait_ms_max = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = (time.perf_counter() - started) * 1000
+            self.checkouts += 1
+            self.wait_ms_total += waited
+            if waited > self.wait_ms_max:
+                self.wait_ms_max = waited
+
+
+class TimedQueuePool(_TimedGetMixin, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedGetMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def register_engine(name: str, engine) -> None:
+    _engines[name] = engine
+
+
+def pool_metrics() -> dict:
+    metrics = {}
+    for name, engine in _engines.items():
+        pool = engine.pool
+        checkouts = getattr(pool, "checkouts", 0)
+        wait_ms_total = getattr(pool, "wait_ms_total", 0.0)
+        metrics[name] = {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+            "checkouts": checkouts,
+            "timeouts": getattr(pool, "timeouts", 0),
+            "avg_wait_ms": round(wait_ms_total / checkouts, 3) if checkouts else 0.0,
+            "max_wait_ms": round(getattr(pool, "wait_ms_max", 0.0), 3),
+        }
+    return metrics
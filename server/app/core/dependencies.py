@@ -1,4 +1,12 @@
-from app.core.database import SessionLocal
+from app.core.database import (
+    engine,
+    SessionLocal,
+    AsyncSessionLocal,
+    AsyncReadSessionLocal,
+    ReadSessionLocal,
+    read_engine,
+    read_only_bind,
+)
 
 
 def get_db():
@@ -12,3 +20,44 @@ def get_db():
     finally:
         db.close()
 
+
+
+def _read_only_session(target):
+    db = ReadSessionLocal(bind=read_only_bind(target))
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_read_db():
+    """
+    Read-only (autocommit, no flush/commit) session on a healthy replica,
+    primary fallback. For dashboards / history where replica lag is fine.
+    """
+    yield from _read_only_session(read_engine())
+
+
+def get_primary_read_db():
+    """Read-only session on the primary, for GETs that must see own writes."""
+    yield from _read_only_session(engine)
+
+
+async def get_async_db():
+    """
+    Async twin of get_db for hot paths (async def endpoints).
+    No threadpool slot is held while waiting on Postgres.
+    """
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+
+async def get_async_read_db():
+    """Read-only async session on the primary (autocommit, never flushes)."""
+    async with AsyncReadSessionLocal() as db:
+        yield db
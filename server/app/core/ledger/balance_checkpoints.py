@@ -0,0 +1,289 @@
+"""
+Ledger Balance Checkpoints
+
+A balance used to be SUM(amount) over every ledger row of the entity.
+Checkpoints keep the folded balance per (tenant, entity_type, owner_type,
+entity_id, currency) up to through_utc, so a balance is:
+
+    checkpoint.balance + SUM(signed amount WHERE created_at_utc > through_utc)
+
+and the delta only reads rows written since the last run (index range on
+ix_ledger_entity_history, recent partitions only).
+
+Drivers and fleet owners both write entity_type "owner" rows with ids from
+separate sequences, so owner rows are further keyed by ledger_owner_type():
+earnings by transaction_type (as PAYEE_TYPE in payouts/calculate.py),
+payout debits by their payout's owner_type.
+
+build_checkpoints() is incremental: rows in (MAX(through_utc), now - lag]
+are grouped per entity and added with one INSERT ... ON CONFLICT. Every
+ledger row at or before MAX(through_utc) is therefore in some checkpoint.
+The upsert is additive, so runs are serialized by a transaction-level
+advisory lock taken before the watermark is read; a second run waits and
+then only folds what the first one left.
+The lag (LEDGER_CHECKPOINT_SAFETY_LAG_SECONDS) leaves room for
+transactions still in flight, whose created_at_utc is their start time.
+
+verify_wallet_balances() compares the ledger balances with OwnerWallet /
+TenantWallet and reports drift.
+
+The table comes from migrations/003_ledger_balance_checkpoints.sql
+(checked on startup, core/db_migrations.py).
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import and_, case, func, literal, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.ledger.ledger_service import OWNER_EARNING_TYPES
+from app.core.redis import redis_client
+from app.models.core.accounting.ledger import FinancialLedger
+from app.models.core.accounting.ledger_checkpoints import LedgerBalanceCheckpoint
+from app.models.core.payouts.payouts import Payout
+from app.models.core.wallets.owner_wallet import OwnerWallet
+from app.models.core.wallets.tenant_wallet import TenantWallet
+
+CHECKPOINT_LOCK_KEY = "ledger:checkpoint_lock"
+# pg_advisory_xact_lock key serializing build_checkpoints()
+CHECKPOINT_ADVISORY_LOCK_ID = 4_904_900_049
+BALANCE_TOLERANCE = Decimal("0.01")
+
+# Entity of rows without one (platform / tax)
+NO_ENTITY_ID = 0
+
+
+def signed_amount():
+    return case(
+        (FinancialLedger.entry_type == "DEBIT", -FinancialLedger.amount),
+        else_=FinancialLedger.amount,
+    )
+
+
+def ledger_owner_type():
+    """Owner kind of a ledger row; needs the outer join on PAYOUT_OF_ROW."""
+    return case(
+        (FinancialLedger.entity_type != "owner", ""),
+        *[
+            (FinancialLedger.transaction_type == transaction_type, kind)
+            for kind, transaction_type in OWNER_EARNING_TYPES.items()
+        ],
+        (FinancialLedger.transaction_type == "payout", func.coalesce(Payout.owner_type, "")),
+        else_="",
+    )
+
+
+# Payout of a payout DEBIT row (ledger_owner_type() of payout debits)
+PAYOUT_OF_ROW = Payout.payout_id == FinancialLedger.payout_id
+
+
+# -------------------------------
+# BUILD (background job)
+# -------------------------------
+def build_checkpoints(db: Session) -> dict:
+    """Fold ledger rows written since the last run into the checkpoints."""
+    # Held until commit: an overlapping run (loop, admin endpoint) would read
+    # the same watermark and add the same rows twice
+    db.execute(select(func.pg_advisory_xact_lock(CHECKPOINT_ADVISORY_LOCK_ID)))
+    checkpoint = LedgerBalanceCheckpoint
+    ledger = FinancialLedger
+
+    after = db.scalar(select(func.max(checkpoint.through_utc)))
+    upto = datetime.now(timezone.utc) - timedelta(seconds=settings.LEDGER_CHECKPOINT_SAFETY_LAG_SECONDS)
+    if after is not None and after >= upto:
+        db.commit()  # release the lock
+        return {"entities": 0, "through_utc": after}
+
+    entity_id = func.coalesce(ledger.entity_id, NO_ENTITY_ID)
+    kind = ledger_owner_type()
+    changes = (
+        select(
+            ledger.tenant_id,
+            ledger.entity_type,
+            kind,
+            entity_id,
+            ledger.currency_code,
+            func.sum(signed_amount()),
+            func.count(),
+            literal(upto, checkpoint.through_utc.type),
+        )
+        .select_from(ledger)
+        .outerjoin(Payout, PAYOUT_OF_ROW)
+        .where(ledger.created_at_utc <= upto)
+        .group_by(ledger.tenant_id, ledger.entity_type, kind, entity_id, ledger.currency_code)
+    )
+    if after is not None:
+        changes = changes.where(ledger.created_at_utc > after)
+
+    statement = insert(checkpoint).from_select(
+        ["tenant_id", "entity_type", "owner_type", "entity_id", "currency_code", "balance", "entries", "through_utc"],
+        changes,
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=["tenant_id", "entity_type", "owner_type", "entity_id", "currency_code"],
+        set_={
+            "balance": checkpoint.balance + statement.excluded.balance,
+            "entries": checkpoint.entries + statement.excluded.entries,
+            "through_utc": statement.excluded.through_utc,
+        },
+    )
+    result = db.execute(statement)
+    db.commit()
+
+    return {"entities": result.rowcount, "through_utc": upto}
+
+
+# -------------------------------
+# READ
+# -------------------------------
+def ledger_balance(
+    db: Session,
+    tenant_id: int,
+    entity_type: str,
+    entity_id: int | None,
+    currency_code: str | None = None,
+    owner_type: str | None = None,  # "driver" | "fleet_owner" for owners
+) -> Decimal:
+    """Checkpoint + delta balance of one entity (all currencies if none given)."""
+    checkpoint = LedgerBalanceCheckpoint
+    ledger = FinancialLedger
+    owner_type = owner_type or ""
+
+    checkpoints_query = db.query(checkpoint).filter(
+        checkpoint.tenant_id == tenant_id,
+        checkpoint.entity_type == entity_type,
+        checkpoint.owner_type == owner_type,
+        checkpoint.entity_id == (NO_ENTITY_ID if entity_id is None else entity_id),
+    )
+    delta_query = (
+        db.query(func.coalesce(func.sum(signed_amount()), 0))
+        .select_from(ledger)
+        .outerjoin(Payout, PAYOUT_OF_ROW)
+        .filter(
+            ledger.tenant_id == tenant_id,
+            ledger.entity_type == entity_type,
+            ledger.entity_id.is_(None) if entity_id is None else ledger.entity_id == entity_id,
+            ledger_owner_type() == owner_type,
+        )
+    )
+    if currency_code:
+        checkpoints_query = checkpoints_query.filter(checkpoint.currency_code == currency_code)
+        delta_query = delta_query.filter(ledger.currency_code == currency_code)
+
+    checkpoints = checkpoints_query.all()
+    if checkpoints:
+        # Currencies without a checkpoint only have rows after every through_utc
+        delta_query = delta_query.filter(
+            ledger.created_at_utc > min(c.through_utc for c in checkpoints),
+            or_(
+                *[
+                    and_(ledger.currency_code == c.currency_code, ledger.created_at_utc > c.through_utc)
+                    for c in checkpoints
+                ],
+                ledger.currency_code.notin_([c.currency_code for c in checkpoints]),
+            ),
+        )
+
+    folded = sum((Decimal(str(c.balance)) for c in checkpoints), Decimal("0"))
+    return folded + Decimal(str(delta_query.scalar()))
+
+
+# -------------------------------
+# VERIFY AGAINST WALLETS
+# -------------------------------
+def _ledger_balances(db: Session) -> dict[tuple, Decimal]:
+    """(tenant_id, entity_type, owner_type, entity_id, currency) -> balance for every entity."""
+    checkpoint = LedgerBalanceCheckpoint
+    ledger = FinancialLedger
+
+    balances = {
+        (c.tenant_id, c.entity_type, c.owner_type, c.entity_id, c.currency_code): Decimal(str(c.balance))
+        for c in db.query(checkpoint).all()
+    }
+
+    after = db.scalar(select(func.max(checkpoint.through_utc)))
+    entity_id = func.coalesce(ledger.entity_id, NO_ENTITY_ID)
+    kind = ledger_owner_type()
+    delta = (
+        db.query(ledger.tenant_id, ledger.entity_type, kind, entity_id, ledger.currency_code, func.sum(signed_amount()))
+        .select_from(ledger)
+        .outerjoin(Payout, PAYOUT_OF_ROW)
+        .group_by(ledger.tenant_id, ledger.entity_type, kind, entity_id, ledger.currency_code)
+    )
+    if after is not None:
+        delta = delta.filter(ledger.created_at_utc > after)
+
+    for tenant_id, entity_type, owner_type, entity, currency, amount in delta.all():
+        key = (tenant_id, entity_type, owner_type, entity, currency)
+        balances[key] = balances.get(key, Decimal("0")) + Decimal(str(amount))
+    return balances
+
+
+def verify_wallet_balances(db: Session, limit: int = 50) -> dict:
+    """Compare wallet balances with the ledger; returns mismatch count + samples."""
+    balances = _ledger_balances(db)
+    mismatches = []
+    checked = 0
+
+    wallets = [
+        (w.tenant_id, "owner", w.owner_type, w.driver_id if w.owner_type == "driver" else w.fleet_owner_id,
+         w.currency_code, w.balance, f"owner_wallet:{w.owner_wallet_id}")
+        for w in db.query(OwnerWallet).all()
+    ] + [
+        (w.tenant_id, "tenant", "", w.tenant_id, w.currency_code, w.balance, f"tenant_wallet:{w.tenant_wallet_id}")
+        for w in db.query(TenantWallet).all()
+    ]
+
+    for tenant_id, entity_type, owner_type, entity_id, currency, wallet_balance, wallet in wallets:
+        checked += 1
+        expected = balances.get((tenant_id, entity_type, owner_type, entity_id, currency), Decimal("0"))
+        actual = Decimal(str(wallet_balance or 0))
+        if abs(expected - actual) > BALANCE_TOLERANCE:
+            mismatches.append({
+                "wallet": wallet,
+                "ledger_balance": float(expected),
+                "wallet_balance": float(actual),
+            })
+
+    if mismatches:
+        print(f"[LEDGER CHECKPOINTS] {len(mismatches)} wallet(s) differ from the ledger")
+    return {"checked": checked, "mismatches": len(mismatches), "samples": mismatches[:limit]}
+
+
+# -------------------------------
+# LOOP
+# -------------------------------
+def _run_once() -> dict | None:
+    interval = settings.LEDGER_CHECKPOINT_SECONDS
+    if not redis_client.set(CHECKPOINT_LOCK_KEY, 1, nx=True, ex=max(interval - 1, 1)):
+        return None
+
+    db = SessionLocal()
+    try:
+        built = build_checkpoints(db)
+        built["verify"] = verify_wallet_balances(db, limit=5)
+        return built
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def checkpoint_loop():
+    while True:
+        try:
+            result = await run_in_threadpool(_run_once)
+            if result and result["entities"]:
+                print(f"[LEDGER CHECKPOINTS] {result['entities']} entities through {result['through_utc']}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            print(f"[LEDGER CHECKPOINTS] run failed: {exc}")
+        await asyncio.sleep(settings.LEDGER_CHECKPOINT_SECONDS)
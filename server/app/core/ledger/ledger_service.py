@@ -11,6 +11,12 @@ from datetime import datetime, timezone
 
 from app.models.core.trips.trips import Trip
 
+# Owner ledger rows: earning transaction_type per owner kind
+OWNER_EARNING_TYPES = {
+    "driver": "driver_earning",
+    "fleet_owner": "fleet_earnings",
+}
+
 
 class LedgerService:
     """
@@ -195,24 +201,85 @@ class LedgerService:
     def get_wallet_balance(
         db: Session,
         tenant_id: int,
-        entity_type: str,  # "driver" | "rider"
+        entity_type: str,  # "owner" | "tenant"
         entity_id: int,
+        currency_code: str | None = None,
+        owner_type: str | None = None,  # "driver" | "fleet_owner" for owners
     ) -> Decimal:
         """
         Calculate wallet balance from immutable ledger.
         
-        Sum all ledger entries for this entity.
+        CREDIT - DEBIT: the folded checkpoint plus the entries written
+        after it (see core/ledger/balance_checkpoints.py). Owner balances
+        need owner_type, as in get_entity_history.
         """
-        from app.models.core.accounting.ledger import FinancialLedger
-        
-        from sqlalchemy import func
+        from app.core.ledger.balance_checkpoints import ledger_balance
         
-        balance = db.query(
-            func.sum(FinancialLedger.amount)
-        ).filter(
+        return ledger_balance(db, tenant_id, entity_type, entity_id, currency_code, owner_type)
+
+    @staticmethod
+    def get_entity_history(
+        db: Session,
+        tenant_id: int,
+        entity_type: str,  # "owner" | "tenant"
+        entity_id: int,
+        cursor: str | None = None,
+        limit: int = 50,
+        owner_type: str | None = None,  # "driver" | "fleet_owner" for owners
+    ) -> dict:
+        """
+        One keyset page of an entity's ledger, newest first.
+        Ordered on (created_at_utc, ledger_id): served by
+        ix_ledger_entity_history and pruned to the needed partitions.
+
+        Drivers and fleet owners share entity_type "owner" with their own
+        id sequences, so owner histories must pass owner_type: earnings are
+        told apart by transaction_type, payout debits by their payout.
+        """
+        from sqlalchemy import and_, exists, or_
+        from app.models.core.accounting.ledger import FinancialLedger
+        from app.models.core.payouts.payouts import Payout
+        from app.core.utils.pagination import keyset_page
+
+        query = db.query(FinancialLedger).filter(
             FinancialLedger.tenant_id == tenant_id,
             FinancialLedger.entity_type == entity_type,
             FinancialLedger.entity_id == entity_id,
-        ).scalar() or Decimal("0")
-        
-        return Decimal(str(balance))
+        )
+        if owner_type:
+            query = query.filter(or_(
+                FinancialLedger.transaction_type == OWNER_EARNING_TYPES[owner_type],
+                and_(
+                    FinancialLedger.transaction_type == "payout",
+                    exists().where(
+                        Payout.payout_id == FinancialLedger.payout_id,
+                        Payout.owner_type == owner_type,
+                    ),
+                ),
+            ))
+        rows, next_cursor = keyset_page(
+            query,
+            (FinancialLedger.created_at_utc, FinancialLedger.ledger_id),
+            cursor,
+            limit,
+        )
+
+        return {
+            "entries": [
+                {
+                    "ledger_id": row.ledger_id,
+                    "trip_id": row.trip_id,
+                    "payment_id": row.payment_id,
+                    "payout_id": row.payout_id,
+                    "transaction_type": row.transaction_type,
+                    "entry_type": row.entry_type,
+                    "amount": float(row.amount),
+                    "currency_code": row.currency_code,
+                    "credited_at_utc": row.credited_at_utc,
+                    "debited_at_utc": row.debited_at_utc,
+                    "created_at_utc": row.created_at_utc,
+                }
+                for row in rows
+            ],
+            "next_cursor": next_cursor,
+        }
@@ -0,0 +1,263 @@
+"""
+Location Ingestion Policy - driver location write coalescing
+
+Every heartbeat used to GEOADD the driver even when the car was parked.
+This module decides, per ping, whether the GEO index really needs a write:
+
+- moved at least `min_move_meters` since the last GEO write, or
+- heading changed by more than `heading_tolerance_deg`, or
+- last GEO write is older than `max_geo_interval_seconds` (keeps GEO key alive)
+
+Suppressed pings only refresh last-seen. Policy is per tenant (Redis hash),
+falling back to settings defaults.
+"""
+
+import time
+from datetime import datetime, timezone
+from dataclasses import dataclass, asdict
+
+from redis import Redis
+
+from app.core.config import settings
+from app.core.utils.geo import distance_meters
+from app.core.redis import (
+    redis_client,
+    geo_key,
+    driver_geo_state_key,
+    driver_last_seen_key,
+    driver_location_key,
+    driver_active_trip_key,
+    rider_channel,
+)
+from app.core.trips.trip_events import position_event
+
+GEO_KEY_TTL_SECONDS = 120
+LAST_SEEN_TTL_SECONDS = 60
+POLICY_CACHE_SECONDS = 30
+
+_policy_cache: dict[int, tuple[float, "LocationPolicy"]] = {}
+
+
+@dataclass(frozen=True)
+class LocationPolicy:
+    min_move_meters: float
+    heading_tolerance_deg: float
+    max_geo_interval_seconds: int
+
+
+DEFAULT_POLICY = LocationPolicy(
+    min_move_meters=settings.LOCATION_MIN_MOVE_METERS,
+    heading_tolerance_deg=settings.LOCATION_HEADING_TOLERANCE_DEG,
+    max_geo_interval_seconds=settings.LOCATION_MAX_GEO_INTERVAL_SECONDS,
+)
+
+
+def _policy_key(tenant_id: int) -> str:
+    return f"location_policy:{tenant_id}"
+
+
+def _stats_key(tenant_id: int) -> str:
+    return f"location_ingest:stats:{tenant_id}"
+
+
+def _max_error_key(tenant_id: int) -> str:
+    # Sorted set: member = UTC day, score = largest suppressed displacement
+    return f"location_ingest:max_error:{tenant_id}"
+
+
+# -------------------------------
+# POLICY STORAGE
+# -------------------------------
+def get_location_policy(tenant_id: int | None) -> LocationPolicy:
+    if not tenant_id:
+        return DEFAULT_POLICY
+
+    now = time.monotonic()
+    cached = _policy_cache.get(tenant_id)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    raw = redis_client.hgetall(_policy_key(tenant_id)) or {}
+    policy = LocationPolicy(
+        min_move_meters=float(raw.get("min_move_meters", DEFAULT_POLICY.min_move_meters)),
+        heading_tolerance_deg=float(raw.get("heading_tolerance_deg", DEFAULT_POLICY.heading_tolerance_deg)),
+        max_geo_interval_seconds=int(raw.get("max_geo_interval_seconds", DEFAULT_POLICY.max_geo_interval_seconds)),
+    )
+    _policy_cache[tenant_id] = (now + POLICY_CACHE_SECONDS, policy)
+    return policy
+
+
+def set_location_policy(tenant_id: int, policy: LocationPolicy) -> LocationPolicy:
+    redis_client.hset(
+        _policy_key(tenant_id),
+        mapping={k: str(v) for k, v in asdict(policy).items()},
+    )
+    _policy_cache.pop(tenant_id, None)
+    return policy
+
+
+# -------------------------------
+# DECISION
+# -------------------------------
+def heading_delta(a: float, b: float) -> float:
+    diff = abs(a - b) % 360
+    return 360 - diff if diff > 180 else diff
+
+
+def should_write_geo(
+    policy: LocationPolicy,
+    previous: dict,
+    lat: float,
+    lng: float,
+    heading: float | None,
+    now_ts: float,
+) -> tuple[bool, float]:
+    """
+    Returns (write_geo, displacement_m).
+
+    displacement_m is the distance between the position dispatch currently
+    sees and the real one — i.e. the error introduced if we skip the write.
+    """
+    if not previous or "lat" not in previous:
+        return True, 0.0
+
+    moved = distance_meters(float(previous["lat"]), float(previous["lng"]), lat, lng)
+
+    if moved >= policy.min_move_meters:
+        return True, moved
+
+    if now_ts - float(previous.get("ts", 0)) >= policy.max_geo_interval_seconds:
+        return True, moved
+
+    prev_heading = previous.get("heading")
+    if heading is not None and prev_heading not in (None, ""):
+        if heading_delta(heading, float(prev_heading)) > policy.heading_tolerance_deg:
+            return True, moved
+
+    return False, moved
+
+
+# -------------------------------
+# INGESTION
+# -------------------------------
+def ingest_driver_location(
+    driver_id: int,
+    tenant_id: int | None,
+    city_id: int | None,
+    lat: float,
+    lng: float,
+    heading: float | None = None,
+    location_hash: dict | None = None,
+    redis: Redis | None = None,
+) -> bool:
+    """
+    Apply the tenant policy to one location ping.
+
+    One pipelined read (previous GEO state + active trip) and one pipelined
+    write batch. `location_hash` (raw ping fields) is written to
+    driver_location_key() in the same batch. While the driver is on an
+    assigned trip, moved positions are pushed to the rider (throttled).
+    Returns True if the GEO index was updated.
+    """
+    redis = redis or redis_client
+    now_ts = time.time()
+
+    geo_ready = bool(tenant_id and city_id)
+    write_geo, moved = False, 0.0
+    active_trip = {}
+
+    if geo_ready:
+        policy = get_location_policy(tenant_id)
+        read = redis.pipeline(transaction=False)
+        read.hgetall(driver_geo_state_key(tenant_id, city_id, driver_id))
+        read.hgetall(driver_active_trip_key(tenant_id, city_id, driver_id))
+        previous, active_trip = read.execute()
+        write_geo, moved = should_write_geo(policy, previous or {}, lat, lng, heading, now_ts)
+
+    pipe = redis.pipeline(transaction=False)
+
+    if location_hash:
+        pipe.hset(driver_location_key(driver_id), mapping=location_hash)
+        pipe.expire(driver_location_key(driver_id), LAST_SEEN_TTL_SECONDS)
+
+    if geo_ready:
+        # Last-seen is always refreshed (cheap string write)
+        pipe.setex(
+            driver_last_seen_key(tenant_id, city_id, driver_id),
+            LAST_SEEN_TTL_SECONDS,
+            datetime.fromtimestamp(now_ts, timezone.utc).isoformat(),
+        )
+
+        stats_key = _stats_key(tenant_id)
+        pipe.hincrby(stats_key, "received", 1)
+
+        if write_geo:
+            city_geo_key = geo_key(tenant_id, city_id)
+            pipe.geoadd(city_geo_key, (lng, lat, str(driver_id)))
+            pipe.expire(city_geo_key, GEO_KEY_TTL_SECONDS)
+
+            state = {"lat": str(lat), "lng": str(lng), "ts": str(now_ts)}
+            if heading is not None:
+                state["heading"] = str(heading)
+            state_key = driver_geo_state_key(tenant_id, city_id, driver_id)
+            pipe.hset(state_key, mapping=state)
+            pipe.expire(state_key, GEO_KEY_TTL_SECONDS)
+
+            pipe.hincrby(stats_key, "geo_written", 1)
+
+            rider_event = position_event(active_trip, lat, lng, now_ts)
+            if rider_event:
+                pipe.publish(rider_channel(int(active_trip["trip_request_id"])), rider_event)
+                pipe.hset(
+                    driver_active_trip_key(tenant_id, city_id, driver_id),
+                    "last_push_ts",
+                    str(now_ts),
+                )
+        else:
+            pipe.hincrby(stats_key, "geo_suppressed", 1)
+            pipe.hincrbyfloat(stats_key, "suppressed_error_m_sum", round(moved, 2))
+            # Running max per day: GT only ever raises the score
+            day = datetime.fromtimestamp(now_ts, timezone.utc).strftime("%Y-%m-%d")
+            pipe.zadd(_max_error_key(tenant_id), {day: round(moved, 2)}, gt=True)
+
+    pipe.execute()
+    return write_geo
+
+
+def location_ingestion_report(tenant_id: int) -> dict:
+    """
+    Write reduction vs. dispatch distance error for a tenant.
+
+    Error is measured as the displacement between the GEO position and the
+    reported position for each suppressed ping: the average over all of
+    them, and the largest seen per UTC day.
+    """
+    read = redis_client.pipeline(transaction=False)
+    read.hgetall(_stats_key(tenant_id))
+    read.zrange(_max_error_key(tenant_id), 0, -1, withscores=True)
+    raw, max_by_day = read.execute()
+    raw = raw or {}
+    max_by_day = dict(sorted(max_by_day or []))
+    policy = get_location_policy(tenant_id)
+
+    received = int(raw.get("received", 0))
+    written = int(raw.get("geo_written", 0))
+    suppressed = int(raw.get("geo_suppressed", 0))
+    error_sum = float(raw.get("suppressed_error_m_sum", 0))
+
+    return {
+        "tenant_id": tenant_id,
+        "policy": asdict(policy),
+        "pings_received": received,
+        "geo_writes": written,
+        "geo_writes_suppressed": suppressed,
+        "write_reduction_pct": round(100.0 * suppressed / received, 2) if received else 0.0,
+        "avg_dispatch_error_m": round(error_sum / suppressed, 2) if suppressed else 0.0,
+        "max_dispatch_error_m": max(max_by_day.values(), default=0.0),
+        "max_dispatch_error_m_by_day": max_by_day,
+    }
+
+
+def reset_location_ingestion_stats(tenant_id: int) -> None:
+    redis_client.delete(_stats_key(tenant_id))
+    redis_client.delete(_max_error_key(tenant_id))
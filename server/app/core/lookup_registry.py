@@ -0,0 +1,248 @@
+"""
+Lookup Registry - immutable in-memory lookup tables
+
+Lookup tables (countries, cities, statuses, document types, vehicle
+categories) change a few times a year but were queried on every request.
+The registry loads them once per process into read-only rows plus
+pre-serialized JSON bodies and content ETags, so /lookups endpoints answer
+without touching Postgres and 304 on a matching If-None-Match.
+
+Invalidation: whoever changes a lookup table calls bump_lookup_version().
+Each process compares the Redis version with its snapshot at most every
+LOOKUP_VERSION_CHECK_SECONDS and reloads on change. Redis being down only
+means the current snapshot is kept.
+
+Internal code reads lookups here too:
+
+    for category in lookup_registry().rows("vehicle_categories"):
+        category["category_code"]
+"""
+
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+
+from geoalchemy2 import Geometry
+from sqlalchemy import cast, func
+
+from app.core.config import settings
+from app.core.database import engine, ReadSessionLocal, read_only_bind
+from app.core.redis import redis_client
+from app.core.utils.geo import encode_polyline
+
+from app.models.lookups.account_status import AccountStatus
+from app.models.lookups.approval_status import ApprovalStatus
+from app.models.lookups.country import Country
+from app.models.lookups.city import City
+from app.models.lookups.tenant_Fleet_document_types import TenantFleetDocumentType
+from app.models.lookups.vehicle_category import VehicleCategory
+from app.models.lookups.driver_document_type import DriverDocumentType
+from app.models.lookups.vehicle_document_type import VehicleDocumentType
+from app.models.lookups.driver_invite_status import DriverInviteStatus
+
+LOOKUP_VERSION_KEY = "lookups:version"
+
+
+@dataclass(frozen=True)
+class LookupTable:
+    name: str
+    model: type
+    columns: tuple[str, ...]
+    # Extra bodies pre-serialized per value of this column (e.g. ?country_id=)
+    group_by: str | None = None
+    # Labelled SQL expressions appended to the columns
+    expressions: tuple = ()
+
+
+_city_geometry = cast(City.boundary, Geometry(srid=4326))
+
+# Columns are the public projection (never raw geometry / audit columns);
+# cities carry centroid + bbox so clients can place them without polygons
+LOOKUP_TABLES = [
+    LookupTable("account_status", AccountStatus, ("status_code", "description")),
+    LookupTable("approval_status", ApprovalStatus, ("status_code", "description")),
+    LookupTable("driver_invite_status", DriverInviteStatus, ("status_code", "description")),
+    LookupTable(
+        "countries", Country,
+        ("country_id", "country_code", "country_name", "phone_code", "default_currency", "timezone"),
+    ),
+    LookupTable(
+        "cities", City,
+        ("city_id", "country_id", "city_name", "timezone", "is_active"),
+        group_by="country_id",
+        expressions=(
+            func.ST_Y(func.ST_Centroid(_city_geometry)).label("centroid_lat"),
+            func.ST_X(func.ST_Centroid(_city_geometry)).label("centroid_lng"),
+            func.ST_YMin(_city_geometry).label("bbox_min_lat"),
+            func.ST_XMin(_city_geometry).label("bbox_min_lng"),
+            func.ST_YMax(_city_geometry).label("bbox_max_lat"),
+            func.ST_XMax(_city_geometry).label("bbox_max_lng"),
+        ),
+    ),
+    LookupTable("tenant_document_types", TenantFleetDocumentType, ("document_code", "description", "is_mandatory")),
+    LookupTable("driver_document_types", DriverDocumentType, ("document_code", "description", "is_mandatory")),
+    LookupTable("vehicle_document_types", VehicleDocumentType, ("document_code", "description", "is_mandatory")),
+    LookupTable("vehicle_categories", VehicleCategory, ("category_code", "description")),
+]
+
+
+@dataclass(frozen=True)
+class LookupBody:
+    content: bytes
+    etag: str
+
+
+def _body(rows) -> LookupBody:
+    content = json.dumps(list(map(dict, rows)), separators=(",", ":"), default=str).encode()
+    return LookupBody(content, f'"{hashlib.sha1(content).hexdigest()[:16]}"')
+
+
+@dataclass(frozen=True)
+class LookupSnapshot:
+    version: int
+    tables: MappingProxyType   # name -> tuple of read-only row mappings
+    bodies: MappingProxyType   # (name, group value | None) -> LookupBody
+
+    def rows(self, name: str) -> tuple:
+        return self.tables[name]
+
+    def body(self, name: str, group=None) -> LookupBody:
+        # Unknown group (e.g. country without cities) is an empty list
+        return self.bodies.get((name, group)) or _EMPTY_BODY
+
+
+_EMPTY_BODY = _body([])
+
+
+# -------------------------------
+# LOADING
+# -------------------------------
+def _remote_version() -> int | None:
+    try:
+        return int(redis_client.get(LOOKUP_VERSION_KEY) or 0)
+    except Exception as exc:
+        print(f"[LOOKUPS] version check failed: {exc}")
+        return None
+
+
+def load_snapshot(version: int = 0) -> LookupSnapshot:
+    tables = {}
+    bodies = {}
+
+    db = ReadSessionLocal(bind=read_only_bind(engine))
+    try:
+        for table in LOOKUP_TABLES:
+            columns = [getattr(table.model, column) for column in table.columns]
+            result = db.query(*columns, *table.expressions).order_by(columns[0]).all()
+            rows = tuple(MappingProxyType(dict(row._mapping)) for row in result)
+
+            tables[table.name] = rows
+            bodies[(table.name, None)] = _body(rows)
+
+            if table.group_by:
+                groups: dict = {}
+                for row in rows:
+                    groups.setdefault(row[table.group_by], []).append(row)
+                for value, group_rows in groups.items():
+                    bodies[(table.name, value)] = _body(group_rows)
+    finally:
+        db.close()
+
+    return LookupSnapshot(version, MappingProxyType(tables), MappingProxyType(bodies))
+
+
+# -------------------------------
+# PROCESS REGISTRY
+# -------------------------------
+_snapshot: LookupSnapshot | None = None
+_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def lookup_registry() -> LookupSnapshot:
+    """Current snapshot; loads on first use and reloads after a version bump."""
+    global _snapshot, _checked_at
+
+    now = time.monotonic()
+    if _snapshot is not None and now - _checked_at < settings.LOOKUP_VERSION_CHECK_SECONDS:
+        return _snapshot
+
+    with _lock:
+        if _snapshot is not None and now - _checked_at < settings.LOOKUP_VERSION_CHECK_SECONDS:
+            return _snapshot
+
+        version = _remote_version()
+        _checked_at = now
+        if _snapshot is None or (version is not None and version != _snapshot.version):
+            _snapshot = load_snapshot(version or 0)
+            print(f"[LOOKUPS] loaded version={_snapshot.version}")
+
+    return _snapshot
+
+
+def bump_lookup_version() -> int:
+    """Call after changing any lookup table; every process reloads."""
+    global _checked_at
+    version = int(redis_client.incr(LOOKUP_VERSION_KEY))
+    _checked_at = 0.0
+    return version
+
+
+# -------------------------------
+# CITY BOUNDARIES (simplified, on demand)
+# -------------------------------
+BOUNDARY_FORMATS = ("geojson", "polyline")
+BOUNDARY_CACHE_SIZE = 512
+
+_boundaries: dict[tuple, LookupBody | None] = {}
+
+
+def _load_boundary(city_id: int, tolerance: float, fmt: str, precision: int) -> LookupBody | None:
+    simplified = func.ST_SimplifyPreserveTopology(_city_geometry, tolerance)
+
+    db = ReadSessionLocal(bind=read_only_bind(engine))
+    try:
+        # maxdecimaldigits quantizes the coordinates in Postgres already
+        raw = (
+            db.query(func.ST_AsGeoJSON(simplified, precision))
+            .filter(City.city_id == city_id, City.boundary.isnot(None))
+            .scalar()
+        )
+    finally:
+        db.close()
+
+    if raw is None:
+        return None
+    return boundary_body(city_id, json.loads(raw), tolerance, fmt, precision)
+
+
+def boundary_body(city_id: int, geometry: dict, tolerance: float, fmt: str, precision: int) -> LookupBody:
+    """Response body of a simplified GeoJSON polygon (coordinates already quantized)."""
+    payload = {"city_id": city_id, "format": fmt, "tolerance": tolerance}
+    if fmt == "polyline":
+        payload["precision"] = precision
+        payload["rings"] = [encode_polyline(ring, precision) for ring in geometry["coordinates"]]
+    else:
+        payload["geometry"] = geometry
+
+    content = json.dumps(payload, separators=(",", ":")).encode()
+    return LookupBody(content, f'"{hashlib.sha1(content).hexdigest()[:16]}"')
+
+
+def city_boundary_body(city_id: int, tolerance: float, fmt: str, precision: int) -> LookupBody | None:
+    """
+    Simplified city polygon, serialized once per (city, tolerance, format,
+    precision) and lookup version. None when the city has no boundary.
+    """
+    key = (lookup_registry().version, city_id, tolerance, fmt, precision)
+    if key in _boundaries:
+        return _boundaries[key]
+
+    body = _load_boundary(city_id, tolerance, fmt, precision)
+    if len(_boundaries) >= BOUNDARY_CACHE_SIZE:
+        _boundaries.clear()
+    _boundaries[key] = body
+    return body
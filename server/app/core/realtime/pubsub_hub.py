@@ -0,0 +1,116 @@
+"""
+PubSub Hub - one asyncio Redis subscription per process
+
+WebSockets no longer open their own (blocking) pubsub. The hub holds a
+single async connection with pattern subscriptions and fans messages out
+to local sockets through in-memory queues, so delivery is push-based
+(no polling, no sleep loop) and idle sockets cost nothing.
+
+Usage:
+    queue = pubsub_hub.subscribe(channel)
+    message = await queue.get()
+    pubsub_hub.unsubscribe(channel, queue)
+"""
+
+import asyncio
+
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+
+LOCAL_QUEUE_SIZE = 100
+
+# Channel patterns this process listens to
+HUB_PATTERNS = [
+    "driver:trip_request:*",
+    "rider:trip:*",
+]
+
+
+def _pubsub_url() -> str:
+    # Pub/sub is cluster-wide / pinned to the first node in sharded mode
+    nodes = [u.strip() for u in settings.REDIS_NODES.split(",") if u.strip()]
+    if settings.REDIS_MODE in ("cluster", "sharded") and nodes:
+        return nodes[0]
+    return settings.REDIS_URL
+
+
+class PubSubHub:
+
+    def __init__(self, patterns: list[str]):
+        self._patterns = patterns
+        self._queues: dict[str, set[asyncio.Queue]] = {}
+        self._client: aioredis.Redis | None = None
+        self._pubsub = None
+        self._reader: asyncio.Task | None = None
+
+    # -------------------------------
+    # LIFECYCLE
+    # -------------------------------
+    async def start(self):
+        if self._reader:
+            return
+        self._client = aioredis.Redis.from_url(_pubsub_url(), decode_responses=True)
+        self._pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.psubscribe(*self._patterns)
+        self._reader = asyncio.create_task(self._read_loop())
+
+    async def stop(self):
+        if self._reader:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except asyncio.CancelledError:
+                pass
+            self._reader = None
+        if self._pubsub:
+            await self._pubsub.aclose()
+            self._pubsub = None
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
+    async def _read_loop(self):
+        while True:
+            try:
+                async for message in self._pubsub.listen():
+                    if message["type"] == "pmessage":
+                        self._dispatch(message["channel"], message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                print(f"[PUBSUB HUB] reader error, resubscribing: {exc}")
+                await asyncio.sleep(1)
+                try:
+                    await self._pubsub.psubscribe(*self._patterns)
+                except Exception:
+                    pass
+
+    def _dispatch(self, channel: str, data: str):
+        for queue in self._queues.get(channel, ()):
+            if queue.full():
+                # Slow socket: drop the oldest message rather than block the hub
+                queue.get_nowait()
+            queue.put_nowait(data)
+
+    # -------------------------------
+    # LOCAL SUBSCRIPTIONS
+    # -------------------------------
+    def subscribe(self, channel: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=LOCAL_QUEUE_SIZE)
+        self._queues.setdefault(channel, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, channel: str, queue: asyncio.Queue):
+        queues = self._queues.get(channel)
+        if not queues:
+            return
+        queues.discard(queue)
+        if not queues:
+            self._queues.pop(channel, None)
+
+    def local_subscribers(self) -> int:
+        return sum(len(q) for q in self._queues.values())
+
+
+pubsub_hub = PubSubHub(HUB_PATTERNS)
@@ -1,10 +1,298 @@
+"""
+Redis topology
+
+REDIS_MODE:
+- single  → one node from REDIS_URL (default, dev)
+- cluster → Redis Cluster, REDIS_NODES are startup nodes
+- sharded → plain nodes in REDIS_NODES, keys routed client-side by hash slot
+
+Keys that belong together carry a hash tag ({...}) so they land on the same
+slot in every mode. Per-city keys (GEO set, runtime, last-seen, GEO state)
+share the city tag, so per-city Lua scripts stay single-slot. Always build
+keys through the helpers below instead of f-strings in endpoints.
+
+async_redis_client is the same topology on redis.asyncio, for async def
+hot paths (rate limits, principals, status reads) so they do not take a
+threadpool slot per Redis call.
+"""
+
+import asyncio
+
 import redis
+import redis.asyncio as aioredis
+from redis.asyncio.cluster import RedisCluster as AsyncRedisCluster, ClusterNode as AsyncClusterNode
+from redis.cluster import RedisCluster, ClusterNode
+from redis.connection import parse_url
+from redis.crc import key_slot, REDIS_CLUSTER_HASH_SLOTS
+from redis.commands.core import AsyncScript, Script
+
 from app.core.config import settings
 
-redis_client = redis.Redis.from_url(
-    settings.REDIS_URL,
-    decode_responses=True
-)
+
+# -------------------------------
+# KEY BUILDERS (hash-tagged)
+# -------------------------------
+def city_tag(tenant_id: int, city_id: int) -> str:
+    return f"{{city:{tenant_id}:{city_id}}}"
+
+
+def driver_tag(driver_id: int) -> str:
+    return f"{{driver:{driver_id}}}"
+
+
+def geo_key(tenant_id: int, city_id: int) -> str:
+    return f"drivers:geo:{city_tag(tenant_id, city_id)}"
+
+
+def driver_geo_state_key(tenant_id: int, city_id: int, driver_id: int) -> str:
+    return f"driver:geo_state:{city_tag(tenant_id, city_id)}:{driver_id}"
+
+
+def driver_last_seen_key(tenant_id: int, city_id: int, driver_id: int) -> str:
+    return f"driver:last_seen:{city_tag(tenant_id, city_id)}:{driver_id}"
+
+
+def driver_runtime_key(tenant_id: int, city_id: int, driver_id: int) -> str:
+    return f"driver:runtime:{city_tag(tenant_id, city_id)}:{driver_id}"
+
+
+def driver_active_trip_key(tenant_id: int, city_id: int, driver_id: int) -> str:
+    return f"driver:active_trip:{city_tag(tenant_id, city_id)}:{driver_id}"
+
+
+def driver_location_key(driver_id: int) -> str:
+    return f"driver:location:{driver_tag(driver_id)}"
+
+
+def driver_offer_stream_key(driver_id: int) -> str:
+    return f"driver:offers:{driver_tag(driver_id)}"
+
+
+def driver_offer_stats_key(driver_id: int) -> str:
+    return f"driver:offer_stats:{driver_tag(driver_id)}"
+
+
+def trip_snapshot_key(trip_request_id: int) -> str:
+    return f"trip:snapshot:{{trip_request:{trip_request_id}}}"
+
+
+def trip_request_status_key(trip_request_id: int) -> str:
+    return f"trip:status:{{trip_request:{trip_request_id}}}"
+
+
+def trip_status_key(trip_id: int) -> str:
+    return f"trip:status:{{trip:{trip_id}}}"
+
+
+def rate_limit_key(route: str, scope: str, value) -> str:
+    # Tagged on the route: a request's buckets are charged by one script call
+    return f"ratelimit:{{{route}}}:{scope}:{value}"
+
+
+def dashboard_counters_key(scope: str, scope_id: int) -> str:
+    return f"dashboard:{{{scope}:{scope_id}}}"
+
+
+def principal_key(role: str, user_id: int) -> str:
+    return f"principal:{{user:{user_id}}}:{role}"
+
+
+def driver_channel(driver_id: int) -> str:
+    return f"driver:trip_request:{driver_id}"
+
+
+def rider_channel(trip_request_id: int) -> str:
+    return f"rider:trip:{trip_request_id}"
+
+
+# -------------------------------
+# CLIENT-SIDE SHARDING
+# -------------------------------
+class ShardedPipeline:
+    """
+    Non-transactional pipeline over several nodes.
+    Commands are buffered per node and results returned in call order.
+    """
+
+    def __init__(self, router: "ShardedRedis"):
+        self._router = router
+        self._calls: list[tuple[int, str, tuple, dict]] = []
+
+    def __getattr__(self, name):
+        def buffered(key, *args, **kwargs):
+            # Pub/sub is pinned to the first node (see ShardedRedis.publish)
+            node_idx = 0 if name == "publish" else self._router.node_index(key)
+            self._calls.append((node_idx, name, (key, *args), kwargs))
+            return self
+        return buffered
+
+    def _node_pipelines(self) -> tuple[dict, list[int]]:
+        pipes = {}
+        order = []
+        for node_idx, name, args, kwargs in self._calls:
+            pipe = pipes.get(node_idx)
+            if pipe is None:
+                pipe = self._router.nodes[node_idx].pipeline(transaction=False)
+                pipes[node_idx] = pipe
+            getattr(pipe, name)(*args, **kwargs)
+            order.append(node_idx)
+        self._calls = []
+        return pipes, order
+
+    def execute(self):
+        pipes, order = self._node_pipelines()
+        results = {idx: iter(pipe.execute()) for idx, pipe in pipes.items()}
+        return [next(results[idx]) for idx in order]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._calls = []
+
+
+class ShardedRedis:
+    """
+    Routes single-key commands to one of N plain Redis nodes using the
+    cluster hash slot of the key, so hash tags co-locate keys exactly as
+    they would in Redis Cluster. Multi-key commands must share a tag.
+    """
+
+    def __init__(self, nodes: list[redis.Redis]):
+        self.nodes = nodes
+
+    def node_index(self, key) -> int:
+        if isinstance(key, str):
+            key = key.encode()
+        return key_slot(key) * len(self.nodes) // REDIS_CLUSTER_HASH_SLOTS
+
+    def node_for(self, key) -> redis.Redis:
+        return self.nodes[self.node_index(key)]
+
+    def __getattr__(self, name):
+        def routed(key, *args, **kwargs):
+            return getattr(self.node_for(key), name)(key, *args, **kwargs)
+        return routed
+
+    def pipeline(self, transaction: bool = False) -> ShardedPipeline:
+        if transaction:
+            raise redis.RedisError("Transactions are not supported across shards")
+        return ShardedPipeline(self)
+
+    def get_encoder(self):
+        return self.nodes[0].get_encoder()
+
+    def register_script(self, script: str):
+        return Script(self, script)
+
+    def evalsha(self, sha, numkeys, *keys_and_args):
+        return self.node_for(keys_and_args[0]).evalsha(sha, numkeys, *keys_and_args)
+
+    def eval(self, script, numkeys, *keys_and_args):
+        return self.node_for(keys_and_args[0]).eval(script, numkeys, *keys_and_args)
+
+    def script_load(self, script):
+        shas = {node.script_load(script) for node in self.nodes}
+        return shas.pop()
+
+    def publish(self, channel, message):
+        # Pub/sub is global: always on the first node
+        return self.nodes[0].publish(channel, message)
+
+    def pubsub(self, **kwargs):
+        return self.nodes[0].pubsub(**kwargs)
+
+    def ping(self) -> bool:
+        return all(node.ping() for node in self.nodes)
+
+
+class AsyncShardedPipeline(ShardedPipeline):
+    """ShardedPipeline over redis.asyncio nodes; node pipelines run concurrently."""
+
+    async def execute(self):
+        pipes, order = self._node_pipelines()
+        executed = await asyncio.gather(*(pipe.execute() for pipe in pipes.values()))
+        results = {idx: iter(result) for idx, result in zip(pipes, executed)}
+        return [next(results[idx]) for idx in order]
+
+
+class AsyncShardedRedis(ShardedRedis):
+    """ShardedRedis over redis.asyncio nodes: routed commands return awaitables."""
+
+    def pipeline(self, transaction: bool = False) -> AsyncShardedPipeline:
+        if transaction:
+            raise redis.RedisError("Transactions are not supported across shards")
+        return AsyncShardedPipeline(self)
+
+    def register_script(self, script: str):
+        return AsyncScript(self, script)
+
+    async def script_load(self, script):
+        shas = set(await asyncio.gather(*(node.script_load(script) for node in self.nodes)))
+        return shas.pop()
+
+    async def ping(self) -> bool:
+        return all(await asyncio.gather(*(node.ping() for node in self.nodes)))
+
+    async def aclose(self):
+        await asyncio.gather(*(node.aclose() for node in self.nodes))
+
+
+# -------------------------------
+# FACTORY
+# -------------------------------
+def _node_urls() -> list[str]:
+    urls = [u.strip() for u in settings.REDIS_NODES.split(",") if u.strip()]
+    return urls or [settings.REDIS_URL]
+
+
+def build_redis_client():
+    mode = settings.REDIS_MODE
+
+    if mode == "cluster":
+        startup_nodes = []
+        for url in _node_urls():
+            parsed = parse_url(url)
+            startup_nodes.append(ClusterNode(parsed.get("host", "localhost"), parsed.get("port", 6379)))
+        return RedisCluster(startup_nodes=startup_nodes, decode_responses=True)
+
+    if mode == "sharded":
+        return ShardedRedis([
+            redis.Redis.from_url(url, decode_responses=True)
+            for url in _node_urls()
+        ])
+
+    return redis.Redis.from_url(
+        settings.REDIS_URL,
+        decode_responses=True
+    )
+
+
+def build_async_redis_client():
+    mode = settings.REDIS_MODE
+
+    if mode == "cluster":
+        startup_nodes = []
+        for url in _node_urls():
+            parsed = parse_url(url)
+            startup_nodes.append(AsyncClusterNode(parsed.get("host", "localhost"), parsed.get("port", 6379)))
+        return AsyncRedisCluster(startup_nodes=startup_nodes, decode_responses=True)
+
+    if mode == "sharded":
+        return AsyncShardedRedis([
+            aioredis.Redis.from_url(url, decode_responses=True)
+            for url in _node_urls()
+        ])
+
+    return aioredis.Redis.from_url(
+        settings.REDIS_URL,
+        decode_responses=True
+    )
+
+
+redis_client = build_redis_client()
+async_redis_client = build_async_redis_client()
+
 
 def check_redis_connection() -> bool:
     try:
@@ -12,5 +300,7 @@ def check_redis_connection() -> bool:
         return True
     except redis.RedisError:
         return False
-def get_redis() -> redis.Redis:
-    return redis_client
\ No newline at end of file
+
+
+def get_redis():
+    return redis_client
@@ -0,0 +1,262 @@
+"""
+Request Stats - per-request SQL / Redis counters with N+1 detection
+
+RequestStatsMiddleware opens a RequestStats for every HTTP request. SQL is
+counted through SQLAlchemy cursor events (all engines, sync and async);
+Redis through thin wrappers on the redis-py command / pipeline entry points
+(one pipeline = one round trip). At the end of the request:
+
+- dev (ENV=dev) responses carry X-SQL-Queries / X-SQL-Time-Ms /
+  X-Redis-Commands / X-Redis-Time-Ms / X-N-Plus-One headers
+- per-route histograms are updated (request_stats_report())
+- the same SQL shape executed >= N_PLUS_ONE_THRESHOLD times is logged
+
+Tests / scripts can enforce budgets:
+
+    with query_budget(max_queries=4, max_repeats=1):
+        client.get("/api/v1/driver/finances/past-trips", headers=...)
+"""
+
+import re
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+
+import redis
+from redis.cluster import RedisCluster, ClusterPipeline
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+MS_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+_PARAM_RE = re.compile(r"%\(\w+\)s|\$\d+|\?")
+_PARAM_LIST_RE = re.compile(r"\?(?:\s*,\s*\?)+")
+_SPACE_RE = re.compile(r"\s+")
+
+
+@dataclass
+class RequestStats:
+    sql_count: int = 0
+    sql_ms: float = 0.0
+    redis_count: int = 0
+    redis_ms: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+
+    def repeated_shapes(self, threshold: int) -> dict[str, int]:
+        return {shape: n for shape, n in self.shapes.items() if n >= threshold}
+
+
+_current: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def current_stats() -> RequestStats | None:
+    return _current.get()
+
+
+def statement_shape(statement: str) -> str:
+    """Statement text with bind params (and IN lists) collapsed to `?`."""
+    shape = _PARAM_RE.sub("?", statement)
+    shape = _PARAM_LIST_RE.sub("?", shape)
+    return _SPACE_RE.sub(" ", shape).strip()
+
+
+# -------------------------------
+# SQL HOOKS
+# -------------------------------
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info["request_stats_started"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = conn.info.pop("request_stats_started", None)
+    if stats is None or started is None:
+        return
+    stats.sql_count += 1
+    stats.sql_ms += (time.perf_counter() - started) * 1000
+    stats.shapes[statement_shape(statement)] += 1
+
+
+# -------------------------------
+# REDIS HOOKS
+# -------------------------------
+def _timed(method, commands_of):
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        stats = _current.get()
+        if stats is None:
+            return method(self, *args, **kwargs)
+        commands = commands_of(self)
+        started = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            stats.redis_count += commands
+            stats.redis_ms += (time.perf_counter() - started) * 1000
+    wrapper._request_stats = True
+    return wrapper
+
+
+def _install_redis_hooks():
+    targets = [
+        (redis.Redis, "execute_command", lambda client: 1),
+        (RedisCluster, "execute_command", lambda client: 1),
+        (redis.client.Pipeline, "execute", lambda pipe: len(getattr(pipe, "command_stack", ()))),
+        (ClusterPipeline, "execute", lambda pipe: len(getattr(pipe, "command_stack", ()))),
+    ]
+    for cls, name, commands_of in targets:
+        method = cls.__dict__.get(name)
+        if method is None or getattr(method, "_request_stats", False):
+            continue
+        setattr(cls, name, _timed(method, commands_of))
+
+
+def install_hooks():
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    _install_redis_hooks()
+
+
+# -------------------------------
+# PER-ROUTE HISTOGRAMS (process-local)
+# -------------------------------
+_routes: dict[str, dict] = {}
+_budgets: list[RequestStats] = []
+
+
+def _histogram(buckets) -> dict:
+    return {"buckets": list(buckets) + ["+Inf"], "counts": [0] * (len(buckets) + 1), "sum": 0.0}
+
+
+def _observe(hist: dict, buckets, value: float):
+    hist["counts"][bisect_left(buckets, value)] += 1
+    hist["sum"] += value
+
+
+def record_request(route: str, stats: RequestStats) -> dict[str, int]:
+    """Fold a finished request into the route histograms. Returns N+1 shapes."""
+    entry = _routes.get(route)
+    if entry is None:
+        entry = _routes[route] = {
+            "requests": 0,
+            "n_plus_one_requests": 0,
+            "sql_queries": _histogram(COUNT_BUCKETS),
+            "sql_ms": _histogram(MS_BUCKETS),
+            "redis_commands": _histogram(COUNT_BUCKETS),
+            "redis_ms": _histogram(MS_BUCKETS),
+        }
+
+    entry["requests"] += 1
+    _observe(entry["sql_queries"], COUNT_BUCKETS, stats.sql_count)
+    _observe(entry["sql_ms"], MS_BUCKETS, stats.sql_ms)
+    _observe(entry["redis_commands"], COUNT_BUCKETS, stats.redis_count)
+    _observe(entry["redis_ms"], MS_BUCKETS, stats.redis_ms)
+
+    repeated = stats.repeated_shapes(settings.N_PLUS_ONE_THRESHOLD)
+    if repeated:
+        entry["n_plus_one_requests"] += 1
+        for shape, n in repeated.items():
+            print(f"[N+1] {route} x{n}: {shape[:200]}")
+
+    for budget in _budgets:
+        budget.sql_count += stats.sql_count
+        budget.sql_ms += stats.sql_ms
+        budget.redis_count += stats.redis_count
+        budget.redis_ms += stats.redis_ms
+        budget.shapes.update(stats.shapes)
+
+    return repeated
+
+
+def request_stats_report() -> dict:
+    return _routes
+
+
+def reset_request_stats() -> None:
+    _routes.clear()
+
+
+# -------------------------------
+# MIDDLEWARE
+# -------------------------------
+class RequestStatsMiddleware:
+
+    def __init__(self, app):
+        self.app = app
+        install_hooks()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        add_headers = settings.ENV == "dev"
+
+        async def send_with_stats(message):
+            if add_headers and message["type"] == "http.response.start":
+                repeated = stats.repeated_shapes(settings.N_PLUS_ONE_THRESHOLD)
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-sql-queries", str(stats.sql_count).encode()),
+                    (b"x-sql-time-ms", f"{stats.sql_ms:.2f}".encode()),
+                    (b"x-redis-commands", str(stats.redis_count).encode()),
+                    (b"x-redis-time-ms", f"{stats.redis_ms:.2f}".encode()),
+                    (b"x-n-plus-one", str(len(repeated)).encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            _current.reset(token)
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "<unmatched>"
+            record_request(f"{scope['method']} {path}", stats)
+
+
+# -------------------------------
+# BUDGET ASSERTIONS (tests / scripts)
+# -------------------------------
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def query_budget(max_queries: int, max_repeats: int | None = None):
+    """
+    Collects SQL of everything inside the block (direct calls and requests
+    served meanwhile) and raises QueryBudgetExceeded when more than
+    `max_queries` statements ran or one statement shape ran more than
+    `max_repeats` times.
+    """
+    install_hooks()
+    budget = RequestStats()
+    _budgets.append(budget)
+    token = _current.set(budget) if _current.get() is None else None
+    try:
+        yield budget
+    finally:
+        _budgets.remove(budget)
+        if token is not None:
+            _current.reset(token)
+
+    if budget.sql_count > max_queries:
+        raise QueryBudgetExceeded(
+            f"{budget.sql_count} SQL statements, budget is {max_queries}"
+        )
+    if max_repeats is not None:
+        repeated = budget.repeated_shapes(max_repeats + 1)
+        if repeated:
+            shape, n = max(repeated.items(), key=lambda item: item[1])
+            raise QueryBudgetExceeded(
+                f"statement repeated {n}x (max {max_repeats}): {shape[:200]}"
+            )
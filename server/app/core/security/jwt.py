@@ -1,3 +1,7 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -6,6 +10,34 @@ from app.core.config import settings
 
 # 🔐 Simple Bearer scheme (Swagger-friendly)
 bearer_scheme = HTTPBearer()
+
+
+# --------------------------------------------------
+# KEYS (HS256 shared secret or ES256 / RS256 key pair)
+# --------------------------------------------------
+def _read_key(path: str) -> str | None:
+    if not path:
+        return None
+    with open(path) as f:
+        return f.read()
+
+
+def _load_keys() -> tuple[str | None, str]:
+    """Returns (signing_key, verify_key)."""
+    if settings.JWT_ALGORITHM.startswith("HS"):
+        if not settings.JWT_SECRET_KEY:
+            raise RuntimeError("JWT_SECRET_KEY is required for HS* algorithms")
+        return settings.JWT_SECRET_KEY, settings.JWT_SECRET_KEY
+
+    public_key = _read_key(settings.JWT_PUBLIC_KEY_PATH)
+    if not public_key:
+        raise RuntimeError(f"JWT_PUBLIC_KEY_PATH is required for {settings.JWT_ALGORITHM}")
+    return _read_key(settings.JWT_PRIVATE_KEY_PATH), public_key
+
+
+_SIGNING_KEY, _VERIFY_KEY = _load_keys()
+
+
 def create_access_token(
     *,
     user_id: int,
@@ -15,6 +47,9 @@ def create_access_token(
     driver_id: int | None = None,
     fleet_owner_id: int | None = None,
 ):
+    if not _SIGNING_KEY:
+        raise RuntimeError("This node has no JWT signing key (verify-only)")
+
     payload = {
         "sub": str(user_id),
         "role": role,
@@ -36,33 +71,70 @@ def create_access_token(
 
     return jwt.encode(
         payload,
-        settings.JWT_SECRET_KEY,
+        _SIGNING_KEY,
         algorithm=settings.JWT_ALGORITHM,
     )
 
 
+# --------------------------------------------------
+# VERIFIED TOKEN CACHE (LRU, honours exp)
+# --------------------------------------------------
+_verified: "OrderedDict[bytes, tuple[float, dict]]" = OrderedDict()
+_verified_lock = threading.Lock()
+
+
+def _cache_get(digest: bytes) -> dict | None:
+    with _verified_lock:
+        entry = _verified.get(digest)
+        if not entry:
+            return None
+        if entry[0] <= time.time():
+            # Expired: let the full decode produce the 401
+            del _verified[digest]
+            return None
+        _verified.move_to_end(digest)
+        return entry[1]
+
+
+def _cache_put(digest: bytes, payload: dict) -> None:
+    with _verified_lock:
+        _verified[digest] = (float(payload["exp"]), payload)
+        _verified.move_to_end(digest)
+        while len(_verified) > settings.JWT_VERIFY_CACHE_SIZE:
+            _verified.popitem(last=False)
+
+
 # --------------------------------------------------
 # INTERNAL DECODE (shared)
 # --------------------------------------------------
 def _decode_token(token: str) -> dict:
+    use_cache = settings.JWT_VERIFY_CACHE_SIZE > 0
+    if use_cache:
+        digest = hashlib.sha256(token.encode()).digest()
+        payload = _cache_get(digest)
+        if payload:
+            return dict(payload)
+
     try:
         payload = jwt.decode(
             token,
-            settings.JWT_SECRET_KEY,
+            _VERIFY_KEY,
             algorithms=[settings.JWT_ALGORITHM],
         )
 
         if payload.get("type") != "access":
             raise HTTPException(status_code=401, detail="Invalid token type")
 
-        return payload
-
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+    if use_cache and "exp" in payload:
+        _cache_put(digest, payload)
+    return dict(payload)
 def verify_access_token(
     credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
 ) -> dict:
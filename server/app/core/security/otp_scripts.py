@@ -0,0 +1,79 @@
+"""
+OTP Scripts - atomic store / verify in one Redis round trip
+
+Keys passed to a script must share a hash tag (same slot):
+KEYS[1] = OTP hash, KEYS[2] = attempt counter, KEYS[3] = optional extra
+key written on store (e.g. the dev plaintext OTP).
+
+Verify counts the attempt *before* comparing, inside the script, so
+concurrent guesses cannot race past MAX attempts: attempt N > max burns
+the OTP, a match consumes it.
+"""
+
+from app.core.redis import redis_client
+
+VERIFY_OK = 1
+VERIFY_MISMATCH = 0
+VERIFY_MISSING = -1
+VERIFY_LOCKED = -2
+
+_STORE_OTP = redis_client.register_script("""
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+redis.call('SET', KEYS[2], 0, 'EX', ARGV[2])
+if KEYS[3] then
+    redis.call('SET', KEYS[3], ARGV[3], 'EX', ARGV[2])
+end
+return 1
+""")
+
+_VERIFY_OTP = redis_client.register_script("""
+local stored = redis.call('GET', KEYS[1])
+if not stored then
+    return -1
+end
+
+local attempts = redis.call('INCR', KEYS[2])
+if attempts == 1 then
+    local ttl = redis.call('PTTL', KEYS[1])
+    if ttl > 0 then
+        redis.call('PEXPIRE', KEYS[2], ttl)
+    end
+end
+
+if attempts > tonumber(ARGV[2]) then
+    redis.call('DEL', KEYS[1], KEYS[2])
+    return -2
+end
+
+if stored == ARGV[1] then
+    redis.call('DEL', KEYS[1], KEYS[2])
+    return 1
+end
+return 0
+""")
+
+
+def store_otp_hash(
+    otp_key: str,
+    attempts_key: str,
+    otp_hash: str,
+    ttl_seconds: int,
+    extra_key: str | None = None,
+    extra_value: str | None = None,
+) -> None:
+    keys = [otp_key, attempts_key]
+    args = [otp_hash, ttl_seconds]
+    if extra_key:
+        keys.append(extra_key)
+        args.append(extra_value)
+    _STORE_OTP(keys=keys, args=args)
+
+
+def verify_otp_hash(
+    otp_key: str,
+    attempts_key: str,
+    otp_hash: str,
+    max_attempts: int,
+) -> int:
+    """Returns VERIFY_OK | VERIFY_MISMATCH | VERIFY_MISSING | VERIFY_LOCKED."""
+    return int(_VERIFY_OTP(keys=[otp_key, attempts_key], args=[otp_hash, max_attempts]))
@@ -0,0 +1,162 @@
+"""
+Principal Cache - identity for hot-path guards without a DB query
+
+Guards used to load the User / Driver / FleetOwner row on every request.
+The *_principal dependencies in roles.py resolve an immutable Principal
+instead, cached per (role, user_id):
+
+- in-process front, PRINCIPAL_LOCAL_TTL_SECONDS (bounds cross-worker staleness)
+- Redis, PRINCIPAL_CACHE_TTL_SECONDS (shared by all workers)
+
+The *_async variants read and write Redis on the async client, for
+dependencies of async def endpoints.
+
+invalidate_principal() must be called wherever the cached fields or the
+eligibility behind them change (approval, onboarding, role switch,
+deactivation). Only positive results are cached.
+"""
+
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.redis import async_redis_client, redis_client, principal_key
+
+LOCAL_MAX_ENTRIES = 10_000
+PRINCIPAL_ROLES = ("rider", "driver", "fleet-owner")
+
+_local: "OrderedDict[tuple[str, int], tuple[float, Principal]]" = OrderedDict()
+_stats = {
+    "local_hits": 0,
+    "redis_hits": 0,
+    "misses": 0,
+    "invalidations": 0,
+}
+
+
+@dataclass(frozen=True)
+class Principal:
+    user_id: int
+    role: str
+    driver_id: int | None = None
+    driver_type: str | None = None
+    fleet_owner_id: int | None = None
+    tenant_id: int | None = None
+    city_id: int | None = None
+
+    # Full ORM rows, loaded on demand by endpoints that need them
+    def load_user(self, db: Session):
+        from app.models.core.users.users import User
+        return db.get(User, self.user_id)
+
+    def load_driver(self, db: Session):
+        from app.models.core.drivers.drivers import Driver
+        return db.get(Driver, self.driver_id) if self.driver_id else None
+
+    def load_fleet_owner(self, db: Session):
+        from app.models.core.fleet_owners.fleet_owners import FleetOwner
+        return db.get(FleetOwner, self.fleet_owner_id) if self.fleet_owner_id else None
+
+
+def _local_hit(role: str, user_id: int) -> Principal | None:
+    entry = _local.get((role, user_id))
+    if entry and entry[0] > time.monotonic():
+        _stats["local_hits"] += 1
+        return entry[1]
+    return None
+
+
+def _from_redis(raw: str | None) -> Principal | None:
+    if not raw:
+        _stats["misses"] += 1
+        return None
+
+    _stats["redis_hits"] += 1
+    principal = Principal(**json.loads(raw))
+    _remember(principal, time.monotonic())
+    return principal
+
+
+def get_cached_principal(role: str, user_id: int) -> Principal | None:
+    principal = _local_hit(role, user_id)
+    if principal:
+        return principal
+
+    try:
+        raw = redis_client.get(principal_key(role, user_id))
+    except Exception as exc:
+        print(f"[PRINCIPAL CACHE] read failed role={role} user_id={user_id}: {exc}")
+        raw = None
+    return _from_redis(raw)
+
+
+async def get_cached_principal_async(role: str, user_id: int) -> Principal | None:
+    principal = _local_hit(role, user_id)
+    if principal:
+        return principal
+
+    try:
+        raw = await async_redis_client.get(principal_key(role, user_id))
+    except Exception as exc:
+        print(f"[PRINCIPAL CACHE] read failed role={role} user_id={user_id}: {exc}")
+        raw = None
+    return _from_redis(raw)
+
+
+def cache_principal(principal: Principal) -> Principal:
+    try:
+        redis_client.setex(
+            principal_key(principal.role, principal.user_id),
+            settings.PRINCIPAL_CACHE_TTL_SECONDS,
+            json.dumps(asdict(principal)),
+        )
+    except Exception as exc:
+        print(f"[PRINCIPAL CACHE] write failed user_id={principal.user_id}: {exc}")
+    _remember(principal, time.monotonic())
+    return principal
+
+
+async def cache_principal_async(principal: Principal) -> Principal:
+    try:
+        await async_redis_client.set(
+            principal_key(principal.role, principal.user_id),
+            json.dumps(asdict(principal)),
+            ex=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+        )
+    except Exception as exc:
+        print(f"[PRINCIPAL CACHE] write failed user_id={principal.user_id}: {exc}")
+    _remember(principal, time.monotonic())
+    return principal
+
+
+def invalidate_principal(user_id: int, role: str | None = None) -> None:
+    roles = (role,) if role else PRINCIPAL_ROLES
+    for r in roles:
+        _local.pop((r, user_id), None)
+    try:
+        redis_client.delete(*[principal_key(r, user_id) for r in roles])
+    except Exception as exc:
+        print(f"[PRINCIPAL CACHE] invalidate failed user_id={user_id}: {exc}")
+    _stats["invalidations"] += 1
+
+
+def principal_cache_stats() -> dict:
+    lookups = _stats["local_hits"] + _stats["redis_hits"] + _stats["misses"]
+    hits = _stats["local_hits"] + _stats["redis_hits"]
+    return {
+        **_stats,
+        "local_entries": len(_local),
+        "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+    }
+
+
+def _remember(principal: Principal, now: float) -> None:
+    key = (principal.role, principal.user_id)
+    _local[key] = (now + settings.PRINCIPAL_LOCAL_TTL_SECONDS, principal)
+    _local.move_to_end(key)
+    while len(_local) > LOCAL_MAX_ENTRIES:
+        _local.popitem(last=False)
@@ -0,0 +1,223 @@
+"""
+Rate Limit - Redis token buckets as a FastAPI dependency
+
+    @router.post("/otp/request", dependencies=[Depends(rate_limit("otp_request", "phone", "ip"))])
+
+Each (route, scope, value) has a bucket of `capacity` tokens refilled
+evenly over `window_seconds`. A route's buckets share its hash tag, so one
+Lua call checks every bucket of the request and charges them only if all
+have a token: a rejected request is not charged and never reaches Postgres.
+
+Scopes:
+- ip     → client address; X-Forwarded-For only when the peer is one of
+           RATE_LIMIT_TRUSTED_PROXIES
+- user   → `sub` of the bearer token
+- tenant → tenant of the token / cached driver principal
+- phone  → normalized `phone_e164` from the JSON body
+
+Scopes whose value cannot be resolved are skipped. Redis errors fail open.
+Runs on the event loop (async Redis client): no threadpool hop per request.
+"""
+
+import ipaddress
+import math
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+
+from fastapi import HTTPException, Request
+
+from app.core.config import settings
+from app.core.redis import async_redis_client, rate_limit_key
+from app.core.utils.phone import normalize_phone
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    capacity: int
+    window_seconds: int
+
+    @property
+    def tokens_per_ms(self) -> float:
+        return self.capacity / (self.window_seconds * 1000)
+
+
+# route → scope → policy
+DEFAULT_POLICIES: dict[str, dict[str, RateLimitPolicy]] = {
+    "otp_request": {
+        "phone": RateLimitPolicy(3, 60),
+        "ip": RateLimitPolicy(20, 60),
+    },
+    "otp_verify": {
+        "phone": RateLimitPolicy(10, 300),
+        "ip": RateLimitPolicy(60, 60),
+    },
+    "trip_otp_verify": {
+        "user": RateLimitPolicy(10, 60),
+    },
+    # Per driver only: a tenant-wide cap would scale with fleet size
+    "driver_location": {
+        "user": RateLimitPolicy(60, 60),
+    },
+    "trip_status": {
+        "user": RateLimitPolicy(120, 60),
+        "ip": RateLimitPolicy(600, 60),
+    },
+}
+
+# KEYS = buckets; ARGV = now, then capacity, rate per bucket.
+# All-or-nothing: returns the longest retry in ms, or 0 once all are charged.
+_TAKE = async_redis_client.register_script("""
+local now = tonumber(ARGV[1])
+local tokens = {}
+local retry = 0
+
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[i * 2])
+    local rate = tonumber(ARGV[i * 2 + 1])
+    local bucket = redis.call('HMGET', key, 't', 'ts')
+    local t = tonumber(bucket[1]) or capacity
+    local ts = tonumber(bucket[2]) or now
+    t = math.min(capacity, t + math.max(0, now - ts) * rate)
+    if t < 1 then
+        retry = math.max(retry, math.ceil((1 - t) / rate))
+    end
+    tokens[i] = t
+end
+
+if retry > 0 then
+    return retry
+end
+
+for i, key in ipairs(KEYS) do
+    redis.call('HSET', key, 't', tokens[i] - 1, 'ts', now)
+    redis.call('PEXPIRE', key, math.ceil(tonumber(ARGV[i * 2]) / tonumber(ARGV[i * 2 + 1])))
+end
+return 0
+""")
+
+
+def get_policy(route: str, scope: str) -> RateLimitPolicy | None:
+    override = settings.RATE_LIMIT_OVERRIDES.get(route, {}).get(scope)
+    if override:
+        return RateLimitPolicy(int(override[0]), int(override[1]))
+    return DEFAULT_POLICIES.get(route, {}).get(scope)
+
+
+async def take_tokens(route: str, scoped_values: dict[str, object]) -> int:
+    """Charge one token from every bucket. Returns 0 or retry-after in ms."""
+    keys, args = [], [int(time.time() * 1000)]
+    for scope, value in scoped_values.items():
+        policy = get_policy(route, scope)
+        if policy is None or value in (None, ""):
+            continue
+        keys.append(rate_limit_key(route, scope, value))
+        args.extend([policy.capacity, policy.tokens_per_ms])
+
+    if not keys:
+        return 0
+    return int(await _TAKE(keys=keys, args=args))
+
+
+# -------------------------------
+# SCOPE RESOLUTION
+# -------------------------------
+@lru_cache
+def _trusted_proxies(proxies: tuple[str, ...]) -> tuple:
+    return tuple(ipaddress.ip_network(proxy, strict=False) for proxy in proxies)
+
+
+def _is_trusted(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in _trusted_proxies(tuple(settings.RATE_LIMIT_TRUSTED_PROXIES)))
+
+
+def client_ip(request: Request) -> str | None:
+    """
+    Peer address, or behind trusted proxies the right-most X-Forwarded-For
+    entry that is not one of them (entries left of it are client-supplied).
+    """
+    peer = request.client.host if request.client else None
+    if not peer or not _is_trusted(peer):
+        return peer
+
+    forwarded = [
+        hop.strip()
+        for header in request.headers.getlist("x-forwarded-for")
+        for hop in header.split(",")
+        if hop.strip()
+    ]
+    for hop in reversed(forwarded):
+        if not _is_trusted(hop):
+            return hop
+    return forwarded[0] if forwarded else peer
+
+
+def _token_payload(request: Request) -> dict | None:
+    from app.core.security.jwt import _decode_token
+
+    auth = request.headers.get("authorization", "")
+    if not auth.lower().startswith("bearer "):
+        return None
+    try:
+        return _decode_token(auth[7:])
+    except HTTPException:
+        return None
+
+
+async def _tenant_of(payload: dict | None):
+    if not payload:
+        return None
+    if payload.get("tenant_id"):
+        return payload["tenant_id"]
+
+    from app.core.security.principal_cache import get_cached_principal_async
+    principal = await get_cached_principal_async(payload.get("role", ""), int(payload["sub"]))
+    return principal.tenant_id if principal else None
+
+
+async def _phone_of(request: Request) -> str | None:
+    try:
+        body = await request.json()
+        return normalize_phone(body["phone_e164"])
+    except Exception:
+        return None
+
+
+def rate_limit(route: str, *scopes: str):
+    """Dependency factory: rate_limit("<route>", "user", "ip", ...)."""
+
+    async def dependency(request: Request):
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+
+        values: dict[str, object] = {}
+        payload = _token_payload(request) if {"user", "tenant"} & set(scopes) else None
+
+        for scope in scopes:
+            if scope == "ip":
+                values["ip"] = client_ip(request)
+            elif scope == "user":
+                values["user"] = payload.get("sub") if payload else None
+            elif scope == "tenant":
+                values["tenant"] = await _tenant_of(payload)
+            elif scope == "phone":
+                values["phone"] = await _phone_of(request)
+
+        try:
+            retry_ms = await take_tokens(route, values)
+        except Exception as exc:
+            print(f"[RATE LIMIT] check failed route={route}: {exc}")
+            return
+
+        if retry_ms:
+            raise HTTPException(
+                status_code=429,
+                detail="Too many requests, please retry later",
+                headers={"Retry-After": str(math.ceil(retry_ms / 1000))},
+            )
+
+    return dependency
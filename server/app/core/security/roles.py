@@ -1,12 +1,21 @@
 from fastapi import Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.dependencies import get_db
+from app.core.dependencies import get_async_db, get_db
 from app.core.security.jwt import verify_access_token
 from app.models.core.users.users import User
 from app.models.core.drivers.drivers import Driver
 from app.models.core.fleet_owners.fleet_owners import FleetOwner
 from app.models.core.tenants.tenant_staff import TenantStaff
+from app.core.security.principal_cache import (
+    Principal,
+    get_cached_principal,
+    get_cached_principal_async,
+    cache_principal,
+    cache_principal_async,
+)
 
 # -------------------------------
 # GUARDS
@@ -182,6 +191,83 @@ def get_or_create_fleet_owner(
 
 
 
+# -------------------------------
+# CACHED PRINCIPALS (hot paths)
+# -------------------------------
+# rider / driver resolve on the event loop: a cache hit is Redis only, a miss
+# queries through the request's (lazy) async session.
+async def rider_principal(
+    db: AsyncSession = Depends(get_async_db),
+    user: dict = Depends(verify_access_token),
+) -> Principal:
+    """Cached require_rider: immutable Principal, no ORM row."""
+    if user.get("role") != "rider":
+        raise HTTPException(403, "Rider access required")
+
+    principal = await get_cached_principal_async("rider", int(user.get("sub")))
+    if principal:
+        return principal
+
+    rider_id = await db.scalar(
+        select(User.user_id)
+        .where(
+            User.user_id == int(user.get("sub")),
+            User.is_active.is_(True),
+        )
+        .limit(1)
+    )
+    if not rider_id:
+        raise HTTPException(403, "Rider not active")
+
+    return await cache_principal_async(Principal(user_id=rider_id, role="rider"))
+
+
+async def driver_principal(
+    db: AsyncSession = Depends(get_async_db),
+    user: dict = Depends(verify_access_token),
+) -> Principal:
+    """Cached require_driver: immutable Principal, no ORM row."""
+    principal = await get_cached_principal_async("driver", int(user.get("sub")))
+    if principal:
+        return principal
+
+    driver = await db.scalar(
+        select(Driver).where(Driver.user_id == int(user.get("sub"))).limit(1)
+    )
+    if not driver:
+        raise HTTPException(403, "Driver record not found. Please select a tenant first.")
+
+    return await cache_principal_async(Principal(
+        user_id=driver.user_id,
+        role="driver",
+        driver_id=driver.driver_id,
+        driver_type=driver.driver_type,
+        tenant_id=driver.tenant_id,
+        city_id=driver.city_id,
+    ))
+
+
+def fleet_owner_principal(
+    db: Session = Depends(get_db),
+    user: dict = Depends(verify_access_token),
+) -> Principal:
+    """Cached require_fleet_owner: immutable Principal, no ORM row."""
+    if user["role"] != "fleet-owner":
+        raise HTTPException(403, "Fleet owner access required")
+
+    principal = get_cached_principal("fleet-owner", int(user.get("sub")))
+    if principal and principal.fleet_owner_id == user.get("fleet_owner_id"):
+        return principal
+
+    fleet = require_fleet_owner(db, user)
+    return cache_principal(Principal(
+        user_id=fleet.user_id,
+        role="fleet-owner",
+        fleet_owner_id=fleet.fleet_owner_id,
+        tenant_id=fleet.tenant_id,
+    ))
+
+
 def require_tenant_admin(
     user: dict = Depends(verify_access_token),
 ):
@@ -0,0 +1,201 @@
+"""
+Offer Stream - durable driver offer delivery
+
+Offers used to be a bare PUBLISH: a driver whose socket dropped for a second
+never saw the offer and the batch waited out its full timeout. Each offer is
+now XADDed to a per-driver stream and the pub/sub message is only a doorbell:
+
+- the driver socket claims new offers with XREADGROUP, the app acks them
+- on reconnect, delivered-but-unacked (PEL) and missed offers are replayed
+- entries older than the batch timeout are trimmed (MINID); expired entries
+  still pending are acked and skipped on replay
+- delivered / acked latencies are recorded per driver, measured from the
+  stream entry id (ms timestamp)
+- drivers with OFFER_UNREACHABLE_AFTER offers in a row without an ack, a
+  response or a /trip-requests poll are reported by unreachable_drivers()
+  so dispatch can skip them
+- the stream key (and its consumer group) expires when idle; the group is
+  recreated on NOGROUP, so a long-lived socket keeps reading
+"""
+
+import json
+import time
+
+from redis.exceptions import ResponseError
+
+from app.core.redis import (
+    redis_client,
+    driver_channel,
+    driver_offer_stream_key,
+    driver_offer_stats_key,
+)
+
+OFFER_GROUP = "driver-app"
+OFFER_CONSUMER = "ws"
+OFFER_READ_COUNT = 20
+OFFER_KEY_TTL_SECONDS = 10 * 60
+OFFER_UNREACHABLE_AFTER = 3
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def _entry_ms(offer_id: str) -> int:
+    return int(offer_id.split("-")[0])
+
+
+# -------------------------------
+# DISPATCH SIDE
+# -------------------------------
+def publish_offers(
+    driver_ids: list[int],
+    trip_request_id: int,
+    batch_id: int,
+    timeout_seconds: int,
+) -> None:
+    now_ms = _now_ms()
+    fields = {
+        "trip_request_id": trip_request_id,
+        "batch_id": batch_id,
+        "expires_ms": now_ms + timeout_seconds * 1000,
+    }
+    doorbell = json.dumps({"trip_request_id": trip_request_id, "batch_id": batch_id})
+
+    pipe = redis_client.pipeline(transaction=False)
+    for driver_id in driver_ids:
+        stream_key = driver_offer_stream_key(driver_id)
+        stats_key = driver_offer_stats_key(driver_id)
+
+        # Trim offers whose batch window is already over
+        pipe.xadd(stream_key, fields, minid=now_ms - timeout_seconds * 1000, approximate=False)
+        pipe.expire(stream_key, OFFER_KEY_TTL_SECONDS)
+
+        pipe.hincrby(stats_key, "sent", 1)
+        pipe.hincrby(stats_key, "unacked_streak", 1)
+        pipe.expire(stats_key, OFFER_KEY_TTL_SECONDS)
+
+        pipe.publish(driver_channel(driver_id), doorbell)
+    pipe.execute()
+
+
+def unreachable_drivers(driver_ids: list[int]) -> set[int]:
+    if not driver_ids:
+        return set()
+
+    pipe = redis_client.pipeline(transaction=False)
+    for driver_id in driver_ids:
+        pipe.hget(driver_offer_stats_key(driver_id), "unacked_streak")
+    streaks = pipe.execute()
+
+    return {
+        driver_id
+        for driver_id, streak in zip(driver_ids, streaks)
+        if streak and int(streak) >= OFFER_UNREACHABLE_AFTER
+    }
+
+
+def mark_driver_reachable(driver_id: int) -> None:
+    """
+    A driver responding to an offer, or polling /trip-requests (which lists
+    every pending offer), proves the offers reached them.
+    """
+    try:
+        redis_client.hset(driver_offer_stats_key(driver_id), "unacked_streak", 0)
+    except Exception as exc:
+        print(f"[OFFER STREAM] mark reachable failed driver_id={driver_id}: {exc}")
+
+
+# -------------------------------
+# DRIVER SOCKET SIDE
+# -------------------------------
+def ensure_offer_group(driver_id: int) -> None:
+    try:
+        redis_client.xgroup_create(
+            driver_offer_stream_key(driver_id), OFFER_GROUP, id="0", mkstream=True
+        )
+    except ResponseError as exc:
+        if "BUSYGROUP" not in str(exc):
+            raise
+
+
+def _read_group(driver_id: int, cursor: str):
+    stream_key = driver_offer_stream_key(driver_id)
+    try:
+        return redis_client.xreadgroup(
+            OFFER_GROUP, OFFER_CONSUMER, {stream_key: cursor}, count=OFFER_READ_COUNT
+        )
+    except ResponseError as exc:
+        if "NOGROUP" not in str(exc):
+            raise
+        # The idle stream expired with its group and a later XADD recreated
+        # it bare; the group reads it again from the start
+        ensure_offer_group(driver_id)
+        return redis_client.xreadgroup(
+            OFFER_GROUP, OFFER_CONSUMER, {stream_key: cursor}, count=OFFER_READ_COUNT
+        )
+
+
+def read_offers(driver_id: int, replay: bool = False) -> list[dict]:
+    """
+    Claim offers for the driver's socket.
+
+    replay=True (on connect) first returns offers delivered earlier but never
+    acked, then anything published while the driver was disconnected.
+    """
+    stream_key = driver_offer_stream_key(driver_id)
+    if replay:
+        ensure_offer_group(driver_id)
+
+    now_ms = _now_ms()
+    offers, expired = [], []
+    delivered_ms = []
+
+    for cursor in (["0", ">"] if replay else [">"]):
+        response = _read_group(driver_id, cursor)
+        for _stream, entries in response or []:
+            for offer_id, fields in entries:
+                # Trimmed entries come back without fields
+                if not fields or int(fields["expires_ms"]) <= now_ms:
+                    expired.append(offer_id)
+                    continue
+                if cursor == ">":
+                    delivered_ms.append(now_ms - _entry_ms(offer_id))
+                offers.append({
+                    "offer_id": offer_id,
+                    "trip_request_id": int(fields["trip_request_id"]),
+                    "batch_id": int(fields["batch_id"]),
+                    "expires_ms": int(fields["expires_ms"]),
+                    "replayed": cursor == "0",
+                })
+
+    if expired or delivered_ms:
+        stats_key = driver_offer_stats_key(driver_id)
+        pipe = redis_client.pipeline(transaction=False)
+        if expired:
+            pipe.xack(stream_key, OFFER_GROUP, *expired)
+            pipe.hincrby(stats_key, "expired_undelivered", len(expired))
+        if delivered_ms:
+            pipe.hincrby(stats_key, "delivered", len(delivered_ms))
+            pipe.hincrby(stats_key, "delivered_ms_sum", sum(delivered_ms))
+        pipe.execute()
+
+    return offers
+
+
+def ack_offer(driver_id: int, offer_id: str) -> bool:
+    try:
+        sent_ms = _entry_ms(offer_id)
+    except ValueError:
+        return False
+
+    if not redis_client.xack(driver_offer_stream_key(driver_id), OFFER_GROUP, offer_id):
+        return False
+
+    stats_key = driver_offer_stats_key(driver_id)
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.hincrby(stats_key, "acked", 1)
+    pipe.hincrby(stats_key, "acked_ms_sum", max(_now_ms() - sent_ms, 0))
+    pipe.hset(stats_key, "unacked_streak", 0)
+    pipe.execute()
+    return True
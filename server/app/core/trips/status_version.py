@@ -0,0 +1,86 @@
+"""
+Status Version - conditional GET for rider status endpoints
+
+Every lifecycle transition bumps a version on the trip request (and on the
+trip, once one exists), stored next to the owning rider in a small Redis
+hash. Status endpoints derive their ETag from it, so a matching
+If-None-Match is answered with 304 from Redis alone.
+
+Versions are max(previous + 1, now_ms): monotonic even if the hash expires
+and is recreated, so an old ETag can never match a newer state.
+"""
+
+import time
+
+from app.core.redis import async_redis_client, redis_client, trip_request_status_key, trip_status_key
+
+STATUS_VERSION_TTL_SECONDS = 24 * 60 * 60
+
+_BUMP_VERSION = redis_client.register_script("""
+local current = tonumber(redis.call('HGET', KEYS[1], 'version') or '0')
+local version = math.max(current + 1, tonumber(ARGV[1]))
+redis.call('HSET', KEYS[1], 'version', version)
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return version
+""")
+
+
+def _bump(key: str) -> int:
+    return int(_BUMP_VERSION(
+        keys=[key],
+        args=[int(time.time() * 1000), STATUS_VERSION_TTL_SECONDS],
+    ))
+
+
+def bump_status_version(trip_request_id: int, trip_id: int | None = None) -> int:
+    version = _bump(trip_request_status_key(trip_request_id))
+    if trip_id:
+        _bump(trip_status_key(trip_id))
+    return version
+
+
+def _parse_version(raw: dict | None) -> tuple[int, int | None]:
+    raw = raw or {}
+    owner = raw.get("owner")
+    return int(raw.get("version", 0)), int(owner) if owner else None
+
+
+def get_status_version(key: str) -> tuple[int, int | None]:
+    """Returns (version, owner user_id). Unknown keys are version 0."""
+    return _parse_version(redis_client.hgetall(key))
+
+
+async def get_status_version_async(key: str) -> tuple[int, int | None]:
+    return _parse_version(await async_redis_client.hgetall(key))
+
+
+def set_status_owner(key: str, user_id: int) -> None:
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.hset(key, "owner", user_id)
+    pipe.expire(key, STATUS_VERSION_TTL_SECONDS)
+    pipe.execute()
+
+
+async def set_status_owner_async(key: str, user_id: int) -> None:
+    pipe = async_redis_client.pipeline(transaction=False)
+    pipe.hset(key, "owner", user_id)
+    pipe.expire(key, STATUS_VERSION_TTL_SECONDS)
+    await pipe.execute()
+
+
+# -------------------------------
+# ETAG HELPERS
+# -------------------------------
+def make_etag(version: int, *parts) -> str:
+    suffix = "".join(f"-{p}" for p in parts if p not in (None, ""))
+    return f'"v{version}{suffix}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [
+        tag.strip().removeprefix("W/")
+        for tag in if_none_match.split(",")
+    ]
+    return etag in candidates or "*" in candidates
@@ -0,0 +1,117 @@
+"""
+Trip Events - rider push channel
+
+Lifecycle code paths publish status transitions to rider:trip:{trip_request_id}
+after their commit. While a trip is assigned, the driver's location ingestion
+also pushes the live position + ETA (throttled) on the same channel.
+
+Publishing is best-effort: a Redis hiccup must never fail a lifecycle step,
+riders can still fall back to the status endpoints.
+"""
+
+import json
+import time
+from datetime import datetime, timezone
+
+from app.core.redis import redis_client, rider_channel, driver_active_trip_key
+from app.core.utils.geo import distance_meters
+from app.core.trips.status_version import bump_status_version
+
+POSITION_PUSH_INTERVAL_SECONDS = 3
+ACTIVE_TRIP_TTL_SECONDS = 3 * 60 * 60
+AVG_CITY_SPEED_KMH = 30.0
+
+
+def _event(event_type: str, trip_request_id: int, **fields) -> str:
+    return json.dumps({
+        "type": event_type,
+        "trip_request_id": trip_request_id,
+        "at_utc": datetime.now(timezone.utc).isoformat(),
+        **fields,
+    }, default=str)
+
+
+def publish_trip_status(trip_request_id: int, status: str, **fields) -> None:
+    """
+    status: tenant_selected | searching | driver_searching |
+            no_drivers_available | driver_assigned | in_progress |
+            completed | cancelled | driver_cancelled
+
+    Also bumps the status version (ETag) of the request and, when
+    `trip_id` is given, of the trip.
+    """
+    try:
+        version = bump_status_version(trip_request_id, fields.get("trip_id"))
+        redis_client.publish(
+            rider_channel(trip_request_id),
+            _event("status", trip_request_id, status=status, version=version, **fields),
+        )
+    except Exception as exc:
+        print(f"[TRIP EVENTS] publish failed trip_request_id={trip_request_id} status={status}: {exc}")
+
+
+# -------------------------------
+# ACTIVE TRIP (driver → rider position push)
+# -------------------------------
+def set_active_trip(
+    tenant_id: int,
+    city_id: int,
+    driver_id: int,
+    trip_request_id: int,
+    trip_id: int,
+    pickup_lat: float,
+    pickup_lng: float,
+) -> None:
+    key = driver_active_trip_key(tenant_id, city_id, driver_id)
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.hset(key, mapping={
+            "trip_request_id": trip_request_id,
+            "trip_id": trip_id,
+            "pickup_lat": float(pickup_lat),
+            "pickup_lng": float(pickup_lng),
+            "last_push_ts": 0,
+        })
+        pipe.expire(key, ACTIVE_TRIP_TTL_SECONDS)
+        pipe.execute()
+    except Exception as exc:
+        print(f"[TRIP EVENTS] set_active_trip failed driver_id={driver_id}: {exc}")
+
+
+def clear_active_trip(tenant_id: int, city_id: int, driver_id: int) -> None:
+    try:
+        redis_client.delete(driver_active_trip_key(tenant_id, city_id, driver_id))
+    except Exception as exc:
+        print(f"[TRIP EVENTS] clear_active_trip failed driver_id={driver_id}: {exc}")
+
+
+def position_event(
+    active_trip: dict,
+    lat: float,
+    lng: float,
+    now_ts: float | None = None,
+) -> str | None:
+    """
+    Build the rider position/ETA event if the throttle window has passed.
+    Returns None when nothing should be pushed.
+    """
+    if not active_trip or "trip_request_id" not in active_trip:
+        return None
+
+    now_ts = now_ts or time.time()
+    if now_ts - float(active_trip.get("last_push_ts", 0)) < POSITION_PUSH_INTERVAL_SECONDS:
+        return None
+
+    dist_km = distance_meters(
+        lat, lng,
+        float(active_trip["pickup_lat"]), float(active_trip["pickup_lng"]),
+    ) / 1000
+
+    return _event(
+        "driver_position",
+        int(active_trip["trip_request_id"]),
+        trip_id=int(active_trip["trip_id"]),
+        driver_lat=lat,
+        driver_lng=lng,
+        eta_minutes=int((dist_km / AVG_CITY_SPEED_KMH) * 60),
+    )
@@ -16,9 +16,11 @@ from sqlalchemy.orm import Session
 from fastapi import HTTPException
 from typing import List, Dict
 
-from app.core.redis import redis_client
+from app.core.redis import redis_client, geo_key
+from app.core.trips.trip_snapshot import store_trip_snapshot
 
 from app.models.core.users.users import User
+from app.models.core.users.user_profiles import UserProfile
 from app.models.core.trips.trip_request import TripRequest
 from app.models.core.trips.trips import Trip
 from app.models.core.trips.trip_batch import TripBatch
@@ -218,10 +220,8 @@ class TripLifecycle:
         radius_km: float = 10.0,
     ) -> List[Dict]:
 
-        geo_key = f"drivers:geo:{tenant_id}:{city_id}"
-
         nearby = redis_client.georadius(
-            geo_key,
+            geo_key(tenant_id, city_id),
             pickup_lng,
             pickup_lat,
             radius=radius_km,
@@ -319,3 +319,85 @@ class TripLifecycle:
             status.current_trip_id = None
             status.last_updated_utc = datetime.now(timezone.utc)
             db.add(status)
+
+    # =========================================================
+    # STATUS SNAPSHOT (rider status read model)
+    # =========================================================
+
+    @staticmethod
+    def build_status_snapshot(
+        db: Session,
+        trip_request: TripRequest,
+        trip: Trip | None = None,
+    ) -> Dict:
+        """
+        Denormalized status view of a trip request.
+        Driver, profile, rating and vehicle are resolved in one query.
+        """
+        snapshot = {
+            "trip_request_id": trip_request.trip_request_id,
+            "user_id": trip_request.user_id,
+            "tenant_id": trip_request.selected_tenant_id,
+            "city_id": trip_request.city_id,
+            "status": trip_request.status,
+            "pickup_lat": float(trip_request.pickup_lat),
+            "pickup_lng": float(trip_request.pickup_lng),
+            "drop_lat": float(trip_request.drop_lat),
+            "drop_lng": float(trip_request.drop_lng),
+            "estimated_distance_km": (
+                float(trip_request.estimated_distance_km)
+                if trip_request.estimated_distance_km is not None else None
+            ),
+            "estimated_duration_minutes": trip_request.estimated_duration_minutes,
+            "created_at_utc": trip_request.created_at_utc.isoformat(),
+            "trip_id": None,
+            "trip_status": None,
+            "assigned_info": None,
+        }
+
+        if not trip:
+            return snapshot
+
+        row = (
+            db.query(
+                User.phone_e164,
+                UserProfile.full_name,
+                Driver.average_rating,
+                Driver.total_ratings,
+                Vehicle.license_plate,
+                Vehicle.category_code,
+            )
+            .select_from(Driver)
+            .join(User, User.user_id == Driver.user_id)
+            .outerjoin(UserProfile, UserProfile.user_id == Driver.user_id)
+            .outerjoin(Vehicle, Vehicle.vehicle_id == trip.vehicle_id)
+            .filter(Driver.driver_id == trip.driver_id)
+            .first()
+        )
+
+        snapshot["trip_id"] = trip.trip_id
+        snapshot["trip_status"] = trip.trip_status
+        snapshot["assigned_info"] = {
+            "trip_id": trip.trip_id,
+            "driver_id": trip.driver_id,
+            "driver_phone": row.phone_e164 if row else None,
+            "driver_name": row.full_name if row else None,
+            "driver_rating_avg": (
+                float(row.average_rating)
+                if row and row.average_rating is not None else None
+            ),
+            "driver_rating_count": row.total_ratings if row else None,
+            "vehicle_number": row.license_plate if row else None,
+            "vehicle_type": row.category_code if row else None,
+        }
+        return snapshot
+
+    @staticmethod
+    def store_status_snapshot(
+        db: Session,
+        trip_request: TripRequest,
+        trip: Trip,
+    ) -> Dict:
+        snapshot = TripLifecycle.build_status_snapshot(db, trip_request, trip)
+        store_trip_snapshot(snapshot)
+        return snapshot
@@ -0,0 +1,84 @@
+"""
+Trip Snapshot - denormalized read model for rider status polling
+
+Built once by TripLifecycle.store_status_snapshot() when a driver is assigned
+(driver, profile, rating and vehicle joined a single time) and kept in a Redis
+hash, one JSON value per field, so transitions HSET only what changed.
+Status endpoints serve it with one HGETALL instead of up to seven queries.
+
+Only assigned / in-progress requests are snapshotted. Paths that move a
+request out of those states delete the snapshot; a missing snapshot falls
+back to Postgres, which rebuilds it.
+"""
+
+import json
+
+from app.core.redis import async_redis_client, redis_client, trip_snapshot_key
+
+SNAPSHOT_TTL_SECONDS = 3 * 60 * 60
+SNAPSHOT_STATUSES = ("driver_assigned", "in_progress")
+
+# Update in place only if the snapshot still exists (never resurrect a partial one)
+_UPDATE_IF_EXISTS = redis_client.register_script("""
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+redis.call('HSET', KEYS[1], unpack(ARGV))
+return 1
+""")
+
+
+def store_trip_snapshot(snapshot: dict) -> None:
+    key = trip_snapshot_key(snapshot["trip_request_id"])
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.delete(key)
+        pipe.hset(key, mapping={
+            field: json.dumps(value, default=str)
+            for field, value in snapshot.items()
+        })
+        pipe.expire(key, SNAPSHOT_TTL_SECONDS)
+        pipe.execute()
+    except Exception as exc:
+        print(f"[TRIP SNAPSHOT] store failed trip_request_id={snapshot['trip_request_id']}: {exc}")
+
+
+def update_trip_snapshot(trip_request_id: int, **fields) -> None:
+    args = []
+    for field, value in fields.items():
+        args.extend([field, json.dumps(value, default=str)])
+    try:
+        _UPDATE_IF_EXISTS(keys=[trip_snapshot_key(trip_request_id)], args=args)
+    except Exception as exc:
+        print(f"[TRIP SNAPSHOT] update failed trip_request_id={trip_request_id}: {exc}")
+
+
+def delete_trip_snapshot(trip_request_id: int) -> None:
+    try:
+        redis_client.delete(trip_snapshot_key(trip_request_id))
+    except Exception as exc:
+        print(f"[TRIP SNAPSHOT] delete failed trip_request_id={trip_request_id}: {exc}")
+
+
+def get_trip_snapshot(trip_request_id: int) -> dict | None:
+    try:
+        raw = redis_client.hgetall(trip_snapshot_key(trip_request_id))
+    except Exception as exc:
+        print(f"[TRIP SNAPSHOT] read failed trip_request_id={trip_request_id}: {exc}")
+        return None
+    return _decode_snapshot(raw)
+
+
+async def get_trip_snapshot_async(trip_request_id: int) -> dict | None:
+    try:
+        raw = await async_redis_client.hgetall(trip_snapshot_key(trip_request_id))
+    except Exception as exc:
+        print(f"[TRIP SNAPSHOT] read failed trip_request_id={trip_request_id}: {exc}")
+        return None
+    return _decode_snapshot(raw)
+
+
+def _decode_snapshot(raw: dict | None) -> dict | None:
+    if not raw:
+        return None
+    return {field: json.loads(value) for field, value in raw.items()}
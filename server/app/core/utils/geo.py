@@ -0,0 +1,39 @@
+import math
+
+EARTH_RADIUS_M = 6_371_000
+
+
+def distance_meters(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """
+    Great-circle (Haversine) distance between two coordinates in meters.
+    """
+    lat1_rad = math.radians(lat1)
+    lat2_rad = math.radians(lat2)
+    delta_lat = math.radians(lat2 - lat1)
+    delta_lng = math.radians(lng2 - lng1)
+
+    a = math.sin(delta_lat / 2) ** 2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lng / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+
+def encode_polyline(points, precision: int = 5) -> str:
+    """
+    Google encoded polyline of (lng, lat) points (GeoJSON order).
+    precision=5 is ~1 m, what map SDKs decode by default.
+    """
+    factor = 10 ** precision
+    encoded = []
+    prev_lat = prev_lng = 0
+
+    for lng, lat in points:
+        lat_i = round(lat * factor)
+        lng_i = round(lng * factor)
+        for delta in (lat_i - prev_lat, lng_i - prev_lng):
+            value = ~(delta << 1) if delta < 0 else delta << 1
+            while value >= 0x20:
+                encoded.append(chr((0x20 | (value & 0x1F)) + 63))
+                value >>= 5
+            encoded.append(chr(value + 63))
+        prev_lat, prev_lng = lat_i, lng_i
+
+    return "".join(encoded)
@@ -0,0 +1,67 @@
+"""
+Keyset (cursor) pagination
+
+Pages are cut on an ordered key such as (created_at_utc, ledger_id) instead
+of OFFSET, so page N costs the same as page 1 given an index on the key.
+The cursor is the key of the last row returned, base64-encoded JSON; clients
+treat it as opaque and send it back as ?cursor=.
+
+    rows, next_cursor = keyset_page(
+        query, (Trip.completed_at_utc, Trip.trip_id), cursor, limit,
+    )
+"""
+
+import base64
+import json
+from datetime import datetime
+
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(values) -> str:
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = json.loads(base64.urlsafe_b64decode(padded))
+        if len(raw) != len(columns):
+            raise ValueError("cursor length")
+        return [
+            datetime.fromisoformat(value) if column.type.python_type is datetime else value
+            for column, value in zip(columns, raw)
+        ]
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_page(query, columns, cursor: str | None, limit: int, descending: bool = True):
+    """
+    Apply cursor filter + ordering on `columns` and fetch one page.
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    Rows must expose the key columns as attributes (ORM rows or labelled
+    column tuples).
+    """
+    if cursor:
+        after = decode_cursor(cursor, columns)
+        key = tuple_(*columns)
+        query = query.filter(key < tuple_(*after) if descending else key > tuple_(*after))
+        # Implied by the row comparison, but only a plain bound on the
+        # leading column prunes partitions (e.g. ledger months)
+        query = query.filter(columns[0] <= after[0] if descending else columns[0] >= after[0])
+
+    order = [column.desc() if descending else column.asc() for column in columns]
+    rows = query.order_by(*order).limit(limit + 1).all()
+
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor([getattr(last, column.key) for column in columns])
@@ -3,7 +3,17 @@ from app.core.config import settings
 
 from app.api.v1._init_ import api_router
 
-from app.core.redis import check_redis_connection
+from app.core.redis import async_redis_client, check_redis_connection
+from app.core.realtime.pubsub_hub import pubsub_hub
+from app.core.request_stats import RequestStatsMiddleware
+from app.core.database import SessionLocal
+from app.core.db_partitions import ensure_partitions, check_partitioned, partition_loop, UnpartitionedTablesError
+from app.core.db_migrations import check_migrated_tables, MissingTablesError
+from app.core.lookup_registry import lookup_registry
+from app.core.dashboard_counters import reconcile_loop
+from app.core.analytics.rollups import rollup_loop
+from app.core.ledger.balance_checkpoints import checkpoint_loop
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi.middleware.cors import CORSMiddleware
@@ -21,9 +31,51 @@ async def lifespan(app: FastAPI):
 
     print("✅ Redis connected")
 
+    # Ledger / trip history tables must be partitioned (conversion migration)
+    # and the migrated tables must exist, then next months' partitions are created
+    db = SessionLocal()
+    try:
+        check_partitioned(db)
+        check_migrated_tables(db)
+        if settings.PARTITION_MAINTENANCE_ON_STARTUP:
+            created = ensure_partitions(db)
+            if created:
+                print(f"✅ Partitions created: {', '.join(created)}")
+    except (UnpartitionedTablesError, MissingTablesError):
+        raise
+    except Exception as exc:
+        db.rollback()
+        print(f"⚠️ Partition maintenance skipped: {exc}")
+    finally:
+        db.close()
+
+    # Lookup tables into memory before the first request
+    try:
+        lookup_registry()
+    except Exception as exc:
+        print(f"⚠️ Lookup registry not preloaded: {exc}")
+
+    # One async pub/sub connection per process for all WebSockets
+    await pubsub_hub.start()
+
+    # Periodic dashboard counter reconciliation (one process per interval)
+    reconcile_task = asyncio.create_task(reconcile_loop())
+    # Incremental analytics rollups (one process per interval)
+    rollup_task = asyncio.create_task(rollup_loop())
+    # Ledger balance checkpoints + wallet verification (one process per interval)
+    checkpoint_task = asyncio.create_task(checkpoint_loop())
+    # Monthly partitions: create ahead, move DEFAULT rows, archive (one process per interval)
+    partition_task = asyncio.create_task(partition_loop())
+
     yield  # <-- app runs while paused here
 
     # 🔹 Shutdown logic (optional)
+    reconcile_task.cancel()
+    rollup_task.cancel()
+    checkpoint_task.cancel()
+    partition_task.cancel()
+    await pubsub_hub.stop()
+    await async_redis_client.aclose()
     print("🛑 Application shutting down")
 
 app = FastAPI(
@@ -43,8 +95,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Keyset-paginated lists return the next page cursor in this header
+    expose_headers=["X-Next-Cursor"],
 )
 
+if settings.REQUEST_STATS_ENABLED:
+    app.add_middleware(RequestStatsMiddleware)
+
 app.mount(
     "/uploads",
     StaticFiles(directory="app/uploads"),
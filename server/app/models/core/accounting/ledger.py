@@ -7,6 +7,9 @@ from sqlalchemy import (
     CHAR,
     TIMESTAMP,
     CheckConstraint,
+    Index,
+    text,
+    func,
 )
 from datetime import datetime
 
@@ -118,7 +121,13 @@ class FinancialLedger(Base, TimestampMixin, AuditMixin):
           nullable=True,
     )
 
-    # Ledger write time (immutable)
+    # Ledger write time (immutable). Monthly partition key, so it is part
+    # of the table PK; the ORM still identifies rows by ledger_id.
+    created_at_utc: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        server_default=func.now(),
+        primary_key=True,
+    )
 
     __table_args__ = (
         # Amount must always be positive
@@ -152,7 +161,40 @@ class FinancialLedger(Base, TimestampMixin, AuditMixin):
             """,
             name="chk_ledger_entry_timestamps",
         ),
+
+        # Payout calculation: unpaid credits in a period, grouped by owner
+        Index(
+            "ix_ledger_unpaid_credits_period",
+            "credited_at_utc",
+            "entity_type",
+            "entity_id",
+            postgresql_where=text("entry_type = 'CREDIT' AND payout_batch_id IS NULL"),
+        ),
+        # Per-owner unpaid credits (payout line items, balances)
+        Index(
+            "ix_ledger_unpaid_credits_entity",
+            "entity_type",
+            "entity_id",
+            "credited_at_utc",
+            postgresql_where=text("entry_type = 'CREDIT' AND payout_batch_id IS NULL"),
+        ),
+        # Keyset-paginated ledger history per owner / tenant
+        Index(
+            "ix_ledger_entity_history",
+            "tenant_id",
+            "entity_type",
+            "entity_id",
+            "created_at_utc",
+            "ledger_id",
+        ),
+        # Ledger rows settled by a payout batch
+        Index("ix_ledger_payout_batch", "payout_batch_id"),
+
+        # Monthly partitions, see core/db_partitions.py
+        {"postgresql_partition_by": "RANGE (created_at_utc)"},
     )
 
+    __mapper_args__ = {"primary_key": [ledger_id]}
+
    
     
\ No newline at end of file
@@ -0,0 +1,42 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Numeric, Text, TIMESTAMP, Index, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class LedgerBalanceCheckpoint(Base):
+    """
+    Running balance of one ledger entity per currency, folded up to
+    through_utc (see core/ledger/balance_checkpoints.py).
+
+    balance = SUM(CREDIT) - SUM(DEBIT) of rows with created_at_utc <= through_utc.
+    Platform / tax rows (entity_id NULL) are stored under entity_id 0.
+    owner_type tells drivers and fleet owners apart ("owner" ids come from
+    separate sequences); it is "" for every other entity.
+    """
+
+    __tablename__ = "ledger_balance_checkpoints"
+
+    tenant_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    entity_type: Mapped[str] = mapped_column(Text, primary_key=True)
+    owner_type: Mapped[str] = mapped_column(Text, primary_key=True)
+    entity_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    currency_code: Mapped[str] = mapped_column(Text, primary_key=True)
+
+    balance: Mapped[float] = mapped_column(Numeric(18, 2), nullable=False)
+    entries: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    through_utc: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False)
+
+    updated_at_utc: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    __table_args__ = (
+        # Global watermark = MAX(through_utc)
+        Index("ix_ledger_checkpoints_through", "through_utc"),
+    )
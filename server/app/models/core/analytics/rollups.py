@@ -0,0 +1,88 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Index, Numeric, Text, TIMESTAMP, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+# Aggregates maintained by core/analytics/rollups.py. One row per
+# (grain, bucket, dimensions); grain is "hour" or "day". Dimensions are
+# NOT NULL (0 / '' for unknown) so they can be part of the primary key.
+
+
+class TripRollup(Base):
+    __tablename__ = "trip_rollups"
+
+    grain: Mapped[str] = mapped_column(Text, primary_key=True)
+    bucket_start_utc: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), primary_key=True)
+    tenant_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    city_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    vehicle_category: Mapped[str] = mapped_column(Text, primary_key=True)
+
+    trips: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    completed: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    cancelled: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    # Completed trips only
+    fare_total: Mapped[float] = mapped_column(Numeric(14, 2), nullable=False, default=0)
+    distance_km: Mapped[float] = mapped_column(Numeric(14, 2), nullable=False, default=0)
+    duration_minutes: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_trip_rollups_tenant_bucket", "tenant_id", "grain", "bucket_start_utc"),
+    )
+
+
+class DispatchRollup(Base):
+    __tablename__ = "dispatch_rollups"
+
+    grain: Mapped[str] = mapped_column(Text, primary_key=True)
+    bucket_start_utc: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), primary_key=True)
+    tenant_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    city_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    batch_number: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+
+    offers: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    accepted: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    rejected: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    expired: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    # accepted + rejected with a response time, for average response latency
+    responded: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    response_seconds: Mapped[float] = mapped_column(Numeric(16, 2), nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_dispatch_rollups_tenant_bucket", "tenant_id", "grain", "bucket_start_utc"),
+    )
+
+
+class RevenueRollup(Base):
+    __tablename__ = "revenue_rollups"
+
+    grain: Mapped[str] = mapped_column(Text, primary_key=True)
+    bucket_start_utc: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), primary_key=True)
+    tenant_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    entity_type: Mapped[str] = mapped_column(Text, primary_key=True)
+    transaction_type: Mapped[str] = mapped_column(Text, primary_key=True)
+    entry_type: Mapped[str] = mapped_column(Text, primary_key=True)
+    currency_code: Mapped[str] = mapped_column(Text, primary_key=True)
+
+    entries: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    amount: Mapped[float] = mapped_column(Numeric(18, 2), nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_revenue_rollups_tenant_bucket", "tenant_id", "grain", "bucket_start_utc"),
+    )
+
+
+class RollupWatermark(Base):
+    __tablename__ = "rollup_watermarks"
+
+    source: Mapped[str] = mapped_column(Text, primary_key=True)
+    # Source rows changed up to here are folded into the rollups
+    watermark_utc: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False)
+    updated_at_utc: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
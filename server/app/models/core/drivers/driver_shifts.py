@@ -1,7 +1,7 @@
 # app/models/core/drivers/driver_shifts.py
 
 from datetime import datetime
-from sqlalchemy import BigInteger, Text, Integer, DateTime, ForeignKey
+from sqlalchemy import BigInteger, Text, Integer, DateTime, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 
@@ -57,4 +57,9 @@ class DriverShift(Base, AuditMixin, TimestampMixin):
     shift_start_lat: Mapped[float | None]
     shift_start_lng: Mapped[float | None]
     shift_end_lat: Mapped[float | None]
-    shift_end_lng: Mapped[float | None]
\ No newline at end of file
+    shift_end_lng: Mapped[float | None]
+
+    __table_args__ = (
+        # "Is this driver online?" on every location ping
+        Index("ix_driver_shifts_driver_status", "driver_id", "shift_status"),
+    )
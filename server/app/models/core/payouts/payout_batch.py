@@ -6,7 +6,8 @@ from sqlalchemy import (
     Text,
     TIMESTAMP,
     CheckConstraint,
-    ForeignKeyConstraint
+    ForeignKeyConstraint,
+    Index,
 )
 
 
@@ -81,4 +82,7 @@ class PayoutBatch(Base, TimestampMixin, AuditMixin):
             ["tenant_countries.tenant_id", "tenant_countries.country_id"],
             name="fk_payout_batch_tenant_country",
         ),
+
+        # Keyset pagination of batch listings
+        Index("ix_payout_batches_created", "created_at_utc", "payout_batch_id"),
     )
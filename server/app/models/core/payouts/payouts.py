@@ -7,6 +7,7 @@ from sqlalchemy import (
     Numeric,
     TIMESTAMP,
     CheckConstraint,
+    Index,
 )
 from datetime import datetime
 
@@ -122,4 +123,7 @@ class Payout(Base, TimestampMixin, AuditMixin):
             "paid_amount >= 0 AND net_amount >= 0 AND fee_amount >= 0",
             name="chk_payout_amounts_non_negative",
         ),
+
+        # Keyset pagination of a batch's payouts
+        Index("ix_payouts_batch_payout", "payout_batch_id", "payout_id"),
     )
@@ -5,6 +5,7 @@ from sqlalchemy import (
     Numeric,
     ForeignKey,
     TIMESTAMP,
+    Index,
     text
 )
 from typing import Optional
@@ -64,10 +65,11 @@ class TripDispatchCandidate(Base):
         TIMESTAMP(timezone=True)
     )
 
+    # Monthly partition key (core/db_partitions.py), part of the table PK
     created_at_utc: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True),
         server_default=text("now()"),
-        nullable=False
+        primary_key=True
     )
 
     created_by: Mapped[Optional[int]] = mapped_column(
@@ -83,3 +85,19 @@ class TripDispatchCandidate(Base):
         BigInteger,
         ForeignKey("users.user_id")
     )
+
+    __table_args__ = (
+        # Driver response: candidate row of this driver for the request
+        Index("ix_dispatch_candidates_request_driver", "trip_request_id", "driver_id"),
+        # Batch progress: pending / rejected candidates of a batch
+        Index("ix_dispatch_candidates_batch_response", "trip_batch_id", "response_code"),
+        # Driver app offer list: only pending rows are ever looked up
+        Index(
+            "ix_dispatch_candidates_driver_pending",
+            "driver_id",
+            postgresql_where=text("response_code IS NULL"),
+        ),
+        {"postgresql_partition_by": "RANGE (created_at_utc)"},
+    )
+
+    __mapper_args__ = {"primary_key": [candidate_id]}
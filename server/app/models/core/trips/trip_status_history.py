@@ -8,7 +8,7 @@ class TripStatusHistory(Base):
     __tablename__ = "trip_status_history"
 
     status_event_id: Mapped[int] = mapped_column(
-        BigInteger, primary_key=True
+        BigInteger, primary_key=True, autoincrement=True
     )
 
     tenant_id: Mapped[int] = mapped_column(
@@ -27,10 +27,17 @@ class TripStatusHistory(Base):
         Text, ForeignKey("lu_trip_status.status_code"), nullable=False
     )
 
+    # Monthly partition key (core/db_partitions.py), part of the table PK
     changed_at_utc: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.utcnow
+        DateTime(timezone=True), default=datetime.utcnow, primary_key=True
     )
 
     changed_by: Mapped[int | None] = mapped_column(
         BigInteger, ForeignKey("users.user_id")
     )
+
+    __table_args__ = (
+        {"postgresql_partition_by": "RANGE (changed_at_utc)"},
+    )
+
+    __mapper_args__ = {"primary_key": [status_event_id]}
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Text,BigInteger, DateTime, ForeignKey, Numeric, Text, Integer, TIMESTAMP,String
+from sqlalchemy import Text,BigInteger, DateTime, ForeignKey, Numeric, Text, Integer, TIMESTAMP,String, Index, text
 from sqlalchemy.orm import Mapped, mapped_column
 from typing import Optional
 from app.core.database import Base
@@ -83,4 +83,19 @@ class Trip(Base,AuditMixin,TimestampMixin):
     rated_at_utc: Mapped[datetime | None] = mapped_column(
         TIMESTAMP(timezone=True),
         nullable=True
-    )
\ No newline at end of file
+    )
+
+    __table_args__ = (
+        # Driver's current/active trip lookups (start, complete, current-trip)
+        Index("ix_trips_driver_status", "driver_id", "trip_status"),
+        # Driver past trips, keyset paginated on (completed_at_utc, trip_id)
+        Index(
+            "ix_trips_driver_completed",
+            "driver_id",
+            "completed_at_utc",
+            "trip_id",
+            postgresql_where=text("trip_status = 'completed'"),
+        ),
+        # Rollup watermark scan (core/analytics/rollups.py)
+        Index("ix_trips_changed_at", text("coalesce(updated_at_utc, created_at_utc)")),
+    )
@@ -1,6 +1,8 @@
 # app/schemas/core/drivers/driver_location.py
 from pydantic import BaseModel, Field
+from typing import Optional
 
 class DriverLocationUpdate(BaseModel):
     latitude: float = Field(..., ge=-90, le=90)
     longitude: float = Field(..., ge=-180, le=180)
+    heading: Optional[float] = Field(None, ge=0, le=360)
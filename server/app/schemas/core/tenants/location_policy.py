@@ -0,0 +1,11 @@
+from pydantic import BaseModel, Field
+
+
+class LocationPolicyUpdate(BaseModel):
+    min_move_meters: float = Field(..., ge=0, le=1000)
+    heading_tolerance_deg: float = Field(..., ge=0, le=180)
+    max_geo_interval_seconds: int = Field(..., ge=5, le=110)
+
+
+class LocationPolicyOut(LocationPolicyUpdate):
+    tenant_id: int
@@ -6,5 +6,12 @@ class CityOut(BaseModel):
     city_name: str
     timezone: str
     is_active: bool
+    # Derived from the boundary (None for cities without one)
+    centroid_lat: float | None = None
+    centroid_lng: float | None = None
+    bbox_min_lat: float | None = None
+    bbox_min_lng: float | None = None
+    bbox_max_lat: float | None = None
+    bbox_max_lng: float | None = None
 
     model_config = ConfigDict(from_attributes=True)
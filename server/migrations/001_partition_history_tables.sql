@@ -0,0 +1,187 @@
+-- 001 - Convert the history tables to monthly RANGE partitions
+--
+--     financial_ledger          created_at_utc   (PK ledger_id, created_at_utc)
+--     trip_status_history       changed_at_utc   (PK status_event_id, changed_at_utc)
+--     trip_dispatch_candidates  created_at_utc   (PK candidate_id, created_at_utc)
+--
+-- The models declare these tables partitioned (postgresql_partition_by);
+-- databases created before that still have plain tables, and the app
+-- refuses to start until this has run (core/db_partitions.py).
+--
+-- Per table, in one transaction:
+--   1. rename the plain table (and its indexes) to <table>_unpartitioned
+--   2. create the partitioned <table> with the same columns, defaults,
+--      CHECK constraints and id sequence, PK (id, partition key)
+--   3. create one partition per month from the oldest row up to
+--      PARTITION_MONTHS_AHEAD (3) months ahead, plus <table>_default
+--   4. copy the history, then re-add the foreign keys and the model indexes
+--
+-- Stop the API and workers first: the tables are locked for the whole copy.
+-- Re-running is safe (already partitioned tables are skipped).
+-- <table>_unpartitioned is kept for verification; drop it afterwards (see end).
+--
+--     psql "$DATABASE_URL" -f migrations/001_partition_history_tables.sql
+
+\set ON_ERROR_STOP on
+SET TimeZone = 'UTC';
+
+CREATE FUNCTION pg_temp.partition_history_table(
+    tbl text,
+    key_column text,
+    id_column text,
+    months_ahead int
+) RETURNS boolean
+LANGUAGE plpgsql AS $$
+DECLARE
+    legacy text := tbl || '_unpartitioned';
+    seq text;
+    nulls bigint;
+    copied bigint;
+    month timestamptz;
+    last_month timestamptz;
+    idx record;
+    fk record;
+BEGIN
+    IF to_regclass(tbl) IS NULL THEN
+        RAISE EXCEPTION 'table % does not exist', tbl;
+    END IF;
+    IF EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(tbl)) THEN
+        RAISE NOTICE '% is already partitioned, skipped', tbl;
+        RETURN false;
+    END IF;
+
+    EXECUTE format('LOCK TABLE %I IN ACCESS EXCLUSIVE MODE', tbl);
+
+    -- The partition key becomes part of the PK
+    EXECUTE format('SELECT count(*) FROM %I WHERE %I IS NULL', tbl, key_column) INTO nulls;
+    IF nulls > 0 THEN
+        RAISE EXCEPTION '%: % row(s) with NULL %, backfill them first', tbl, nulls, key_column;
+    END IF;
+
+    seq := pg_get_serial_sequence(tbl, id_column);
+    IF seq IS NULL THEN
+        RAISE EXCEPTION '%.% has no owned sequence', tbl, id_column;
+    END IF;
+
+    -- 1. Move the plain table aside (index names are schema-wide)
+    EXECUTE format('ALTER TABLE %I RENAME TO %I', tbl, legacy);
+    FOR idx IN
+        SELECT c.relname
+        FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE i.indrelid = to_regclass(legacy)
+    LOOP
+        EXECUTE format(
+            'ALTER INDEX %I RENAME TO %I',
+            idx.relname, left(idx.relname, 49) || '_unpartitioned'
+        );
+    END LOOP;
+
+    -- 2. Partitioned table; the copied id default keeps using the same sequence
+    EXECUTE format(
+        'CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS INCLUDING CONSTRAINTS '
+        'INCLUDING COMMENTS INCLUDING STORAGE) PARTITION BY RANGE (%I)',
+        tbl, legacy, key_column
+    );
+    EXECUTE format('ALTER TABLE %I ADD PRIMARY KEY (%I, %I)', tbl, id_column, key_column);
+    EXECUTE format('ALTER SEQUENCE %s OWNED BY %I.%I', seq, tbl, id_column);
+
+    -- 3. Monthly partitions (names as in core/db_partitions.partition_name)
+    EXECUTE format('SELECT date_trunc(''month'', min(%I)) FROM %I', key_column, legacy) INTO month;
+    last_month := date_trunc('month', now()) + make_interval(months => months_ahead);
+    month := least(coalesce(month, date_trunc('month', now())), date_trunc('month', now()));
+    WHILE month <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+            tbl || '_p' || to_char(month, 'YYYYMM'), tbl, month, month + interval '1 month'
+        );
+        month := month + interval '1 month';
+    END LOOP;
+    EXECUTE format('CREATE TABLE %I PARTITION OF %I DEFAULT', tbl || '_default', tbl);
+
+    -- 4. History, then the foreign keys of the plain table
+    EXECUTE format('INSERT INTO %I SELECT * FROM %I', tbl, legacy);
+    GET DIAGNOSTICS copied = ROW_COUNT;
+
+    FOR fk IN
+        SELECT conname, pg_get_constraintdef(oid) AS definition
+        FROM pg_constraint
+        WHERE conrelid = to_regclass(legacy) AND contype = 'f'
+    LOOP
+        EXECUTE format('ALTER TABLE %I ADD CONSTRAINT %I %s', tbl, fk.conname, fk.definition);
+    END LOOP;
+
+    RAISE NOTICE '%: % row(s) copied into monthly partitions', tbl, copied;
+    RETURN true;
+END;
+$$;
+
+
+-- --------------------------------------------------
+-- financial_ledger
+-- --------------------------------------------------
+BEGIN;
+SELECT pg_temp.partition_history_table('financial_ledger', 'created_at_utc', 'ledger_id', 3);
+
+CREATE INDEX IF NOT EXISTS ix_financial_ledger_payment_id ON financial_ledger (payment_id);
+CREATE INDEX IF NOT EXISTS ix_financial_ledger_trip_id ON financial_ledger (trip_id);
+CREATE INDEX IF NOT EXISTS ix_financial_ledger_tenant_id ON financial_ledger (tenant_id);
+CREATE INDEX IF NOT EXISTS ix_financial_ledger_country_id ON financial_ledger (country_id);
+CREATE INDEX IF NOT EXISTS ix_ledger_unpaid_credits_period
+    ON financial_ledger (credited_at_utc, entity_type, entity_id)
+    WHERE entry_type = 'CREDIT' AND payout_batch_id IS NULL;
+CREATE INDEX IF NOT EXISTS ix_ledger_unpaid_credits_entity
+    ON financial_ledger (entity_type, entity_id, credited_at_utc)
+    WHERE entry_type = 'CREDIT' AND payout_batch_id IS NULL;
+CREATE INDEX IF NOT EXISTS ix_ledger_entity_history
+    ON financial_ledger (tenant_id, entity_type, entity_id, created_at_utc, ledger_id);
+CREATE INDEX IF NOT EXISTS ix_ledger_payout_batch ON financial_ledger (payout_batch_id);
+COMMIT;
+ANALYZE financial_ledger;
+
+
+-- --------------------------------------------------
+-- trip_status_history
+-- --------------------------------------------------
+BEGIN;
+SELECT pg_temp.partition_history_table('trip_status_history', 'changed_at_utc', 'status_event_id', 3);
+COMMIT;
+ANALYZE trip_status_history;
+
+
+-- --------------------------------------------------
+-- trip_dispatch_candidates
+-- --------------------------------------------------
+BEGIN;
+SELECT pg_temp.partition_history_table('trip_dispatch_candidates', 'created_at_utc', 'candidate_id', 3);
+
+CREATE INDEX IF NOT EXISTS ix_dispatch_candidates_request_driver
+    ON trip_dispatch_candidates (trip_request_id, driver_id);
+CREATE INDEX IF NOT EXISTS ix_dispatch_candidates_batch_response
+    ON trip_dispatch_candidates (trip_batch_id, response_code);
+CREATE INDEX IF NOT EXISTS ix_dispatch_candidates_driver_pending
+    ON trip_dispatch_candidates (driver_id)
+    WHERE response_code IS NULL;
+COMMIT;
+ANALYZE trip_dispatch_candidates;
+
+
+-- --------------------------------------------------
+-- Verify, then drop the plain copies
+-- --------------------------------------------------
+SELECT c.relname AS partitioned_table,
+       count(i.inhrelid) AS partitions
+FROM pg_partitioned_table p
+JOIN pg_class c ON c.oid = p.partrelid
+LEFT JOIN pg_inherits i ON i.inhparent = p.partrelid
+WHERE c.relname IN ('financial_ledger', 'trip_status_history', 'trip_dispatch_candidates')
+GROUP BY c.relname;
+
+-- Row counts must match before dropping:
+--   SELECT (SELECT count(*) FROM financial_ledger), (SELECT count(*) FROM financial_ledger_unpartitioned);
+--
+--   DROP TABLE financial_ledger_unpartitioned;
+--   DROP TABLE trip_status_history_unpartitioned;
+--   DROP TABLE trip_dispatch_candidates_unpartitioned;
+--
+-- GRANTs are not copied: re-apply them if the API role does not own the tables.
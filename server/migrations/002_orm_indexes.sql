@@ -0,0 +1,62 @@
+-- 002 - Indexes declared on the models, for existing databases
+--
+-- create_all() only builds indexes together with new tables, so databases
+-- created earlier lack these. CONCURRENTLY keeps the tables writable; it
+-- cannot run inside a transaction, so run the file as is (no BEGIN, no -1).
+--
+--     driver_shifts   ix_driver_shifts_driver_status   location ping "is the driver online?"
+--     trips           ix_trips_driver_status           driver's assigned / picked_up trip
+--                     ix_trips_driver_completed        driver past trips, keyset pages
+--                     ix_trips_changed_at              analytics rollup watermark scan
+--     payout_batches  ix_payout_batches_created        batch listing, keyset pages
+--     payouts         ix_payouts_batch_payout          a batch's payouts, keyset pages
+--
+-- The partitioned tables (financial_ledger, trip_dispatch_candidates) get
+-- their indexes from 001: CONCURRENTLY is not supported on a partitioned
+-- parent.
+--
+-- An interrupted CONCURRENTLY build leaves an INVALID index that IF NOT
+-- EXISTS then skips; the query at the end lists those (DROP INDEX
+-- CONCURRENTLY it and re-run). Plans: tests/test_query_plans.py
+--
+--     psql "$DATABASE_URL" -f migrations/002_orm_indexes.sql
+
+\set ON_ERROR_STOP on
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_driver_shifts_driver_status
+    ON driver_shifts (driver_id, shift_status);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_trips_driver_status
+    ON trips (driver_id, trip_status);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_trips_driver_completed
+    ON trips (driver_id, completed_at_utc, trip_id)
+    WHERE trip_status = 'completed';
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_trips_changed_at
+    ON trips ((coalesce(updated_at_utc, created_at_utc)));
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_payout_batches_created
+    ON payout_batches (created_at_utc, payout_batch_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_payouts_batch_payout
+    ON payouts (payout_batch_id, payout_id);
+
+ANALYZE driver_shifts;
+ANALYZE trips;
+ANALYZE payout_batches;
+ANALYZE payouts;
+
+-- Must return no rows
+SELECT c.relname AS invalid_index
+FROM pg_index i
+JOIN pg_class c ON c.oid = i.indexrelid
+WHERE NOT i.indisvalid
+  AND c.relname IN (
+      'ix_driver_shifts_driver_status',
+      'ix_trips_driver_status',
+      'ix_trips_driver_completed',
+      'ix_trips_changed_at',
+      'ix_payout_batches_created',
+      'ix_payouts_batch_payout'
+  );
@@ -0,0 +1,51 @@
+-- 003 - Ledger balance checkpoints (core/ledger/balance_checkpoints.py)
+--
+--     ledger_balance_checkpoints   folded balance per (tenant, entity_type,
+--                                  owner_type, entity_id, currency)
+--
+-- Checkpoints used to be created by the app on first use, keyed without
+-- owner_type, which merged drivers and fleet owners with the same id. Such
+-- a table is dropped here: checkpoints are derived from financial_ledger
+-- and the next build folds the whole ledger again.
+--
+-- The app refuses to start until this has run (core/db_migrations.py).
+--
+--     psql "$DATABASE_URL" -f migrations/003_ledger_balance_checkpoints.sql
+
+\set ON_ERROR_STOP on
+
+BEGIN;
+
+DO $$
+BEGIN
+    IF to_regclass('ledger_balance_checkpoints') IS NOT NULL AND NOT EXISTS (
+        SELECT 1
+        FROM information_schema.columns
+        WHERE table_schema = current_schema()
+          AND table_name = 'ledger_balance_checkpoints'
+          AND column_name = 'owner_type'
+    ) THEN
+        DROP TABLE ledger_balance_checkpoints;
+        RAISE NOTICE 'ledger_balance_checkpoints without owner_type dropped, rebuilt on the next run';
+    END IF;
+END;
+$$;
+
+CREATE TABLE IF NOT EXISTS ledger_balance_checkpoints (
+    tenant_id       BIGINT NOT NULL,
+    entity_type     TEXT NOT NULL,
+    owner_type      TEXT NOT NULL,
+    entity_id       BIGINT NOT NULL,
+    currency_code   TEXT NOT NULL,
+    balance         NUMERIC(18, 2) NOT NULL,
+    entries         BIGINT NOT NULL,
+    through_utc     TIMESTAMP WITH TIME ZONE NOT NULL,
+    updated_at_utc  TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+    PRIMARY KEY (tenant_id, entity_type, owner_type, entity_id, currency_code)
+);
+
+-- Global watermark = MAX(through_utc)
+CREATE INDEX IF NOT EXISTS ix_ledger_checkpoints_through
+    ON ledger_balance_checkpoints (through_utc);
+
+COMMIT;
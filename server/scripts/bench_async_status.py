@@ -0,0 +1,121 @@
+"""
+Trip request status on the event loop vs the threadpool (user-037)
+
+Concurrent GET /trips/request/{id}/status cache hits in one worker:
+
+    async       _cached_trip_request_status on redis.asyncio (the route now)
+    threadpool  _trip_request_status_in_session through run_in_threadpool on
+                the sync client (the route before; anyio's default limit is
+                40 threads per worker)
+
+Both read the status version, the trip snapshot and the live fields
+(OTP, driver GEO position) from Redis and build the same payload. Postgres
+is never reached. Each of --concurrency clients loops for --seconds.
+
+The configured Redis must allow --concurrency connections per client.
+Without one, --fake-rtt-ms runs on an in-process fakeredis that waits that
+long per round trip (3 per request).
+
+    python -m scripts.bench_async_status
+    python -m scripts.bench_async_status --fake-rtt-ms 0.5 --concurrency 10 100 1000
+"""
+
+import argparse
+import asyncio
+import time
+
+from scripts._bench import percentile, print_table, use_fake_redis
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.api.v1.trips.trip_request import _cached_trip_request_status, _trip_request_status_in_session
+from app.core import redis as app_redis
+from app.core.redis import driver_geo_state_key, geo_key, trip_request_status_key
+from app.core.trips.status_version import set_status_owner
+from app.core.trips.trip_otp_service import _otp_plain_key
+from app.core.trips.trip_snapshot import store_trip_snapshot
+
+RIDER_ID, TENANT_ID, CITY_ID = 11, 1, 7
+TRIPS = 1000
+
+
+def _seed():
+    redis_client = app_redis.redis_client
+    for i in range(TRIPS):
+        trip_request_id, trip_id, driver_id = 500_000 + i, 900_000 + i, 40_000 + i
+        store_trip_snapshot({
+            "trip_request_id": trip_request_id,
+            "user_id": RIDER_ID,
+            "tenant_id": TENANT_ID,
+            "city_id": CITY_ID,
+            "status": "driver_assigned",
+            "pickup_lat": 12.97,
+            "pickup_lng": 77.59,
+            "drop_lat": 12.99,
+            "drop_lng": 77.61,
+            "estimated_distance_km": 4.2,
+            "estimated_duration_minutes": 15,
+            "created_at_utc": "2026-10-19T08:00:00+00:00",
+            "trip_id": trip_id,
+            "trip_status": "assigned",
+            "assigned_info": {"trip_id": trip_id, "driver_id": driver_id},
+        })
+        redis_client.hset(trip_request_status_key(trip_request_id), "version", int(time.time() * 1000))
+        set_status_owner(trip_request_status_key(trip_request_id), RIDER_ID)
+        redis_client.geoadd(geo_key(TENANT_ID, CITY_ID), (77.60, 12.98, str(driver_id)))
+        redis_client.hset(driver_geo_state_key(TENANT_ID, CITY_ID, driver_id), "ts", "1760860800.0")
+        redis_client.set(_otp_plain_key(trip_id), "123456", ex=3600)
+
+
+async def _status_async(trip_request_id: int):
+    return await _cached_trip_request_status(trip_request_id, RIDER_ID)
+
+
+async def _status_threadpool(trip_request_id: int):
+    return await run_in_threadpool(_trip_request_status_in_session, trip_request_id, RIDER_ID, None)
+
+
+async def _run(call, concurrency: int, seconds: float) -> list:
+    latencies: list[float] = []
+    stop_at = time.perf_counter() + seconds
+
+    async def client(offset: int):
+        i = offset
+        while time.perf_counter() < stop_at:
+            start = time.perf_counter()
+            _, payload = await call(500_000 + i % TRIPS)
+            latencies.append((time.perf_counter() - start) * 1000)
+            assert payload.otp == "123456"
+            i += concurrency
+
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    await asyncio.gather(*(client(offset) for offset in range(concurrency)))
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    return [
+        f"{len(latencies) / wall:.0f}",
+        f"{percentile(latencies, 0.5):.1f}",
+        f"{percentile(latencies, 0.99):.1f}",
+        f"{1000 * cpu / len(latencies):.2f}",
+    ]
+
+
+async def main(concurrency: list[int], seconds: float, fake_rtt_ms: float | None):
+    if fake_rtt_ms is not None:
+        use_fake_redis(fake_rtt_ms, max_connections=max(concurrency) + 10)
+    _seed()
+    rows = []
+    for clients in concurrency:
+        for mode, call in (("async", _status_async), ("threadpool", _status_threadpool)):
+            rows.append([mode, clients] + await _run(call, clients, seconds))
+    await app_redis.async_redis_client.aclose()
+    print_table(["mode", "clients", "req/s", "p50 ms", "p99 ms", "CPU ms/req"], rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--fake-rtt-ms", type=float, help="in-process fakeredis with this round trip")
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency, args.seconds, args.fake_rtt_ms))
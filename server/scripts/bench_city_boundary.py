@@ -0,0 +1,109 @@
+"""
+City boundary payload size and build time (user-046)
+
+GET /lookups/cities/{id}/boundary body for each tolerance / precision /
+format, against the unsimplified polygon at ST_AsGeoJSON's default 9
+digits (what serializing City.boundary as-is would send).
+
+Simplification runs in GEOS through shapely (simplify(preserve_topology=True),
+the routine behind ST_SimplifyPreserveTopology), quantization rounds like
+ST_AsGeoJSON(geom, precision), and the body comes from the endpoint's own
+boundary_body(). Both costs are paid once per cache key; afterwards the
+endpoint serves the cached bytes.
+
+The default polygon is synthetic (a ~15 km city outline with --vertices
+points and metre-scale jitter, like a surveyed boundary). Pass --geojson
+with a real Polygon (GeoJSON geometry, Feature or FeatureCollection) for
+real numbers.
+
+    python -m scripts.bench_city_boundary
+    python -m scripts.bench_city_boundary --geojson bengaluru.geojson
+"""
+
+import argparse
+import gzip
+import json
+import math
+import random
+import time
+
+from scripts._bench import print_table
+
+from shapely.geometry import Polygon, mapping, shape
+
+from app.core.lookup_registry import BOUNDARY_FORMATS, boundary_body
+
+TOLERANCES = [0.0, 0.0001, 0.001, 0.01]
+PRECISIONS = [5, 6]
+
+
+def _synthetic_city(vertices: int, seed: int = 7) -> Polygon:
+    rng = random.Random(seed)
+    lat0, lng0, radius = 12.97, 77.59, 0.135  # ~15 km
+    points, wobble = [], 0.0
+    for i in range(vertices):
+        angle = 2 * math.pi * i / vertices
+        # Districts (low frequency) + a random walk (streets, rivers) + GPS jitter
+        wobble = 0.98 * wobble + rng.gauss(0, 0.004)
+        r = radius * (1 + 0.12 * math.sin(5 * angle) + 0.05 * math.sin(17 * angle) + wobble)
+        r += rng.gauss(0, 0.00002)
+        points.append((lng0 + r * math.cos(angle) / math.cos(math.radians(lat0)), lat0 + r * math.sin(angle)))
+    return Polygon(points)
+
+
+def _load_polygon(path: str) -> Polygon:
+    with open(path) as f:
+        data = json.load(f)
+    if data.get("type") == "FeatureCollection":
+        data = data["features"][0]
+    if data.get("type") == "Feature":
+        data = data["geometry"]
+    return shape(data)
+
+
+def _quantized(geometry: dict, precision: int) -> dict:
+    return {
+        "type": geometry["type"],
+        "coordinates": [
+            [[round(lng, precision), round(lat, precision)] for lng, lat in ring]
+            for ring in geometry["coordinates"]
+        ],
+    }
+
+
+def main(polygon: Polygon):
+    vertices = len(polygon.exterior.coords)
+    # Warm-up
+    boundary_body(1, _quantized(mapping(polygon), 5), 0.0, "polyline", 5)
+    full = boundary_body(1, _quantized(mapping(polygon), 9), 0.0, "geojson", 9).content
+    rows = [["-", 9, "geojson", vertices, len(full), len(gzip.compress(full)), "-", "-", "100.0%"]]
+
+    for tolerance in TOLERANCES:
+        start = time.perf_counter()
+        simplified = polygon.simplify(tolerance, preserve_topology=True) if tolerance else polygon
+        simplify_ms = (time.perf_counter() - start) * 1000
+        geometry = mapping(simplified)
+        for precision in PRECISIONS:
+            for fmt in BOUNDARY_FORMATS:
+                start = time.perf_counter()
+                body = boundary_body(1, _quantized(geometry, precision), tolerance, fmt, precision).content
+                serialize_ms = (time.perf_counter() - start) * 1000
+                rows.append([
+                    tolerance, precision, fmt, len(simplified.exterior.coords),
+                    len(body), len(gzip.compress(body)), f"{simplify_ms:.2f}", f"{serialize_ms:.2f}",
+                    f"{100 * len(body) / len(full):.1f}%",
+                ])
+
+    print(f"{vertices} vertices, {polygon.area:.4f} deg^2\n")
+    print_table(
+        ["tolerance", "digits", "format", "vertices", "bytes", "gzip", "simplify ms", "serialize ms", "of full"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--geojson", help="file with a real city Polygon")
+    parser.add_argument("--vertices", type=int, default=20_000, help="synthetic polygon size")
+    args = parser.parse_args()
+    main(_load_polygon(args.geojson) if args.geojson else _synthetic_city(args.vertices))
@@ -0,0 +1,81 @@
+"""
+JWT verification cost per request (user-034)
+
+For each algorithm, the mean time of _decode_token (what
+verify_access_token runs on every authenticated request):
+
+    uncached  JWT_VERIFY_CACHE_SIZE = 0, a full signature check each time
+    cached    the same token again, served from the verified-token LRU
+
+plus the time to sign one token. ES256 / RS256 keys are generated for
+the run; python-jose uses whichever backend is installed (cryptography
+when present, otherwise the pure-python ecdsa / rsa packages), so the
+asymmetric numbers depend heavily on that.
+
+    python -m scripts.bench_jwt
+    python -m scripts.bench_jwt --algorithms HS256 ES256 --repeat 500
+"""
+
+import argparse
+
+from scripts._bench import mean_ms, print_table
+
+import ecdsa
+import rsa
+from jose import backends
+
+from app.core.config import settings
+from app.core.security import jwt as app_jwt
+
+
+def _keys(algorithm: str) -> tuple[str, str]:
+    """(signing_key, verify_key) as PEM, or the shared secret for HS*."""
+    if algorithm.startswith("HS"):
+        return settings.JWT_SECRET_KEY, settings.JWT_SECRET_KEY
+    if algorithm.startswith("ES"):
+        private = ecdsa.SigningKey.generate(curve=ecdsa.NIST256p)
+        return private.to_pem().decode(), private.get_verifying_key().to_pem().decode()
+    public, private = rsa.newkeys(2048)
+    return private.save_pkcs1().decode(), public.save_pkcs1().decode()
+
+
+def _measure(algorithm: str, repeat: int) -> list:
+    signing_key, verify_key = _keys(algorithm)
+    app_jwt._SIGNING_KEY, app_jwt._VERIFY_KEY = signing_key, verify_key
+    settings.JWT_ALGORITHM = algorithm
+
+    def sign():
+        return app_jwt.create_access_token(user_id=1, role="driver", context="driver", driver_id=1)
+
+    token = sign()
+
+    settings.JWT_VERIFY_CACHE_SIZE = 0
+    uncached = mean_ms(lambda: app_jwt._decode_token(token), repeat)
+
+    settings.JWT_VERIFY_CACHE_SIZE = 10_000
+    app_jwt._verified.clear()
+    cached = mean_ms(lambda: app_jwt._decode_token(token), repeat)
+
+    signed = mean_ms(sign, max(repeat // 10, 10))
+    return [
+        algorithm,
+        f"{uncached:.3f}",
+        f"{cached:.4f}",
+        f"{uncached / cached:.0f}x",
+        f"{signed:.3f}",
+    ]
+
+
+def main(algorithms: list[str], repeat: int):
+    backend = backends.ECKey.__module__.rsplit(".", 1)[-1]
+    print(f"python-jose backend: {backend}, {repeat} verifications each\n")
+    rows = [_measure(algorithm, repeat) for algorithm in algorithms]
+    print_table(["alg", "uncached ms", "cached ms", "speed-up", "sign ms"], rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--algorithms", nargs="+", default=["HS256", "ES256", "RS256"])
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+    main(args.algorithms, args.repeat)
@@ -0,0 +1,161 @@
+"""
+GET /driver/past-trips at 10 / 1k / 10k trips per driver (user-043)
+
+    batched   get_past_trips: a page is 4 statements (trips, trip request
+              addresses, payments IN, ledger totals GROUP BY)
+    per-trip  the previous loop: a trip request, a payment and a ledger
+              query per trip (3N + 1)
+
+Seeds one driver per size plus --other-trips trips of other drivers into
+a scratch schema (trips, trip_requests, payments, financial_ledger with 4
+ledger rows per paid trip, every 10th trip unpaid), then times the first
+page and a walk over every page.
+
+    BENCH_DATABASE_URL=postgresql+psycopg2://... python -m scripts.bench_past_trips
+"""
+
+import argparse
+import time
+from types import SimpleNamespace
+
+from scripts._bench import create_model_tables, create_month_partitions, print_table, scratch_engine
+
+from sqlalchemy import and_, text
+from sqlalchemy.orm import Session
+
+from app.api.v1.drivers.driver_finances import get_past_trips
+from app.core.request_stats import query_budget
+from app.core.utils.pagination import MAX_PAGE_SIZE, keyset_page
+from app.models.core.accounting.ledger import FinancialLedger
+from app.models.core.payments.payments import Payment
+from app.models.core.trips.trip_request import TripRequest
+from app.models.core.trips.trips import Trip
+
+TENANT_ID = 1
+SIZES = [10, 1_000, 10_000]
+
+# Driver d (1-based index into SIZES) owns trip ids [d * 10^6, d * 10^6 + n);
+# other drivers' trips start at 100 * 10^6
+SEED = [
+    """
+    INSERT INTO trips (trip_id, tenant_id, city_id, driver_id, trip_request_id, trip_status,
+                       requested_at_utc, picked_up_at_utc, completed_at_utc)
+    SELECT :base + i, 1, 1, :driver_id, :base + i, 'completed',
+           now() - i * interval '1 minute' - interval '30 minutes',
+           now() - i * interval '1 minute' - interval '20 minutes', now() - i * interval '1 minute'
+    FROM generate_series(0, :n - 1) AS i
+    """,
+    """
+    INSERT INTO trip_requests (trip_request_id, user_id, pickup_lat, pickup_lng, pickup_address,
+                               drop_lat, drop_lng, drop_address, status)
+    SELECT :base + i, 1 + i % 5000, 12.97, 77.59, 'Pickup ' || i, 12.99, 77.61, 'Drop ' || i,
+           'driver_assigned'
+    FROM generate_series(0, :n - 1) AS i
+    """,
+    """
+    INSERT INTO payments (payment_id, trip_id, tenant_id, amount, currency_code,
+                          payment_status, payment_method)
+    SELECT :base + i, :base + i, 1, 250, 'INR', 'captured', 'cash'
+    FROM generate_series(0, :n - 1) AS i
+    WHERE i % 10 <> 0
+    """,
+    """
+    INSERT INTO financial_ledger (tenant_id, country_id, trip_id, payment_id, entity_type, entity_id,
+                                  transaction_type, amount, currency_code, entry_type,
+                                  credited_at_utc, created_at_utc)
+    SELECT 1, 1, :base + i, :base + i, 'owner', :driver_id, kind, amount, 'INR', 'CREDIT',
+           now() - i * interval '1 minute', now() - i * interval '1 minute'
+    FROM generate_series(0, :n - 1) AS i,
+         (VALUES ('platform_fee', 25), ('tenant_share', 20), ('tax', 12.5), ('driver_earning', 192.5))
+             AS k (kind, amount)
+    WHERE i % 10 <> 0
+    """,
+]
+
+
+def _past_trips_per_trip(driver, db: Session, cursor: str | None, limit: int) -> dict:
+    """get_past_trips before the batch loads, trimmed to its queries."""
+    query = db.query(Trip).filter(
+        and_(
+            Trip.driver_id == driver.driver_id,
+            Trip.tenant_id == driver.tenant_id,
+            Trip.trip_status == "completed",
+        )
+    )
+    past_trips, next_cursor = keyset_page(query, (Trip.completed_at_utc, Trip.trip_id), cursor, limit)
+
+    trip_list = []
+    for trip in past_trips:
+        trip_request = db.query(TripRequest).filter(
+            TripRequest.trip_request_id == trip.trip_request_id
+        ).first()
+        payment = db.query(Payment).filter(
+            Payment.trip_id == trip.trip_id,
+            Payment.tenant_id == driver.tenant_id,
+        ).first()
+        details = {"payment_status": "not_found"}
+        if payment:
+            ledger_entries = db.query(FinancialLedger).filter(FinancialLedger.trip_id == trip.trip_id).all()
+            details = {"total_fare": sum(float(entry.amount) for entry in ledger_entries)}
+        trip_list.append({
+            "trip_id": trip.trip_id,
+            "pickup_address": trip_request.pickup_address,
+            "payment_details": details,
+        })
+    return {"trips": trip_list, "next_cursor": next_cursor}
+
+
+def _batched(driver, db: Session, cursor: str | None, limit: int) -> dict:
+    return get_past_trips(driver=driver, db=db, cursor=cursor, limit=limit)
+
+
+def _timed(engine, fn, driver, limit: int, all_pages: bool) -> tuple[float, int, int]:
+    """(ms, statements, trips) for the first page or every page."""
+    with Session(engine) as db, query_budget(max_queries=10**9) as budget:
+        start = time.perf_counter()
+        cursor, trips = None, 0
+        while True:
+            page = fn(driver, db, cursor, limit)
+            trips += len(page["trips"])
+            cursor = page["next_cursor"]
+            if not all_pages or not cursor:
+                break
+        elapsed = (time.perf_counter() - start) * 1000
+    return elapsed, budget.sql_count, trips
+
+
+def main(limit: int, other_trips: int):
+    with scratch_engine() as engine:
+        with engine.begin() as conn:
+            create_model_tables(conn, [Trip, TripRequest, Payment, FinancialLedger])
+            create_month_partitions(conn, "financial_ledger", months_back=3, months_ahead=1)
+        with engine.begin() as conn:
+            seeds = [(index, n) for index, n in enumerate(SIZES, start=1)] + [(100, other_trips)]
+            for driver_id, n in seeds:
+                for statement in SEED:
+                    conn.execute(text(statement), {"base": driver_id * 10**6, "driver_id": driver_id, "n": n})
+        with engine.connect() as conn:
+            conn.execute(text("ANALYZE"))
+            conn.commit()
+
+        rows = []
+        for driver_id, n in enumerate(SIZES, start=1):
+            driver = SimpleNamespace(driver_id=driver_id, tenant_id=TENANT_ID)
+            for mode, fn in (("batched", _batched), ("per-trip", _past_trips_per_trip)):
+                # Warm-up
+                _timed(engine, fn, driver, limit, all_pages=False)
+                page_ms, page_sql, _ = _timed(engine, fn, driver, limit, all_pages=False)
+                all_ms, all_sql, trips = _timed(engine, fn, driver, limit, all_pages=True)
+                assert trips == n
+                rows.append([n, mode, f"{page_ms:.1f}", page_sql, f"{all_ms:.0f}", all_sql])
+
+    print(f"page size {limit}, {other_trips} trips of other drivers\n")
+    print_table(["trips", "mode", "page ms", "page SQL", "all pages ms", "all pages SQL"], rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--limit", type=int, default=MAX_PAGE_SIZE)
+    parser.add_argument("--other-trips", type=int, default=100_000)
+    args = parser.parse_args()
+    main(args.limit, args.other_trips)
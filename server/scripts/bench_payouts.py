@@ -0,0 +1,188 @@
+"""
+Payout calculation over 100k payees (user-050)
+
+    chunked   calculate_payouts: per chunk of PAYOUT_CALCULATION_CHUNK_SIZE
+              payees one INSERT ... SELECT ... GROUP BY ... RETURNING and
+              one UPDATE ... FROM payouts
+    per-payee the previous loop: a grouped SELECT, then per payee an
+              existence check, an INSERT (flush) and an UPDATE
+
+Each mode gets a fresh scratch schema with the same seed: --payees payees
+(drivers, fleet owners, every 20th a tenant; fleet owner ids overlap
+driver ids) with --credits CREDIT rows each inside last week's period,
+plus a platform fee row per payee, in monthly ledger partitions. The
+per-payee loop keys its existence check on (entity_type, entity_id) only,
+so it creates one payout where a driver and a fleet owner share an id
+(fewer payouts, same rows stamped).
+
+    BENCH_DATABASE_URL=postgresql+psycopg2://... python -m scripts.bench_payouts
+    ... python -m scripts.bench_payouts --modes chunked --chunk-size 1000 5000 20000
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+
+from scripts._bench import create_model_tables, create_month_partitions, print_table, scratch_engine
+
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+
+import app.main  # noqa: F401  (every model the app maps, for the flush's foreign keys)
+from app.api.v1.payouts.calculate import calculate_payouts
+from app.core.config import settings
+from app.core.db_partitions import ledger_credit_window
+from app.core.request_stats import query_budget
+from app.models.core.accounting.ledger import FinancialLedger
+from app.models.core.payouts.payout_batch import PayoutBatch
+from app.models.core.payouts.payouts import Payout
+
+BATCH_ID = 1
+
+# Payee i: tenant when i % 20 = 0, fleet owner (id i - 1, shared with a
+# driver) when i % 4 = 1, driver otherwise
+SEED = [
+    """
+    INSERT INTO payout_batches (payout_batch_id, tenant_id, country_id, currency_code,
+                                period_start_utc, period_end_utc, status, created_at_utc)
+    VALUES (1, 1, 1, 'INR', :start, :end, 'initiated', now())
+    """,
+    """
+    INSERT INTO financial_ledger (tenant_id, country_id, entity_type, entity_id, transaction_type,
+                                  amount, currency_code, entry_type, credited_at_utc, created_at_utc)
+    SELECT 1, 1, payee.entity_type, payee.entity_id, payee.kind, 10 + c, 'INR', 'CREDIT', at, at
+    FROM generate_series(1, :payees) AS i,
+         generate_series(1, :credits) AS c,
+         LATERAL (SELECT CASE WHEN i % 20 = 0 THEN 'tenant' ELSE 'owner' END AS entity_type,
+                         CASE WHEN i % 20 <> 0 AND i % 4 = 1 THEN i - 1 ELSE i END AS entity_id,
+                         CASE WHEN i % 20 = 0 THEN 'tenant_share'
+                              WHEN i % 4 = 1 THEN 'fleet_earnings'
+                              ELSE 'driver_earning' END AS kind) AS payee,
+         LATERAL (SELECT CAST(:start AS timestamptz)
+                         + ((i * 37 + c * 101) % 600000) * interval '1 second' AS at) AS t
+    """,
+    """
+    INSERT INTO financial_ledger (tenant_id, country_id, entity_type, entity_id, transaction_type,
+                                  amount, currency_code, entry_type, credited_at_utc, created_at_utc)
+    SELECT 1, 1, 'platform', NULL, 'platform_fee', 5, 'INR', 'CREDIT', at, at
+    FROM generate_series(1, :payees) AS i,
+         LATERAL (SELECT CAST(:start AS timestamptz) + ((i * 37) % 600000) * interval '1 second' AS at) AS t
+    """,
+]
+
+
+def _calculate_per_payee(db: Session, batch_id: int) -> dict:
+    """calculate_payouts before the set-based rewrite, trimmed to its statements."""
+    batch = db.query(PayoutBatch).filter(PayoutBatch.payout_batch_id == batch_id).with_for_update().first()
+    batch.status = "processing"
+    db.flush()
+
+    credit_rows = (
+        db.query(
+            FinancialLedger.entity_type,
+            FinancialLedger.entity_id,
+            FinancialLedger.transaction_type,
+            func.sum(FinancialLedger.amount).label("credit_total"),
+        )
+        .filter(
+            FinancialLedger.entry_type == "CREDIT",
+            FinancialLedger.payout_batch_id == None,
+            *ledger_credit_window(batch.period_start_utc, batch.period_end_utc),
+        )
+        .group_by(FinancialLedger.entity_type, FinancialLedger.entity_id, FinancialLedger.transaction_type)
+        .all()
+    )
+
+    owner_types = {"driver_earning": "driver", "fleet_earnings": "fleet_owner"}
+    payouts_created, total_payable = 0, 0.0
+    for row in credit_rows:
+        if row.entity_type == "tenant":
+            owner_type = None
+        elif row.entity_type == "owner" and row.transaction_type in owner_types:
+            owner_type = owner_types[row.transaction_type]
+        else:
+            continue
+
+        exists = db.query(Payout).filter(
+            Payout.payout_batch_id == batch_id,
+            Payout.entity_type == row.entity_type,
+            Payout.entity_id == row.entity_id,
+        ).first()
+        if exists:
+            continue
+
+        credit_total = float(row.credit_total or 0)
+        db.add(Payout(
+            payout_batch_id=batch_id, entity_type=row.entity_type, owner_type=owner_type,
+            entity_id=row.entity_id, currency_code=batch.currency_code, gross_amount=credit_total,
+            fee_amount=0, net_amount=credit_total, paid_amount=credit_total, status="pending",
+        ))
+        db.flush()
+
+        db.query(FinancialLedger).filter(
+            FinancialLedger.entity_type == row.entity_type,
+            FinancialLedger.entity_id == row.entity_id,
+            FinancialLedger.entry_type == "CREDIT",
+            FinancialLedger.payout_batch_id == None,
+            *ledger_credit_window(batch.period_start_utc, batch.period_end_utc),
+        ).update({"payout_batch_id": batch_id}, synchronize_session=False)
+
+        payouts_created += 1
+        total_payable += credit_total
+
+    db.commit()
+    return {"payouts_created": payouts_created, "total_payable": round(total_payable, 2)}
+
+
+def _run(mode: str, payees: int, credits: int, chunk_size: int) -> list:
+    now = datetime.now(timezone.utc)
+    start = (now - timedelta(days=now.weekday() + 7)).replace(hour=0, minute=0, second=0, microsecond=0)
+    params = {"payees": payees, "credits": credits, "start": start, "end": start + timedelta(days=7)}
+
+    with scratch_engine() as engine:
+        with engine.begin() as conn:
+            create_model_tables(conn, [PayoutBatch, Payout, FinancialLedger])
+            create_month_partitions(conn, "financial_ledger", months_back=2, months_ahead=1)
+            for statement in SEED:
+                conn.execute(text(statement), params)
+        with engine.connect() as conn:
+            conn.execute(text("ANALYZE"))
+            conn.commit()
+
+        settings.PAYOUT_CALCULATION_CHUNK_SIZE = chunk_size
+        with Session(engine) as db, query_budget(max_queries=10**9) as budget:
+            started = time.perf_counter()
+            if mode == "chunked":
+                result = calculate_payouts(BATCH_ID, db)
+            else:
+                result = _calculate_per_payee(db, BATCH_ID)
+            elapsed = time.perf_counter() - started
+
+        with engine.connect() as conn:
+            stamped = conn.execute(text(
+                "SELECT count(*) FROM financial_ledger WHERE payout_batch_id = :batch"
+            ), {"batch": BATCH_ID}).scalar()
+
+    return [
+        mode, chunk_size if mode == "chunked" else "-", result["payouts_created"], stamped,
+        f"{elapsed:.1f}", budget.sql_count, f"{1000 * elapsed / max(result['payouts_created'], 1):.3f}",
+    ]
+
+
+def main(modes: list[str], payees: int, credits: int, chunk_sizes: list[int]):
+    rows = []
+    for mode in modes:
+        for chunk_size in chunk_sizes if mode == "chunked" else [0]:
+            rows.append(_run(mode, payees, credits, chunk_size))
+    print(f"{payees} payees x {credits} credits\n")
+    print_table(["mode", "chunk", "payouts", "rows stamped", "seconds", "SQL", "ms / payout"], rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="+", choices=["chunked", "per-payee"], default=["chunked", "per-payee"])
+    parser.add_argument("--payees", type=int, default=100_000)
+    parser.add_argument("--credits", type=int, default=3, help="CREDIT rows per payee")
+    parser.add_argument("--chunk-size", type=int, nargs="+", default=[settings.PAYOUT_CALCULATION_CHUNK_SIZE])
+    args = parser.parse_args()
+    main(args.modes, args.payees, args.credits, args.chunk_size)
@@ -0,0 +1,118 @@
+"""
+Read-only session vs get_db on GET paths (user-044)
+
+One simulated request = open the session the way the dependency does,
+run --queries primary-key lookups, close it:
+
+    get_db     SessionLocal: BEGIN ... COMMIT around the lookups, objects
+               expired on commit
+    read-only  _read_only_session (get_read_db / get_primary_read_db):
+               the engine's AUTOCOMMIT twin, no BEGIN / COMMIT, nothing
+               to flush
+
+Both use the app's pool options (pre-ping included). The saving is the
+BEGIN and COMMIT round trips, so it grows with the network latency to
+Postgres: --rtt-ms routes the connections through a proxy that adds it.
+
+    BENCH_DATABASE_URL=postgresql+psycopg2://... python -m scripts.bench_read_session --rtt-ms 0 1
+"""
+
+import argparse
+import random
+import time
+
+from scripts._bench import create_model_tables, mean_ms, percentile, print_table, scratch_engine
+
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import POOL_OPTIONS, read_only_bind
+from app.core.dependencies import _read_only_session
+from app.models.core.trips.trips import Trip
+
+ROWS = 10_000
+
+
+def _get_db(factory):
+    """get_db, on the bench engine."""
+    db = factory()
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _request(dependency, queries: int):
+    session_gen = dependency()
+    db = next(session_gen)
+    for _ in range(queries):
+        db.get(Trip, random.randint(1, ROWS))
+    try:
+        next(session_gen)
+    except StopIteration:
+        pass
+
+
+def _measure(dependency, queries: int, requests: int) -> list[float]:
+    for _ in range(min(requests, 100)):
+        _request(dependency, queries)
+    samples = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        _request(dependency, queries)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _bench(rtt_ms: float, queries: list[int], requests: int) -> list[list]:
+    with scratch_engine(rtt_ms, **POOL_OPTIONS) as engine:
+        with engine.begin() as conn:
+            create_model_tables(conn, [Trip])
+            conn.execute(text("""
+                INSERT INTO trips (trip_id, tenant_id, city_id, driver_id, trip_status, requested_at_utc)
+                SELECT i, 1, 1, i % 200, 'completed', now() - i * interval '1 minute'
+                FROM generate_series(1, :n) AS i
+            """), {"n": ROWS})
+            conn.execute(text("ANALYZE trips"))
+
+        # One measured round trip (SELECT 1 on a checked-out connection)
+        with engine.connect() as conn:
+            round_trip = mean_ms(lambda: conn.exec_driver_sql("SELECT 1"), 200)
+
+        factory = sessionmaker(bind=engine, autoflush=False)
+        modes = (
+            ("get_db", lambda: _get_db(factory)),
+            ("read-only", lambda: _read_only_session(engine)),
+        )
+        rows = []
+        for count in queries:
+            for mode, dependency in modes:
+                samples = _measure(dependency, count, requests)
+                mean = sum(samples) / len(samples)
+                rows.append([
+                    rtt_ms, f"{round_trip:.3f}", mode, count,
+                    f"{mean:.3f}", f"{percentile(samples, 0.5):.3f}", f"{percentile(samples, 0.99):.3f}",
+                    f"{mean / round_trip:.1f}",
+                ])
+        read_only_bind(engine).dispose()
+        return rows
+
+
+def main(rtts: list[float], queries: list[int], requests: int):
+    rows = [row for rtt_ms in rtts for row in _bench(rtt_ms, queries, requests)]
+    print(f"{requests} requests each\n")
+    print("SELECT 1 ms: measured round trip; RTTs: mean / SELECT 1\n")
+    print_table(["rtt ms", "SELECT 1 ms", "mode", "queries", "mean ms", "p50 ms", "p99 ms", "RTTs"], rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, nargs="+", default=[1, 3])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--rtt-ms", type=float, nargs="+", default=[0.0], help="simulated round trip to Postgres")
+    args = parser.parse_args()
+    main(args.rtt_ms, args.queries, args.requests)
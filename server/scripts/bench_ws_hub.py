@@ -0,0 +1,100 @@
+"""
+Driver WebSocket fan-out: idle CPU and offer delivery latency (user-028)
+
+    hub     one redis.asyncio pattern subscription per process and a queue
+            per socket (core/realtime/pubsub_hub.py, used by driver_ws)
+    legacy  the previous handler: a sync pubsub per socket, polled with
+            get_message() every 200 ms
+
+A socket is the server side of driver_ws without the WebSocket frames (a
+task waiting on its queue, or the poll loop), so the numbers are the
+fan-out cost. Offers are published to random drivers and timed from
+PUBLISH to the socket task.
+
+    python -m scripts.bench_ws_hub --sockets 10000
+    python -m scripts.bench_ws_hub --mode legacy --sockets 1000
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+import redis
+
+from scripts._bench import summary_ms
+
+from app.core.config import settings
+from app.core.realtime.pubsub_hub import pubsub_hub
+from app.core.redis import async_redis_client, driver_channel
+
+
+async def _hub_socket(driver_id: int, latencies: list[float]):
+    queue = pubsub_hub.subscribe(driver_channel(driver_id))
+    while True:
+        message = await queue.get()
+        latencies.append((time.perf_counter() - float(message)) * 1000)
+
+
+async def _legacy_socket(driver_id: int, latencies: list[float], client: redis.Redis):
+    pubsub = client.pubsub()
+    pubsub.subscribe(driver_channel(driver_id))
+    try:
+        while True:
+            message = pubsub.get_message(ignore_subscribe_messages=True)
+            if message:
+                latencies.append((time.perf_counter() - float(message["data"])) * 1000)
+            await asyncio.sleep(0.2)
+    finally:
+        pubsub.close()
+
+
+async def main(mode: str, sockets: int, idle: float, offers: int, interval_ms: float):
+    latencies: list[float] = []
+    if mode == "hub":
+        await pubsub_hub.start()
+        tasks = [asyncio.create_task(_hub_socket(driver_id, latencies)) for driver_id in range(sockets)]
+    else:
+        # One connection per socket: a pool large enough for all of them
+        client = redis.Redis.from_url(settings.REDIS_URL, decode_responses=True, max_connections=sockets + 10)
+        tasks = [asyncio.create_task(_legacy_socket(driver_id, latencies, client)) for driver_id in range(sockets)]
+    # Let every socket subscribe before measuring
+    await asyncio.sleep(2)
+
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    await asyncio.sleep(idle)
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+
+    for _ in range(offers):
+        driver_id = random.randrange(sockets)
+        await async_redis_client.publish(driver_channel(driver_id), repr(time.perf_counter()))
+        await asyncio.sleep(interval_ms / 1000)
+    deadline = time.perf_counter() + 5
+    while len(latencies) < offers and time.perf_counter() < deadline:
+        await asyncio.sleep(0.05)
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    if mode == "hub":
+        await pubsub_hub.stop()
+    await async_redis_client.aclose()
+
+    print(f"mode {mode}, {sockets} idle sockets")
+    print(f"  idle CPU    {100 * cpu / wall:.1f}% of one core "
+          f"({1e6 * cpu / wall / sockets:.1f} us CPU per socket per second)")
+    print(f"  delivered   {len(latencies)}/{offers} offers")
+    if latencies:
+        print(f"  latency     {summary_ms(latencies)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["hub", "legacy"], default="hub")
+    parser.add_argument("--sockets", type=int, default=10_000)
+    parser.add_argument("--idle", type=float, default=10.0, help="seconds of idle CPU measurement")
+    parser.add_argument("--offers", type=int, default=1000)
+    parser.add_argument("--interval-ms", type=float, default=5.0, help="pause between offers")
+    args = parser.parse_args()
+    asyncio.run(main(args.mode, args.sockets, args.idle, args.offers, args.interval_ms))
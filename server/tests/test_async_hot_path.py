@@ -0,0 +1,120 @@
+import asyncio
+
+import fakeredis
+import pytest
+from fastapi import HTTPException
+
+from app.api.v1.trips.trip_request import _cached_trip_request_status
+from app.core.redis import AsyncShardedRedis, driver_geo_state_key, geo_key, trip_request_status_key
+from app.core.security import principal_cache
+from app.core.security.principal_cache import Principal, cache_principal
+from app.core.security.roles import driver_principal, rider_principal
+from app.core.trips.status_version import bump_status_version, set_status_owner
+from app.core.trips.trip_otp_service import _otp_plain_key
+from app.core.trips.trip_snapshot import store_trip_snapshot
+
+RIDER_ID, DRIVER_USER_ID = 11, 12
+TRIP_REQUEST_ID, TRIP_ID, DRIVER_ID = 500, 900, 42
+TENANT_ID, CITY_ID = 1, 7
+
+SNAPSHOT = {
+    "trip_request_id": TRIP_REQUEST_ID,
+    "user_id": RIDER_ID,
+    "tenant_id": TENANT_ID,
+    "city_id": CITY_ID,
+    "status": "driver_assigned",
+    "pickup_lat": 12.97,
+    "pickup_lng": 77.59,
+    "drop_lat": 12.99,
+    "drop_lng": 77.61,
+    "estimated_distance_km": 4.2,
+    "estimated_duration_minutes": 15,
+    "created_at_utc": "2026-10-19T08:00:00+00:00",
+    "trip_id": TRIP_ID,
+    "trip_status": "assigned",
+    "assigned_info": {"trip_id": TRIP_ID, "driver_id": DRIVER_ID},
+}
+
+
+@pytest.fixture(autouse=True)
+def clear_local_principals():
+    principal_cache._local.clear()
+
+
+# -------------------------------
+# PRINCIPALS
+# -------------------------------
+def test_principal_hit_needs_no_session(fake_redis):
+    cached = cache_principal(Principal(user_id=DRIVER_USER_ID, role="driver", driver_id=DRIVER_ID, tenant_id=1))
+    principal_cache._local.clear()
+
+    # db=None: any query would raise
+    principal = asyncio.run(driver_principal(db=None, user={"sub": str(DRIVER_USER_ID), "role": "driver"}))
+
+    assert principal == cached
+    assert principal_cache.principal_cache_stats()["redis_hits"] >= 1
+
+
+def test_rider_principal_checks_the_role_first(fake_redis):
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(rider_principal(db=None, user={"sub": str(RIDER_ID), "role": "driver"}))
+    assert exc.value.status_code == 403
+
+
+# -------------------------------
+# STATUS FROM REDIS
+# -------------------------------
+def _seed_trip(fake_redis):
+    store_trip_snapshot(dict(SNAPSHOT))
+    bump_status_version(TRIP_REQUEST_ID)
+    set_status_owner(trip_request_status_key(TRIP_REQUEST_ID), RIDER_ID)
+    fake_redis.geoadd(geo_key(TENANT_ID, CITY_ID), (77.60, 12.98, str(DRIVER_ID)))
+    fake_redis.hset(driver_geo_state_key(TENANT_ID, CITY_ID, DRIVER_ID), "ts", "1760860800.0")
+    fake_redis.set(_otp_plain_key(TRIP_ID), "123456")
+
+
+def test_status_served_from_the_snapshot(fake_redis):
+    _seed_trip(fake_redis)
+
+    etag, payload = asyncio.run(_cached_trip_request_status(TRIP_REQUEST_ID, RIDER_ID))
+
+    assert payload.otp == "123456"
+    assert payload.assigned_info.driver_lat == pytest.approx(12.98, abs=1e-4)
+    assert payload.assigned_info.eta_minutes is not None
+
+    # Same state: 304 without a payload
+    assert asyncio.run(_cached_trip_request_status(TRIP_REQUEST_ID, RIDER_ID, etag)) == (etag, None)
+
+
+def test_status_needs_postgres_without_a_snapshot(fake_redis):
+    assert asyncio.run(_cached_trip_request_status(TRIP_REQUEST_ID, RIDER_ID)) is None
+
+    # Another rider's snapshot is never served
+    _seed_trip(fake_redis)
+    assert asyncio.run(_cached_trip_request_status(TRIP_REQUEST_ID, RIDER_ID + 1)) is None
+
+
+# -------------------------------
+# SHARDED ASYNC CLIENT
+# -------------------------------
+def test_async_sharded_pipeline_and_scripts():
+    client = AsyncShardedRedis([fakeredis.FakeAsyncRedis(decode_responses=True) for _ in range(3)])
+    keys = [f"k:{{{i}}}" for i in range(10)]
+    incr = client.register_script("return redis.call('INCRBY', KEYS[1], ARGV[1])")
+
+    async def run():
+        pipe = client.pipeline()
+        for i, key in enumerate(keys):
+            pipe.set(key, i)
+        await pipe.execute()
+        pipe = client.pipeline()
+        for key in keys:
+            pipe.get(key)
+        values = await pipe.execute()
+        return values, await incr(keys=[keys[3]], args=[10])
+
+    values, incremented = asyncio.run(run())
+
+    assert values == [str(i) for i in range(10)]
+    assert incremented == 13
+    assert len({client.node_index(key) for key in keys}) > 1
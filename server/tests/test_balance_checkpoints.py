@@ -0,0 +1,173 @@
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from conftest import apply_migration
+
+from app.core.db_migrations import MissingTablesError, check_migrated_tables
+from app.core.ledger.balance_checkpoints import (
+    build_checkpoints,
+    ledger_balance,
+    verify_wallet_balances,
+)
+
+# Only the columns the checkpoint queries read (the models need the full schema)
+SCHEMA = [
+    "CREATE TABLE payouts (payout_id BIGINT PRIMARY KEY, owner_type TEXT)",
+    """
+    CREATE TABLE financial_ledger (
+        ledger_id BIGSERIAL PRIMARY KEY,
+        payout_id BIGINT,
+        tenant_id BIGINT NOT NULL,
+        entity_type TEXT NOT NULL,
+        entity_id BIGINT,
+        transaction_type TEXT NOT NULL,
+        entry_type CHAR(6) NOT NULL,
+        amount NUMERIC(12, 2) NOT NULL,
+        currency_code CHAR(3) NOT NULL,
+        created_at_utc TIMESTAMPTZ NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE owner_wallet (
+        owner_wallet_id BIGINT PRIMARY KEY,
+        owner_type TEXT NOT NULL,
+        fleet_owner_id BIGINT,
+        driver_id BIGINT,
+        tenant_id BIGINT NOT NULL,
+        currency_code CHAR(3) NOT NULL,
+        balance NUMERIC(12, 2) NOT NULL,
+        last_updated_utc TIMESTAMPTZ,
+        created_at_utc TIMESTAMPTZ NOT NULL DEFAULT now(),
+        updated_at_utc TIMESTAMPTZ
+    )
+    """,
+    """
+    CREATE TABLE tenant_wallet (
+        tenant_wallet_id BIGINT PRIMARY KEY,
+        tenant_id BIGINT NOT NULL,
+        currency_code CHAR(3) NOT NULL,
+        balance NUMERIC(12, 2) NOT NULL,
+        last_updated_utc TIMESTAMPTZ
+    )
+    """,
+]
+
+# Driver 5 and fleet owner 5 of tenant 1: same entity_type "owner", same id
+DRIVER_ID = FLEET_OWNER_ID = 5
+LAST_WEEK = datetime.now(timezone.utc) - timedelta(days=7)
+
+
+def _ledger(db, transaction_type, amount, entity_type="owner", entity_id=DRIVER_ID,
+            entry_type="CREDIT", payout_id=None, created_at=LAST_WEEK):
+    db.execute(
+        text(
+            "INSERT INTO financial_ledger (payout_id, tenant_id, entity_type, entity_id,"
+            " transaction_type, entry_type, amount, currency_code, created_at_utc)"
+            " VALUES (:payout_id, 1, :entity_type, :entity_id, :transaction_type,"
+            " :entry_type, :amount, 'INR', :created_at)"
+        ),
+        dict(payout_id=payout_id, entity_type=entity_type, entity_id=entity_id,
+             transaction_type=transaction_type, entry_type=entry_type, amount=amount,
+             created_at=created_at),
+    )
+
+
+@pytest.fixture
+def db(pg_engine):
+    with pg_engine.begin() as conn:
+        for statement in SCHEMA:
+            conn.execute(text(statement))
+    apply_migration(pg_engine, "003_ledger_balance_checkpoints.sql")
+
+    session = Session(pg_engine)
+    _ledger(session, "driver_earning", 100)
+    _ledger(session, "fleet_earnings", 40)
+    _ledger(session, "tenant_share", 25, entity_type="tenant", entity_id=1)
+    # Driver payout of 30: the DEBIT row only knows its payout
+    session.execute(text("INSERT INTO payouts VALUES (900, 'driver')"))
+    _ledger(session, "payout", 30, entry_type="DEBIT", payout_id=900)
+
+    session.execute(text(
+        "INSERT INTO owner_wallet (owner_wallet_id, owner_type, fleet_owner_id, driver_id,"
+        " tenant_id, currency_code, balance) VALUES"
+        " (1, 'driver', NULL, 5, 1, 'INR', 70), (2, 'fleet_owner', 5, NULL, 1, 'INR', 40)"
+    ))
+    session.execute(text("INSERT INTO tenant_wallet (tenant_wallet_id, tenant_id, currency_code, balance)"
+                         " VALUES (1, 1, 'INR', 25)"))
+    session.commit()
+    yield session
+    session.close()
+
+
+def _balances(db):
+    return (
+        ledger_balance(db, 1, "owner", DRIVER_ID, owner_type="driver"),
+        ledger_balance(db, 1, "owner", FLEET_OWNER_ID, owner_type="fleet_owner"),
+    )
+
+
+def test_colliding_owner_ids_get_separate_checkpoints(db):
+    build_checkpoints(db)
+
+    rows = db.execute(text(
+        "SELECT owner_type, balance FROM ledger_balance_checkpoints"
+        " WHERE entity_type = 'owner' ORDER BY owner_type"
+    )).all()
+    assert rows == [("driver", Decimal("70.00")), ("fleet_owner", Decimal("40.00"))]
+    assert _balances(db) == (Decimal("70.00"), Decimal("40.00"))
+
+
+def test_balance_without_checkpoint_splits_owner_types(db):
+    assert _balances(db) == (Decimal("70"), Decimal("40"))
+
+
+def test_delta_after_checkpoint_stays_with_its_owner_type(db):
+    build_checkpoints(db)
+    now = datetime.now(timezone.utc)
+    _ledger(db, "fleet_earnings", 15, created_at=now)
+    db.execute(text("INSERT INTO payouts VALUES (901, 'fleet_owner')"))
+    _ledger(db, "payout", 10, entry_type="DEBIT", payout_id=901, created_at=now)
+    db.commit()
+
+    assert _balances(db) == (Decimal("70.00"), Decimal("45.00"))
+
+
+def test_verify_matches_each_wallet_to_its_owner_type(db):
+    build_checkpoints(db)
+    assert verify_wallet_balances(db)["mismatches"] == 0
+
+    db.execute(text("UPDATE owner_wallet SET balance = 55 WHERE owner_wallet_id = 1"))
+    db.commit()
+    result = verify_wallet_balances(db)
+
+    assert result["checked"] == 3
+    assert result["mismatches"] == 1
+    assert result["samples"] == [
+        {"wallet": "owner_wallet:1", "ledger_balance": 70.0, "wallet_balance": 55.0}
+    ]
+
+
+def test_startup_check_requires_the_migration(pg_engine):
+    with Session(pg_engine) as session:
+        with pytest.raises(MissingTablesError, match="003_ledger_balance_checkpoints"):
+            check_migrated_tables(session)
+
+    # Table created before owner_type was part of the key
+    with pg_engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE ledger_balance_checkpoints (tenant_id BIGINT, entity_type TEXT,"
+            " entity_id BIGINT, currency_code TEXT, balance NUMERIC, entries BIGINT,"
+            " through_utc TIMESTAMPTZ, updated_at_utc TIMESTAMPTZ)"
+        ))
+    with Session(pg_engine) as session:
+        with pytest.raises(MissingTablesError, match=r"\(owner_type\)"):
+            check_migrated_tables(session)
+
+    apply_migration(pg_engine, "003_ledger_balance_checkpoints.sql")
+    apply_migration(pg_engine, "004_analytics_rollups.sql")
+    with Session(pg_engine) as session:
+        check_migrated_tables(session)
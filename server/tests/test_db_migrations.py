@@ -0,0 +1,22 @@
+import pytest
+from sqlalchemy.orm import Session
+
+from conftest import apply_migration
+
+from app.core.db_migrations import MissingTablesError, check_migrated_tables
+
+
+def test_rollup_tables_come_from_their_migration(pg_engine):
+    apply_migration(pg_engine, "003_ledger_balance_checkpoints.sql")
+    with Session(pg_engine) as session:
+        with pytest.raises(MissingTablesError) as error:
+            check_migrated_tables(session)
+    assert "ledger_balance_checkpoints" not in str(error.value)
+    for table in ("rollup_watermarks", "trip_rollups", "dispatch_rollups", "revenue_rollups"):
+        assert f"{table}: run migrations/004_analytics_rollups.sql" in str(error.value)
+
+    apply_migration(pg_engine, "004_analytics_rollups.sql")
+    # Re-running is a no-op
+    apply_migration(pg_engine, "004_analytics_rollups.sql")
+    with Session(pg_engine) as session:
+        check_migrated_tables(session)
@@ -0,0 +1,71 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core import db_partitions
+from app.core.db_partitions import PARTITIONED_TABLES, ensure_partitions, month_start, partition_name
+
+NOW = datetime.now(timezone.utc)
+LEDGER = "financial_ledger"
+
+
+def _partitions(db, table):
+    return db.execute(text("""
+        SELECT child.relname, pg_get_expr(child.relpartbound, child.oid)
+        FROM pg_inherits
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_class child  ON child.oid  = pg_inherits.inhrelid
+        WHERE parent.relname = :table
+    """), {"table": table}).all()
+
+
+@pytest.fixture
+def db(pg_engine):
+    # Only the columns partition maintenance reads
+    with pg_engine.begin() as conn:
+        for table in PARTITIONED_TABLES:
+            conn.execute(text(
+                f"CREATE TABLE {table.name} (id BIGSERIAL, entry_type TEXT, payout_batch_id BIGINT,"
+                f" {table.column} TIMESTAMPTZ NOT NULL) PARTITION BY RANGE ({table.column})"
+            ))
+    session = Session(pg_engine)
+    ensure_partitions(session, months_ahead=0)
+    yield session
+    session.close()
+
+
+def test_rows_in_default_move_to_new_partitions(db):
+    ahead, behind = month_start(NOW, 2), month_start(NOW, -5)
+    db.execute(text(
+        f"INSERT INTO {LEDGER} (entry_type, created_at_utc) VALUES"
+        " ('CREDIT', :ahead), ('DEBIT', :ahead), ('CREDIT', :behind)"
+    ), {"ahead": ahead, "behind": behind})
+    db.commit()
+    assert db.execute(text(f"SELECT count(*) FROM {LEDGER}_default")).scalar() == 3
+
+    created = ensure_partitions(db, months_ahead=3)
+
+    assert partition_name(LEDGER, ahead) in created
+    assert partition_name(LEDGER, behind) in created
+    assert partition_name(LEDGER, month_start(NOW, 3)) in created
+    assert db.execute(text(f"SELECT count(*) FROM {LEDGER}_default")).scalar() == 0
+    assert db.execute(text(f"SELECT count(*) FROM {partition_name(LEDGER, ahead)}")).scalar() == 2
+    assert db.execute(text(f"SELECT count(*) FROM {partition_name(LEDGER, behind)}")).scalar() == 1
+    assert (f"{LEDGER}_default", "DEFAULT") in _partitions(db, LEDGER)
+
+
+def test_empty_default_creates_only_missing_months(db):
+    assert ensure_partitions(db, months_ahead=0) == []
+    assert len(_partitions(db, LEDGER)) == 2
+
+
+def test_loop_runs_once_per_interval(db, pg_engine, fake_redis, monkeypatch):
+    monkeypatch.setattr(db_partitions, "SessionLocal", sessionmaker(pg_engine))
+
+    first = db_partitions._run_once()
+
+    assert first is not None
+    assert partition_name(LEDGER, month_start(NOW, 1)) in first["created"]
+    assert db_partitions._run_once() is None
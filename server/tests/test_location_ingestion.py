@@ -0,0 +1,45 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app.core.location.ingestion_policy import (
+    ingest_driver_location,
+    location_ingestion_report,
+    reset_location_ingestion_stats,
+)
+from app.core.utils.geo import distance_meters
+
+TENANT_ID, CITY_ID, DRIVER_ID = 1, 7, 42
+LAT, LNG = 12.9716, 77.5946
+# Default policy: 25 m minimum move
+OFFSETS = [0.0001, 0.0002, 0.00005, 0.001]
+
+
+def _ping(lat):
+    return ingest_driver_location(DRIVER_ID, TENANT_ID, CITY_ID, lat, LNG)
+
+
+def test_report_measures_the_largest_suppressed_displacement(fake_redis):
+    assert _ping(LAT) is True
+    written = [_ping(LAT + offset) for offset in OFFSETS]
+
+    # 11 m, 22 m, 5.5 m suppressed; 111 m written (not an error)
+    assert written == [False, False, False, True]
+    report = location_ingestion_report(TENANT_ID)
+    largest = round(distance_meters(LAT, LNG, LAT + 0.0002, LNG), 2)
+    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+    assert report["geo_writes_suppressed"] == 3
+    assert report["max_dispatch_error_m"] == pytest.approx(largest)
+    assert report["max_dispatch_error_m_by_day"] == {today: pytest.approx(largest)}
+    assert report["avg_dispatch_error_m"] < report["max_dispatch_error_m"]
+
+
+def test_reset_clears_the_max(fake_redis):
+    _ping(LAT)
+    _ping(LAT + 0.0001)
+    reset_location_ingestion_stats(TENANT_ID)
+
+    report = location_ingestion_report(TENANT_ID)
+    assert report["max_dispatch_error_m"] == 0.0
+    assert report["max_dispatch_error_m_by_day"] == {}
@@ -0,0 +1,122 @@
+import pytest
+
+from app.core.security import auth_otp
+from app.core.security.otp_scripts import (
+    VERIFY_LOCKED,
+    VERIFY_MISMATCH,
+    VERIFY_MISSING,
+    VERIFY_OK,
+    store_otp_hash,
+    verify_otp_hash,
+)
+from app.core.trips import trip_otp_service
+
+PHONE = "+15550001111"
+OTP_KEY = "otp:{test}"
+ATTEMPTS_KEY = "otp_attempts:{test}"
+
+
+@pytest.fixture
+def stored(fake_redis):
+    store_otp_hash(OTP_KEY, ATTEMPTS_KEY, "hash-1", 300)
+    return fake_redis
+
+
+def test_store_sets_hash_counter_and_ttl(stored):
+    assert stored.get(OTP_KEY) == "hash-1"
+    assert stored.get(ATTEMPTS_KEY) == "0"
+    assert 0 < stored.ttl(OTP_KEY) <= 300
+    assert 0 < stored.ttl(ATTEMPTS_KEY) <= 300
+
+
+def test_match_consumes_otp(stored):
+    assert verify_otp_hash(OTP_KEY, ATTEMPTS_KEY, "hash-1", 5) == VERIFY_OK
+    assert not stored.exists(OTP_KEY, ATTEMPTS_KEY)
+    assert verify_otp_hash(OTP_KEY, ATTEMPTS_KEY, "hash-1", 5) == VERIFY_MISSING
+
+
+def test_wrong_code_counts_an_attempt(stored):
+    assert verify_otp_hash(OTP_KEY, ATTEMPTS_KEY, "wrong", 5) == VERIFY_MISMATCH
+    assert stored.get(ATTEMPTS_KEY) == "1"
+    assert stored.get(OTP_KEY) == "hash-1"
+    assert verify_otp_hash(OTP_KEY, ATTEMPTS_KEY, "hash-1", 5) == VERIFY_OK
+
+
+def test_attempts_past_max_burn_the_otp(stored):
+    for _ in range(5):
+        assert verify_otp_hash(OTP_KEY, ATTEMPTS_KEY, "wrong", 5) == VERIFY_MISMATCH
+
+    # Even the right code is rejected once the attempts are used up
+    assert verify_otp_hash(OTP_KEY, ATTEMPTS_KEY, "hash-1", 5) == VERIFY_LOCKED
+    assert not stored.exists(OTP_KEY, ATTEMPTS_KEY)
+    assert verify_otp_hash(OTP_KEY, ATTEMPTS_KEY, "hash-1", 5) == VERIFY_MISSING
+
+
+def test_expired_otp_is_missing(stored):
+    stored.delete(OTP_KEY)  # what the TTL does
+    assert verify_otp_hash(OTP_KEY, ATTEMPTS_KEY, "hash-1", 5) == VERIFY_MISSING
+
+
+def test_attempt_counter_follows_otp_ttl(fake_redis):
+    store_otp_hash(OTP_KEY, ATTEMPTS_KEY, "hash-1", 300)
+    fake_redis.delete(ATTEMPTS_KEY)  # counter lost, OTP still valid
+    fake_redis.expire(OTP_KEY, 60)
+
+    assert verify_otp_hash(OTP_KEY, ATTEMPTS_KEY, "wrong", 5) == VERIFY_MISMATCH
+    assert 0 < fake_redis.pttl(ATTEMPTS_KEY) <= 60_000
+
+
+def test_store_again_resets_attempts(stored):
+    for _ in range(4):
+        verify_otp_hash(OTP_KEY, ATTEMPTS_KEY, "wrong", 5)
+    store_otp_hash(OTP_KEY, ATTEMPTS_KEY, "hash-2", 300)
+
+    assert stored.get(ATTEMPTS_KEY) == "0"
+    assert verify_otp_hash(OTP_KEY, ATTEMPTS_KEY, "hash-1", 5) == VERIFY_MISMATCH
+    assert verify_otp_hash(OTP_KEY, ATTEMPTS_KEY, "hash-2", 5) == VERIFY_OK
+
+
+# -------------------------------
+# SERVICES
+# -------------------------------
+def test_auth_otp_round_trip(fake_redis):
+    auth_otp.store_otp(PHONE, "123456")
+
+    assert auth_otp.verify_otp(PHONE, "000000") is False
+    assert auth_otp.verify_otp(PHONE, "123456") is True
+    assert auth_otp.verify_otp(PHONE, "123456") is False
+
+
+def test_auth_otp_locks_after_max_attempts(fake_redis):
+    auth_otp.store_otp(PHONE, "123456")
+    for _ in range(auth_otp.MAX_OTP_ATTEMPTS):
+        assert auth_otp.verify_otp(PHONE, "000000") is False
+
+    assert auth_otp.verify_otp(PHONE, "123456") is False
+
+
+def test_trip_otp_keeps_plaintext_copy_in_same_ttl(fake_redis):
+    trip_otp_service.store_trip_otp(42, "654321")
+
+    plain_key = trip_otp_service._otp_plain_key(42)
+    assert fake_redis.get(plain_key) == "654321"
+    assert 0 < fake_redis.ttl(plain_key) <= trip_otp_service.OTP_TTL_SECONDS
+
+    assert trip_otp_service.verify_trip_otp(42, "111111") is False
+    assert trip_otp_service.verify_trip_otp(42, "654321") is True
+    assert trip_otp_service.verify_trip_otp(42, "654321") is False
+
+
+def test_trip_otp_expired(fake_redis):
+    trip_otp_service.store_trip_otp(42, "654321")
+    fake_redis.delete(trip_otp_service._otp_key(42))
+
+    assert trip_otp_service.verify_trip_otp(42, "654321") is False
+
+
+def test_trip_otp_redis_error_is_a_failed_verify(fake_redis, monkeypatch):
+    def broken(*args, **kwargs):
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(trip_otp_service, "verify_otp_hash", broken)
+    assert trip_otp_service.verify_trip_otp(42, "654321") is False
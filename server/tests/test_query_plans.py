@@ -0,0 +1,272 @@
+"""
+Query plans of the hot-path queries (indexes from the models, 001 / 002)
+
+Builds the hot tables from the models (indexes and monthly partitions
+included, foreign keys left out) in a scratch schema, seeds
+EXPLAIN_SEED_ROWS rows into each (default 100k), ANALYZEs, and runs
+EXPLAIN (ANALYZE, FORMAT JSON) for every query below, written as the ORM
+emits it. A Seq Scan on a seeded table fails the test, except on
+partitions it read no row from (future months, DEFAULT).
+
+    TEST_DATABASE_URL=postgresql+psycopg2://... EXPLAIN_SEED_ROWS=1000000 \\
+        pytest tests/test_query_plans.py
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import MetaData, Text, text
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateIndex, CreateTable
+from sqlalchemy.sql.sqltypes import NullType
+
+from conftest import scratch_engine
+
+from app.core.db_partitions import PARTITIONED_TABLES, ensure_partitions, month_start, partition_name
+from app.models.core.accounting.ledger import FinancialLedger
+from app.models.core.drivers.driver_shifts import DriverShift
+from app.models.core.payouts.payout_batch import PayoutBatch
+from app.models.core.payouts.payouts import Payout
+from app.models.core.trips.trip_dispatch_candidates import TripDispatchCandidate
+from app.models.core.trips.trip_status_history import TripStatusHistory
+from app.models.core.trips.trips import Trip
+
+SEED_ROWS = int(os.environ.get("EXPLAIN_SEED_ROWS", "100000"))
+# Months of seeded ledger history
+HISTORY_MONTHS = 12
+
+MODELS = [DriverShift, Trip, PayoutBatch, Payout, FinancialLedger, TripDispatchCandidate, TripStatusHistory]
+
+# :n rows each; ~50 trips / ledger rows per driver, 50 payouts per batch,
+# 5 candidates per request. Timestamps count back from now().
+SEED = [
+    """
+    INSERT INTO driver_shifts (shift_id, tenant_id, driver_id, shift_status, shift_start_utc)
+    SELECT i, 1, i % :drivers, CASE WHEN i <= :drivers THEN 'online' ELSE 'offline' END,
+           now() - i * interval '1 minute'
+    FROM generate_series(1, :n) AS i
+    """,
+    """
+    INSERT INTO trips (trip_id, tenant_id, city_id, driver_id, trip_status,
+                       requested_at_utc, completed_at_utc, created_at_utc, updated_at_utc)
+    SELECT i, 1, 1, i % :drivers, status, at,
+           CASE WHEN status = 'completed' THEN at + interval '30 minutes' END,
+           at, at + interval '30 minutes'
+    FROM generate_series(1, :n) AS i,
+         LATERAL (SELECT now() - i * interval '365 days' / :n AS at,
+                         CASE i % 20 WHEN 0 THEN 'assigned' WHEN 1 THEN 'picked_up'
+                                     WHEN 2 THEN 'cancelled' ELSE 'completed' END AS status) AS t
+    """,
+    """
+    INSERT INTO payout_batches (payout_batch_id, tenant_id, country_id, currency_code,
+                                period_start_utc, period_end_utc, status, created_at_utc)
+    SELECT i, 1, 1, 'INR', now() - i * interval '1 hour' - interval '7 days',
+           now() - i * interval '1 hour', 'completed', now() - i * interval '1 hour'
+    FROM generate_series(1, :batches) AS i
+    """,
+    """
+    INSERT INTO payouts (payout_id, payout_batch_id, entity_type, entity_id, owner_type, currency_code,
+                         gross_amount, fee_amount, net_amount, paid_amount, status)
+    SELECT i, 1 + i % :batches, 'owner', i % :drivers, 'driver', 'INR', 10, 0, 10, 10, 'paid'
+    FROM generate_series(1, :n) AS i
+    """,
+    # Every 10th row a payout DEBIT; credits older than 60 days are paid
+    """
+    INSERT INTO financial_ledger (ledger_id, tenant_id, country_id, entity_type, entity_id,
+                                  transaction_type, amount, currency_code, entry_type,
+                                  credited_at_utc, debited_at_utc, payout_id, payout_batch_id,
+                                  created_at_utc)
+    SELECT i, 1, 1, 'owner', i % :drivers,
+           CASE WHEN debit THEN 'payout' ELSE 'driver_earning' END, 10, 'INR',
+           CASE WHEN debit THEN 'DEBIT' ELSE 'CREDIT' END,
+           CASE WHEN NOT debit THEN at END, CASE WHEN debit THEN at END,
+           CASE WHEN debit THEN i END,
+           CASE WHEN at < now() - interval '60 days' THEN 1 + i % :batches END,
+           at
+    FROM generate_series(1, :n) AS i,
+         LATERAL (SELECT now() - i * interval '1 day' * (:months * 30 - 1) / :n AS at,
+                         i % 10 = 0 AS debit) AS t
+    """,
+    # The newest 1% still wait for a response
+    """
+    INSERT INTO trip_dispatch_candidates (candidate_id, tenant_id, trip_request_id, trip_batch_id,
+                                          driver_id, response_code, request_sent_at_utc, created_at_utc)
+    SELECT i, 1, i / 5, i / 5, i % :drivers,
+           CASE WHEN i > :n / 100 THEN 'rejected' END,
+           now() - i * interval '89 days' / :n, now() - i * interval '89 days' / :n
+    FROM generate_series(1, :n) AS i
+    """,
+]
+
+DRIVER_ID = 42
+
+# (id, SQL); cursors point ~30 days back, the middle of the first pages
+QUERIES = [
+    # Location ping: online shift of the driver
+    ("shift_online", f"""
+        SELECT * FROM driver_shifts
+        WHERE driver_id = {DRIVER_ID} AND shift_status = 'online'
+        LIMIT 1
+    """),
+    # Trip start / complete: the driver's trip in a given status
+    ("trip_driver_status", f"""
+        SELECT * FROM trips
+        WHERE trip_id = 1000 AND driver_id = {DRIVER_ID} AND trip_status = 'assigned'
+    """),
+    ("trip_current", f"""
+        SELECT * FROM trips
+        WHERE driver_id = {DRIVER_ID} AND trip_status IN ('assigned', 'picked_up')
+    """),
+    # Driver past trips, second keyset page
+    ("trip_past_page", f"""
+        SELECT * FROM trips
+        WHERE driver_id = {DRIVER_ID} AND tenant_id = 1 AND trip_status = 'completed'
+          AND (completed_at_utc, trip_id) < (now() - interval '30 days', {SEED_ROWS})
+          AND completed_at_utc <= now() - interval '30 days'
+        ORDER BY completed_at_utc DESC, trip_id DESC
+        LIMIT 51
+    """),
+    # Rollup watermark: trips changed since the last run
+    ("trip_changed", """
+        SELECT DISTINCT date_trunc('hour', requested_at_utc) FROM trips
+        WHERE coalesce(updated_at_utc, created_at_utc) > now() - interval '15 minutes'
+          AND coalesce(updated_at_utc, created_at_utc) <= now() - interval '1 minute'
+    """),
+    # Batch listing, second keyset page, and the page's totals
+    ("payout_batch_page", f"""
+        SELECT * FROM payout_batches
+        WHERE (created_at_utc, payout_batch_id) < (now() - interval '30 days', {SEED_ROWS})
+          AND created_at_utc <= now() - interval '30 days'
+        ORDER BY created_at_utc DESC, payout_batch_id DESC
+        LIMIT 51
+    """),
+    ("payout_batch_totals", """
+        SELECT payout_batch_id, count(payout_id), coalesce(sum(paid_amount), 0)
+        FROM payouts
+        WHERE payout_batch_id IN (7, 8, 9)
+        GROUP BY payout_batch_id
+    """),
+    # Payouts of one batch, second keyset page
+    ("batch_payouts_page", """
+        SELECT * FROM payouts
+        WHERE payout_batch_id = 7 AND payout_id > 1000
+        ORDER BY payout_id
+        LIMIT 51
+    """),
+    # Owner ledger history, second keyset page (driver)
+    ("ledger_owner_history", f"""
+        SELECT * FROM financial_ledger
+        WHERE tenant_id = 1 AND entity_type = 'owner' AND entity_id = {DRIVER_ID}
+          AND (transaction_type = 'driver_earning'
+               OR (transaction_type = 'payout' AND EXISTS (
+                   SELECT 1 FROM payouts
+                   WHERE payouts.payout_id = financial_ledger.payout_id
+                     AND payouts.owner_type = 'driver')))
+          AND (created_at_utc, ledger_id) < (now() - interval '30 days', {SEED_ROWS})
+          AND created_at_utc <= now() - interval '30 days'
+        ORDER BY created_at_utc DESC, ledger_id DESC
+        LIMIT 51
+    """),
+    # Payout calculation: unpaid credits of a weekly period (ledger_credit_window)
+    ("ledger_credit_window", """
+        SELECT entity_type, entity_id, sum(amount)
+        FROM financial_ledger
+        WHERE entry_type = 'CREDIT' AND payout_batch_id IS NULL
+          AND credited_at_utc >= now() - interval '17 days'
+          AND credited_at_utc <= now() - interval '10 days'
+          AND created_at_utc >= now() - interval '18 days'
+          AND created_at_utc <= now() - interval '9 days'
+        GROUP BY entity_type, entity_id
+    """),
+    # Rows settled by a batch
+    ("ledger_payout_batch", """
+        SELECT count(*) FROM financial_ledger WHERE payout_batch_id = 7
+    """),
+    # Driver response: this driver's candidate row of the request
+    ("candidate_request_driver", f"""
+        SELECT * FROM trip_dispatch_candidates
+        WHERE trip_request_id = 1234 AND driver_id = {DRIVER_ID}
+    """),
+    # Batch progress: pending candidates of a batch
+    ("candidate_batch_pending", """
+        SELECT count(*) FROM trip_dispatch_candidates
+        WHERE trip_batch_id = 1234 AND response_code IS NULL
+    """),
+    # Driver app offer list: pending rows of the driver
+    ("candidate_driver_pending", f"""
+        SELECT * FROM trip_dispatch_candidates
+        WHERE driver_id = {DRIVER_ID} AND response_code IS NULL
+    """),
+]
+
+
+def _create_tables(conn) -> None:
+    metadata = MetaData()
+    for model in MODELS:
+        table = model.__table__.to_metadata(metadata)
+        for column in table.columns:
+            # Lookup codes typed only by their foreign key
+            if isinstance(column.type, NullType):
+                column.type = Text()
+        conn.execute(CreateTable(table, include_foreign_key_constraints=[]))
+        for index in table.indexes:
+            conn.execute(CreateIndex(index))
+
+
+def _create_history_partitions(conn) -> None:
+    current = month_start(datetime.now(timezone.utc))
+    for table in PARTITIONED_TABLES:
+        for offset in range(-HISTORY_MONTHS, 0):
+            start = month_start(current, offset)
+            conn.exec_driver_sql(
+                f"CREATE TABLE {partition_name(table.name, start)} PARTITION OF {table.name} "
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{month_start(start, 1).isoformat()}')"
+            )
+
+
+@pytest.fixture(scope="module")
+def seeded_engine():
+    with scratch_engine() as engine:
+        with engine.begin() as conn:
+            _create_tables(conn)
+            _create_history_partitions(conn)
+        with Session(engine) as session:
+            ensure_partitions(session)
+
+        params = {
+            "n": SEED_ROWS,
+            "drivers": max(SEED_ROWS // 50, 10),
+            "batches": max(SEED_ROWS // 50, 10),
+            "months": HISTORY_MONTHS,
+        }
+        with engine.begin() as conn:
+            for statement in SEED:
+                conn.execute(text(statement), params)
+        with engine.connect() as conn:
+            conn.execute(text("ANALYZE"))
+            conn.commit()
+        yield engine
+
+
+def _seq_scans(node: dict, tables: set[str]) -> list[str]:
+    """Seq Scans over seeded tables (or their partitions) that read rows."""
+    found = []
+    relation = node.get("Relation Name", "")
+    parent = relation.rsplit("_p", 1)[0] if relation.rsplit("_p", 1)[-1].isdigit() else relation.removesuffix("_default")
+    read = node.get("Actual Rows", 0) + node.get("Rows Removed by Filter", 0)
+    if node["Node Type"] == "Seq Scan" and parent in tables and node.get("Actual Loops", 0) and read:
+        found.append(f"{relation} ({read} rows read)")
+    for child in node.get("Plans", []):
+        found.extend(_seq_scans(child, tables))
+    return found
+
+
+@pytest.mark.parametrize("sql", [sql for _, sql in QUERIES], ids=[name for name, _ in QUERIES])
+def test_hot_query_uses_an_index(seeded_engine, sql):
+    with seeded_engine.connect() as conn:
+        [[plan]] = conn.exec_driver_sql(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}").one()
+
+    tables = {model.__tablename__ for model in MODELS}
+    assert _seq_scans(plan["Plan"], tables) == [], json.dumps(plan["Plan"], indent=2)
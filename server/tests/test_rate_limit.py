@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+from starlette.requests import Request
+
+from app.core.config import settings
+from app.core.redis import rate_limit_key
+from app.core.security.rate_limit import client_ip, take_tokens
+
+ROUTE = "otp_request"  # phone 3 / 60s, ip 20 / 60s
+
+
+def _request(peer: str, forwarded: list[str] = ()) -> Request:
+    headers = [(b"x-forwarded-for", value.encode()) for value in forwarded]
+    return Request({"type": "http", "headers": headers, "client": (peer, 50000)})
+
+
+def _take(values: dict) -> int:
+    return asyncio.run(take_tokens(ROUTE, values))
+
+
+def test_rejected_request_charges_no_bucket(fake_redis):
+    for _ in range(3):
+        assert _take({"phone": "+911", "ip": "1.2.3.4"}) == 0
+    ip_bucket = rate_limit_key(ROUTE, "ip", "1.2.3.4")
+    ip_tokens = float(fake_redis.hget(ip_bucket, "t"))
+
+    retry_ms = _take({"phone": "+911", "ip": "1.2.3.4"})
+
+    assert 0 < retry_ms <= 20_000
+    assert float(fake_redis.hget(ip_bucket, "t")) == ip_tokens
+    # Another phone from the same address still gets through
+    assert _take({"phone": "+912", "ip": "1.2.3.4"}) == 0
+
+
+def test_buckets_of_a_route_share_one_hash_tag():
+    keys = [rate_limit_key(ROUTE, "phone", "+911"), rate_limit_key(ROUTE, "ip", "1.2.3.4")]
+    assert {key[key.index("{"):key.index("}") + 1] for key in keys} == {"{otp_request}"}
+
+
+def test_unresolved_scopes_are_skipped(fake_redis):
+    assert _take({"phone": None, "ip": ""}) == 0
+    assert fake_redis.keys("ratelimit:*") == []
+
+
+@pytest.mark.parametrize("trusted, peer, forwarded, expected", [
+    # No trusted proxy: the header is client-supplied and ignored
+    ([], "203.0.113.9", ["198.51.100.1"], "203.0.113.9"),
+    # Behind the load balancer: the address it appended
+    (["10.0.0.0/8"], "10.0.0.5", ["198.51.100.1"], "198.51.100.1"),
+    # Spoofed entries left of it are not believed
+    (["10.0.0.0/8"], "10.0.0.5", ["6.6.6.6, 198.51.100.1"], "198.51.100.1"),
+    # Two proxy hops, header split over two lines
+    (["10.0.0.0/8"], "10.0.0.5", ["198.51.100.1", "10.0.0.7"], "198.51.100.1"),
+    # Peer outside the trusted list: header ignored
+    (["10.0.0.0/8"], "203.0.113.9", ["198.51.100.1"], "203.0.113.9"),
+    # Trusted peer without the header
+    (["10.0.0.0/8"], "10.0.0.5", [], "10.0.0.5"),
+])
+def test_client_ip(monkeypatch, trusted, peer, forwarded, expected):
+    monkeypatch.setattr(settings, "RATE_LIMIT_TRUSTED_PROXIES", trusted)
+    assert client_ip(_request(peer, forwarded)) == expected
@@ -0,0 +1,45 @@
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from app.core import database
+from app.core.database import read_only_bind
+from app.core.dependencies import _read_only_session
+
+
+def _count_isolation_changes(engine, monkeypatch) -> list:
+    calls = []
+    set_isolation_level = engine.dialect.set_isolation_level
+
+    def counted(dbapi_connection, level):
+        calls.append(level)
+        return set_isolation_level(dbapi_connection, level)
+
+    monkeypatch.setattr(engine.dialect, "set_isolation_level", counted)
+    return calls
+
+
+def test_read_only_sessions_use_their_own_autocommit_pool(pg_engine, monkeypatch):
+    twin = read_only_bind(pg_engine)
+    try:
+        assert read_only_bind(pg_engine) is twin
+        primary_changes = _count_isolation_changes(pg_engine, monkeypatch)
+        twin_changes = _count_isolation_changes(twin, monkeypatch)
+
+        for _ in range(3):
+            session_gen = _read_only_session(pg_engine)
+            db = next(session_gen)
+            db.execute(text("SELECT 1"))
+            assert db.connection().connection.dbapi_connection.autocommit
+            session_gen.close()
+
+            db = sessionmaker(bind=pg_engine)()
+            db.execute(text("SELECT 1"))
+            db.commit()
+            db.close()
+
+        # Set once when the twin's connection opened, never per checkout
+        assert primary_changes == []
+        assert twin_changes == ["AUTOCOMMIT"]
+    finally:
+        twin.dispose()
+        database._read_only_engines.pop(pg_engine)
@@ -0,0 +1,100 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.core.config import settings
+from app.core.request_stats import QueryBudgetExceeded, RequestStatsMiddleware, query_budget
+
+STATS_HEADERS = ("x-sql-queries", "x-sql-time-ms", "x-redis-commands", "x-redis-time-ms", "x-n-plus-one")
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    yield engine
+    engine.dispose()
+
+
+def _run(engine, statements: list[tuple[str, dict]]) -> None:
+    with engine.connect() as conn:
+        for statement, params in statements:
+            conn.execute(text(statement), params)
+
+
+# -------------------------------
+# QUERY BUDGET
+# -------------------------------
+def test_query_budget_counts_statements_under_budget(engine):
+    with query_budget(max_queries=3) as budget:
+        _run(engine, [("SELECT 1", {}), ("SELECT 2", {}), ("SELECT 3", {})])
+
+    assert budget.sql_count == 3
+    assert budget.sql_ms > 0
+
+
+def test_query_budget_raises_over_budget(engine):
+    with pytest.raises(QueryBudgetExceeded, match="4 SQL statements, budget is 3"):
+        with query_budget(max_queries=3):
+            _run(engine, [("SELECT 1", {})] * 4)
+
+
+def test_query_budget_ignores_statements_outside_the_block(engine):
+    _run(engine, [("SELECT 1", {})] * 5)
+    with query_budget(max_queries=1) as budget:
+        _run(engine, [("SELECT 1", {})])
+
+    assert budget.sql_count == 1
+
+
+def test_query_budget_counts_repeats_by_shape(engine):
+    # Same shape with different bind values: the N+1 pattern
+    lookups = [("SELECT :id", {"id": trip_id}) for trip_id in range(3)]
+
+    with query_budget(max_queries=10, max_repeats=3) as budget:
+        _run(engine, lookups)
+    assert budget.shapes == {"SELECT ?": 3}
+
+    with pytest.raises(QueryBudgetExceeded, match="repeated 3x \\(max 2\\): SELECT \\?"):
+        with query_budget(max_queries=10, max_repeats=2):
+            _run(engine, lookups)
+
+
+# -------------------------------
+# MIDDLEWARE HEADERS
+# -------------------------------
+@pytest.fixture
+def client(engine):
+    app = FastAPI()
+    app.add_middleware(RequestStatsMiddleware)
+
+    @app.get("/trips")
+    def trips():
+        _run(engine, [("SELECT :id", {"id": trip_id}) for trip_id in range(settings.N_PLUS_ONE_THRESHOLD)])
+        return {}
+
+    return TestClient(app)
+
+
+def test_stats_headers_in_dev(client, monkeypatch):
+    monkeypatch.setattr(settings, "ENV", "dev")
+
+    with query_budget(max_queries=settings.N_PLUS_ONE_THRESHOLD) as budget:
+        response = client.get("/trips")
+
+    assert response.headers["x-sql-queries"] == str(settings.N_PLUS_ONE_THRESHOLD)
+    assert float(response.headers["x-sql-time-ms"]) > 0
+    assert response.headers["x-redis-commands"] == "0"
+    assert response.headers["x-n-plus-one"] == "1"
+    # Requests served inside a budget count towards it
+    assert budget.sql_count == settings.N_PLUS_ONE_THRESHOLD
+
+
+@pytest.mark.parametrize("env", ["staging", "production"])
+def test_no_stats_headers_outside_dev(client, monkeypatch, env):
+    monkeypatch.setattr(settings, "ENV", env)
+
+    response = client.get("/trips")
+
+    assert response.status_code == 200
+    assert not any(header in response.headers for header in STATS_HEADERS)
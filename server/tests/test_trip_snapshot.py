@@ -0,0 +1,151 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.core.trips.trip_lifecycle import TripLifecycle
+from app.core.trips.trip_snapshot import (
+    delete_trip_snapshot,
+    get_trip_snapshot,
+    update_trip_snapshot,
+)
+from app.models.core.trips.trip_request import TripRequest
+from app.models.core.trips.trips import Trip
+
+# Only the columns the snapshot query reads (the models need Postgres types)
+SCHEMA = [
+    "CREATE TABLE users (user_id INTEGER PRIMARY KEY, phone_e164 TEXT)",
+    "CREATE TABLE user_profiles (user_id INTEGER PRIMARY KEY, full_name TEXT)",
+    "CREATE TABLE drivers (driver_id INTEGER PRIMARY KEY, user_id INTEGER,"
+    " average_rating NUMERIC, total_ratings INTEGER)",
+    "CREATE TABLE vehicles (vehicle_id INTEGER PRIMARY KEY, license_plate TEXT, category_code TEXT)",
+]
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        for statement in SCHEMA:
+            conn.execute(text(statement))
+        conn.execute(text("INSERT INTO users VALUES (7, '+15550007777')"))
+        conn.execute(text("INSERT INTO user_profiles VALUES (7, 'Dana Driver')"))
+        conn.execute(text("INSERT INTO drivers VALUES (3, 7, 4.75, 120)"))
+        conn.execute(text("INSERT INTO vehicles VALUES (9, 'KA-01-1234', 'sedan')"))
+
+    session = Session(engine)
+    yield session
+    session.close()
+
+
+def _trip_request(**overrides) -> TripRequest:
+    values = dict(
+        trip_request_id=101,
+        user_id=55,
+        selected_tenant_id=2,
+        city_id=4,
+        status="driver_assigned",
+        pickup_lat=Decimal("12.9716"),
+        pickup_lng=Decimal("77.5946"),
+        drop_lat=Decimal("12.9352"),
+        drop_lng=Decimal("77.6245"),
+        estimated_distance_km=Decimal("6.40"),
+        estimated_duration_minutes=18,
+        created_at_utc=datetime(2026, 1, 5, 8, 30, tzinfo=timezone.utc),
+    )
+    values.update(overrides)
+    return TripRequest(**values)
+
+
+def _trip(**overrides) -> Trip:
+    values = dict(trip_id=501, driver_id=3, vehicle_id=9, trip_status="assigned")
+    values.update(overrides)
+    return Trip(**values)
+
+
+def test_snapshot_without_trip(db):
+    snapshot = TripLifecycle.build_status_snapshot(db, _trip_request(estimated_distance_km=None))
+
+    assert snapshot["trip_request_id"] == 101
+    assert snapshot["tenant_id"] == 2
+    assert snapshot["pickup_lat"] == pytest.approx(12.9716)
+    assert snapshot["estimated_distance_km"] is None
+    assert snapshot["created_at_utc"] == "2026-01-05T08:30:00+00:00"
+    assert snapshot["trip_id"] is None
+    assert snapshot["assigned_info"] is None
+
+
+def test_snapshot_joins_driver_profile_and_vehicle(db):
+    snapshot = TripLifecycle.build_status_snapshot(db, _trip_request(), _trip())
+
+    assert snapshot["trip_id"] == 501
+    assert snapshot["trip_status"] == "assigned"
+    assert snapshot["assigned_info"] == {
+        "trip_id": 501,
+        "driver_id": 3,
+        "driver_phone": "+15550007777",
+        "driver_name": "Dana Driver",
+        "driver_rating_avg": 4.75,
+        "driver_rating_count": 120,
+        "vehicle_number": "KA-01-1234",
+        "vehicle_type": "sedan",
+    }
+
+
+def test_snapshot_without_vehicle_or_profile(db):
+    db.execute(text("DELETE FROM user_profiles"))
+    snapshot = TripLifecycle.build_status_snapshot(db, _trip_request(), _trip(vehicle_id=None))
+
+    assigned = snapshot["assigned_info"]
+    assert assigned["driver_phone"] == "+15550007777"
+    assert assigned["driver_name"] is None
+    assert assigned["vehicle_number"] is None
+    assert assigned["vehicle_type"] is None
+
+
+def test_snapshot_unknown_driver(db):
+    snapshot = TripLifecycle.build_status_snapshot(db, _trip_request(), _trip(driver_id=999))
+
+    assigned = snapshot["assigned_info"]
+    assert assigned["driver_id"] == 999
+    assert assigned["driver_phone"] is None
+    assert assigned["driver_rating_avg"] is None
+
+
+# -------------------------------
+# REDIS ROUND TRIP
+# -------------------------------
+def test_store_and_read_back(db, fake_redis):
+    stored = TripLifecycle.store_status_snapshot(db, _trip_request(), _trip())
+
+    assert get_trip_snapshot(101) == stored
+    assert 0 < fake_redis.ttl("trip:snapshot:{trip_request:101}")
+
+
+def test_update_changes_only_given_fields(db, fake_redis):
+    TripLifecycle.store_status_snapshot(db, _trip_request(), _trip())
+    update_trip_snapshot(101, status="in_progress", trip_status="started")
+
+    snapshot = get_trip_snapshot(101)
+    assert snapshot["status"] == "in_progress"
+    assert snapshot["trip_status"] == "started"
+    assert snapshot["assigned_info"]["driver_name"] == "Dana Driver"
+
+
+def test_update_does_not_resurrect_deleted_snapshot(db, fake_redis):
+    TripLifecycle.store_status_snapshot(db, _trip_request(), _trip())
+    delete_trip_snapshot(101)
+    update_trip_snapshot(101, status="in_progress")
+
+    assert get_trip_snapshot(101) is None
+    assert not fake_redis.exists("trip:snapshot:{trip_request:101}")
+
+
+def test_read_failure_falls_back_to_none(fake_redis, monkeypatch):
+    def broken(*args, **kwargs):
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(fake_redis, "hgetall", broken)
+    assert get_trip_snapshot(101) is None